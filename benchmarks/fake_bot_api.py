@@ -0,0 +1,203 @@
+"""Local stand-in for the Telegram Bot API used by the load-test harness.
+
+Serves ``POST /bot<token>/<method>`` on 127.0.0.1, answers every method the bot
+uses with a plausible result and records each call so the harness can count
+API traffic. It can also inject latency and ``429 Too Many Requests`` replies
+(which python-telegram-bot raises as ``RetryAfter``).
+"""
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+BOT_ID = 777000111
+BOT_USERNAME = "bench_auction_bot"
+
+# Methods that count against Telegram's flood limits and may receive a 429
+FLOOD_LIMITED_METHODS = {
+    'sendMessage', 'sendPhoto', 'sendAnimation', 'copyMessage',
+    'editMessageCaption', 'editMessageText', 'editMessageReplyMarkup',
+}
+
+MESSAGE_METHODS = {
+    'sendMessage', 'sendPhoto', 'sendAnimation', 'copyMessage',
+    'editMessageCaption', 'editMessageText', 'editMessageReplyMarkup',
+}
+
+
+def _parse_body(handler):
+    length = int(handler.headers.get('Content-Length') or 0)
+    raw = handler.rfile.read(length) if length else b''
+    content_type = handler.headers.get('Content-Type', '')
+
+    if not raw:
+        return {}
+    if content_type.startswith('application/json'):
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return {}
+    if content_type.startswith('application/x-www-form-urlencoded'):
+        parsed = parse_qs(raw.decode('utf-8'), keep_blank_values=True)
+        return {key: values[-1] for key, values in parsed.items()}
+    # multipart uploads: the harness only needs the method name
+    return {}
+
+
+def _to_int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class FakeBotAPI:
+    """Threaded HTTP server that imitates the Bot API endpoints used by bot.py"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, retry_after_every=0, retry_after=1,
+                 channel_id=-1001234567890, channel_username="benchchannel"):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.retry_after_every = retry_after_every
+        self.retry_after = retry_after
+        self.channel_id = channel_id
+        self.channel_username = channel_username
+
+        self._lock = threading.Lock()
+        self._message_id = 100000
+        self._flood_calls = 0
+        self.calls = Counter()
+        self.retry_after_sent = 0
+        self.log = []
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/bot"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def snapshot(self):
+        with self._lock:
+            return Counter(self.calls)
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.log.clear()
+            self.retry_after_sent = 0
+            self._flood_calls = 0
+
+    def _next_message_id(self):
+        with self._lock:
+            self._message_id += 1
+            return self._message_id
+
+    def _record(self, method, params):
+        with self._lock:
+            self.calls[method] += 1
+            self.log.append((time.perf_counter(), method, params.get('chat_id')))
+
+            if self.retry_after_every and method in FLOOD_LIMITED_METHODS:
+                self._flood_calls += 1
+                if self._flood_calls % self.retry_after_every == 0:
+                    self.retry_after_sent += 1
+                    return True
+        return False
+
+    def _chat(self, chat_id):
+        chat_id = _to_int(chat_id, self.channel_id)
+        if chat_id == self.channel_id:
+            return {'id': chat_id, 'type': 'channel', 'title': 'Bench Channel',
+                    'username': self.channel_username}
+        if chat_id < 0:
+            return {'id': chat_id, 'type': 'supergroup', 'title': f'Group {chat_id}'}
+        return {'id': chat_id, 'type': 'private', 'first_name': f'User{chat_id}',
+                'username': f'user{chat_id}'}
+
+    def _message(self, params, message_id=None):
+        message = {
+            'message_id': message_id or self._next_message_id(),
+            'date': int(time.time()),
+            'chat': self._chat(params.get('chat_id')),
+        }
+        if params.get('text'):
+            message['text'] = params['text']
+        if params.get('caption'):
+            message['caption'] = params['caption']
+        return message
+
+    def _result(self, method, params):
+        if method == 'getMe':
+            return {'id': BOT_ID, 'is_bot': True, 'first_name': 'Bench Bot',
+                    'username': BOT_USERNAME, 'can_join_groups': True,
+                    'can_read_all_group_messages': False, 'supports_inline_queries': False}
+        if method == 'getChat':
+            return self._chat(params.get('chat_id'))
+        if method == 'getUserProfilePhotos':
+            return {'total_count': 0, 'photos': []}
+        if method == 'copyMessage':
+            return {'message_id': self._next_message_id()}
+        if method in ('editMessageCaption', 'editMessageText', 'editMessageReplyMarkup'):
+            if params.get('inline_message_id'):
+                return True
+            return self._message(params, message_id=_to_int(params.get('message_id'), None))
+        if method in MESSAGE_METHODS:
+            return self._message(params)
+        if method == 'getUpdates':
+            return []
+        # answerCallbackQuery, deleteMessage, setMyCommands, deleteWebhook, ...
+        return True
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                method = self.path.rstrip('/').rsplit('/', 1)[-1]
+                params = _parse_body(self)
+
+                delay = api.latency_ms + (random.uniform(0, api.jitter_ms) if api.jitter_ms else 0)
+                if delay:
+                    time.sleep(delay / 1000.0)
+
+                if api._record(method, params):
+                    status = 429
+                    payload = {
+                        'ok': False,
+                        'error_code': 429,
+                        'description': f'Too Many Requests: retry after {api.retry_after}',
+                        'parameters': {'retry_after': api.retry_after},
+                    }
+                else:
+                    status = 200
+                    payload = {'ok': True, 'result': api._result(method, params)}
+
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST
+
+        return Handler
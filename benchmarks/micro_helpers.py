@@ -0,0 +1,273 @@
+"""Micro-benchmarks and regression guard for the pure helpers on the bid path.
+
+``parse_bid_amount``, ``format_bid_amount``, ``get_min_increment``,
+``extract_item_name``, ``format_auction``, ``format_pokemon_auction_item``,
+``format_tm_auction_item`` and the ``HexaCaptionParser`` behind them run on
+every bid, refresh and list render. This script times them with ``timeit`` on
+realistic HexaMon captions and bid strings and compares the result with
+``micro_baseline.json``.
+
+Timings are normalised against a fixed pure-Python calibration loop measured
+in the same run, so the stored baseline stays meaningful across machines.
+Usage::
+
+    python benchmarks/micro_helpers.py              # compare, exit 1 on regression
+    python benchmarks/micro_helpers.py --update     # re-record the baseline
+    python benchmarks/micro_helpers.py --tolerance 0.5 --only format_auction
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import timeit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'micro_baseline.json')
+sys.path.insert(0, REPO_ROOT)
+
+DEFAULT_TOLERANCE = 0.50
+
+NATURE_TEXT = (
+    "Garchomp\n"
+    "Lv. 100 | Nature: Jolly\n"
+    "Types: [Dragon, Ground]\n"
+    "Ability: Rough Skin"
+)
+IVS_TEXT = (
+    "Stats: IV | EV\n"
+    "HP: 31 | 4\n"
+    "Attack: 31 | 252\n"
+    "Defense: 28 | 0\n"
+    "Sp. Attack: 12 | 0\n"
+    "Sp. Defense: 30 | 0\n"
+    "Speed: 31 | 252\n"
+    "Total: 163 | 508"
+)
+MOVESET_TEXT = (
+    "Moveset:\n"
+    "Earthquake [Ground 🌍]\nPower: 100, Accuracy: 100 (Physical)\n\n"
+    "Outrage [Dragon 🐉]\nPower: 120, Accuracy: 100 (Physical)\n\n"
+    "Stone Edge [Rock 🪨]\nPower: 100, Accuracy: 80 (Physical)\n\n"
+    "Swords Dance [Normal ⚪]\nPower: -, Accuracy: - (Status)"
+)
+TM_TEXT = (
+    "TM29 💿\n\n"
+    "Psychic [Psychic 🔮]\n"
+    "Power: 90, Accuracy: 100 (Special)\n\n"
+    "You can sell this TM for 504 💵"
+)
+
+POKEMON_SUBMISSION = {
+    'category': 'legendary',
+    'pokemon_name': 'Garchomp',
+    'nature': {'photo': 'AgACAgUAAxkBAAI', 'text': NATURE_TEXT},
+    'ivs': {'photo': 'AgACAgUAAxkBAAJ', 'text': IVS_TEXT},
+    'moveset': {'photo': 'AgACAgUAAxkBAAK', 'text': MOVESET_TEXT},
+    'boost_info': 'Attack +2 (Choice Band)',
+    'base_price': 25000,
+    'seller_id': 6620554804,
+    'seller_username': 'Sudo\\QT',
+    'seller_first_name': 'Itachi',
+}
+TM_SUBMISSION = {
+    'category': 'tms',
+    'tm_details': {'text': TM_TEXT},
+    'base_price': 7000,
+    'seller_id': 6620554804,
+    'seller_username': 'SudoQT',
+    'seller_first_name': 'Itachi',
+}
+
+BID_STRINGS = ["50k", "1.2m", "125000", "12,500", "2.25M", " 75K ", "3.5k", "abc"]
+BID_AMOUNTS = [950, 12000, 12500, 37750, 250000, 1000000, 1250000, 2375000]
+CURRENT_BIDS = [None, 0, 15000, 35000, 55000, 95000, 150000, 450000, 750000, 2500000]
+
+
+def calibration():
+    """Fixed pure-Python workload used to normalise timings across machines"""
+    total = 0
+    parts = []
+    for i in range(40):
+        total += i * i % 7
+        parts.append(f"{i}:{total}")
+    return len(",".join(parts)) + total
+
+
+def build_cases(bot):
+    # stored submissions carry their parsed caption record, as save_submission writes it
+    pokemon_submission = dict(POKEMON_SUBMISSION, parsed=bot.CAPTION_PARSER.parse(POKEMON_SUBMISSION))
+    tm_submission = dict(TM_SUBMISSION, parsed=bot.CAPTION_PARSER.parse(TM_SUBMISSION))
+    pokemon_item = bot.format_pokemon_auction_item(pokemon_submission, 42)
+    tm_item = bot.format_tm_auction_item(tm_submission, 43)
+    auctions = [
+        {'auction_id': 42, 'item_text': pokemon_item, 'base_price': 25000,
+         'current_bid': 137500, 'current_bidder': '@bidder_one (1234567)'},
+        {'auction_id': 43, 'item_text': tm_item, 'base_price': 7000,
+         'current_bid': None, 'current_bidder': 'None'},
+    ]
+
+    def parse_bids():
+        for text in BID_STRINGS:
+            bot.parse_bid_amount(text)
+
+    def format_bids():
+        for amount in BID_AMOUNTS:
+            bot.format_bid_amount(amount)
+
+    def min_increments():
+        for current in CURRENT_BIDS:
+            bot.get_min_increment(current)
+
+    def item_names():
+        bot.extract_item_name(pokemon_item)
+        bot.extract_item_name(tm_item)
+
+    def render_auctions():
+        for auction in auctions:
+            bot.format_auction(auction)
+
+    def render_pokemon():
+        bot.format_pokemon_auction_item(pokemon_submission, 42)
+
+    def render_tm():
+        bot.format_tm_auction_item(tm_submission, 43)
+
+    def parse_captions():
+        bot.CAPTION_PARSER.parse(POKEMON_SUBMISSION)
+        bot.CAPTION_PARSER.parse(TM_SUBMISSION)
+
+    return {
+        'parse_bid_amount': (parse_bids, len(BID_STRINGS)),
+        'format_bid_amount': (format_bids, len(BID_AMOUNTS)),
+        'get_min_increment': (min_increments, len(CURRENT_BIDS)),
+        'extract_item_name': (item_names, 2),
+        'format_auction': (render_auctions, len(auctions)),
+        'format_pokemon_auction_item': (render_pokemon, 1),
+        'format_tm_auction_item': (render_tm, 1),
+        'caption_parser': (parse_captions, 2),
+    }
+
+
+def _loop_count(timer, target_seconds):
+    number, elapsed = timer.autorange()
+    return max(1, int(number * target_seconds / max(elapsed, 1e-9)))
+
+
+def measure(func, calls_per_run, target_seconds=0.02, rounds=15):
+    """Time per helper call in microseconds and its ratio to the calibration loop.
+
+    Helper and calibration runs are interleaved and the ratio is taken per
+    round, so CPU frequency changes and noisy neighbours hit both sides alike;
+    the median ratio over ``rounds`` is reported.
+    """
+    helper_timer = timeit.Timer(func)
+    calibration_timer = timeit.Timer(calibration)
+    helper_number = _loop_count(helper_timer, target_seconds)
+    calibration_number = _loop_count(calibration_timer, target_seconds)
+
+    helper_best = float('inf')
+    ratios = []
+    for _ in range(rounds):
+        calibration_time = calibration_timer.timeit(calibration_number) / calibration_number
+        helper_time = helper_timer.timeit(helper_number) / helper_number / calls_per_run
+        helper_best = min(helper_best, helper_time)
+        ratios.append(helper_time / calibration_time)
+
+    return helper_best * 1e6, statistics.median(ratios)
+
+
+def import_bot():
+    # bot.py loads admins from auctions.db at import time; keep that away from the real databases
+    workdir = tempfile.mkdtemp(prefix="auction-micro-")
+    original_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            import bot
+    finally:
+        os.chdir(original_cwd)
+    return bot
+
+
+def run(only=None):
+    bot = import_bot()
+    cases = build_cases(bot)
+    if only:
+        cases = {name: case for name, case in cases.items() if name in only}
+
+    results = {}
+    for name, (func, calls) in cases.items():
+        with contextlib.redirect_stdout(io.StringIO()):
+            per_call, relative = measure(func, calls)
+        results[name] = {'us_per_call': round(per_call, 4), 'relative': round(relative, 4)}
+    unit = min(timeit.repeat(calibration, number=2000, repeat=5)) / 2000 * 1e6
+    return unit, results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get('helpers', {}).get(name)
+        if not expected:
+            status = "new"
+        else:
+            limit = expected['relative'] * (1 + tolerance)
+            change = (result['relative'] - expected['relative']) / expected['relative'] * 100
+            if result['relative'] > limit:
+                status = f"REGRESSION {change:+.1f}%"
+                regressions.append(name)
+            else:
+                status = f"ok {change:+.1f}%"
+        print(f"  {name:<30} {result['us_per_call']:>10.3f} us/call  "
+              f"rel={result['relative']:>8.3f}  {status}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--update', action='store_true', help="record the current timings as the baseline")
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help=f"allowed slowdown vs baseline (default: baseline value or {DEFAULT_TOLERANCE})")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--only', nargs='*', help="benchmark only these helpers")
+    args = parser.parse_args(argv)
+
+    unit, results = run(args.only)
+    print(f"calibration loop: {unit:.3f} us")
+
+    if args.update:
+        baseline = {
+            'tolerance': args.tolerance if args.tolerance is not None else DEFAULT_TOLERANCE,
+            'calibration_us': round(unit, 4),
+            'helpers': results,
+        }
+        compare(results, {}, 0)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update first")
+        return 2
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    tolerance = args.tolerance if args.tolerance is not None else baseline.get('tolerance', DEFAULT_TOLERANCE)
+
+    regressions = compare(results, baseline, tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} helper(s) regressed beyond {tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\nAll helpers within {tolerance:.0%} of baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,32 +1,51 @@
 import os
 import re
+import asyncio
+import bisect
+import math
+import functools
 import sqlite3
 import json
 import html
 import socket
 import sys
+import argparse
+import hashlib
+import shutil
 from datetime import datetime
 import telegram
 import threading
 import time
+import queue
+import heapq
+import itertools
+import contextvars
+import pickle
 import requests
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto, ForceReply
 from telegram import Update, Message
 from telegram import BotCommand, BotCommandScopeChat
-from telegram.utils.helpers import escape_markdown
+from telegram.helpers import escape_markdown
 from telegram.ext import (
-    Updater,
+    ApplicationBuilder,
+    BaseRateLimiter,
+    BaseUpdateProcessor,
+    BasePersistence,
+    PersistenceInput,
     CommandHandler,
     MessageHandler,
     CallbackContext,
     CallbackQueryHandler,
-    Filters,
+    TypeHandler,
+    filters,
     ConversationHandler
 )
 from telegram.error import Conflict
+from telegram.request import HTTPXRequest
 from dotenv import load_dotenv
 from datetime import datetime
 from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
 import logging
 from typing import Optional
 
@@ -62,158 +81,908 @@ def db_connection(db_name='auctions.db'):
             if conn:
                 conn.close()
 
-def init_db():
+class DBWriter(threading.Thread):
+    """The one thread that writes to the SQLite databases.
+
+    Callers hand it a function taking a connection; it runs queued functions
+    back to back inside one transaction per database and commits once per
+    batch (every DB_GROUP_COMMIT_MS or DB_GROUP_COMMIT_MAX writes), so
+    concurrent writers share an fsync instead of fighting over the write lock.
+    Each write runs in its own savepoint: a failing write is rolled back on
+    its own and its exception is raised to the caller. Readers keep their
+    own connections and read alongside the writer through WAL.
+    """
+
+    def __init__(self, batch_ms=5, batch_size=64):
+        super().__init__(name="auction-db-writer", daemon=True)
+        self.batch_seconds = batch_ms / 1000.0
+        self.batch_size = max(1, batch_size)
+        self.queue = queue.Queue()
+        self.connections = {}
+        self.batches = 0
+        self.writes = 0
+        self._start_lock = threading.Lock()
+
+    def _connection(self, db_name):
+        conn = self.connections.get(db_name)
+        if conn is None:
+            conn = sqlite3.connect(db_name, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.connections[db_name] = conn
+        return conn
+
+    def submit(self, func, db_name='auctions.db'):
+        """Queue func(conn) and return a Future resolved once its batch is committed"""
+        if not self.is_alive():
+            with self._start_lock:
+                if not self.is_alive():
+                    self.start()
+        future = Future()
+        self.queue.put((db_name, func, future))
+        return future
+
+    def write(self, func, db_name='auctions.db'):
+        """Run func(conn) on the writer and block until it is committed"""
+        if threading.current_thread() is self:
+            return func(self._connection(db_name))
+        return self.submit(func, db_name).result()
+
+    def execute(self, sql, params=(), db_name='auctions.db'):
+        """Run a single statement on the writer and return its rowcount"""
+        return self.write(lambda conn: conn.execute(sql, params).rowcount, db_name)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.batch_seconds
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._commit(batch)
+                    return
+                batch.append(item)
+            self._commit(batch)
+
+    def _commit(self, batch):
+        open_transactions = {}
+        done = []
+        for db_name, func, future in batch:
+            try:
+                conn = open_transactions.get(db_name)
+                if conn is None:
+                    conn = self._connection(db_name)
+                    conn.execute("BEGIN IMMEDIATE")
+                    open_transactions[db_name] = conn
+                conn.execute("SAVEPOINT write_item")
+                try:
+                    result = func(conn)
+                except Exception:
+                    conn.execute("ROLLBACK TO write_item")
+                    conn.execute("RELEASE write_item")
+                    raise
+                conn.execute("RELEASE write_item")
+                done.append((db_name, future, result))
+            except Exception as e:
+                future.set_exception(e)
+
+        failed = {}
+        for db_name, conn in open_transactions.items():
+            try:
+                conn.execute("COMMIT")
+            except Exception as e:
+                debug_log(f"Group commit on {db_name} failed: {str(e)}")
+                failed[db_name] = e
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+
+        for db_name, future, result in done:
+            if db_name in failed:
+                future.set_exception(failed[db_name])
+            else:
+                future.set_result(result)
+        self.batches += 1
+        self.writes += len(batch)
+
+    def close(self):
+        """Flush queued writes and stop the thread"""
+        if self.is_alive():
+            self.queue.put(None)
+            self.join()
+        for conn in self.connections.values():
+            conn.close()
+        self.connections = {}
+
+DB_WRITER = DBWriter(
+    batch_ms=float(os.getenv("DB_GROUP_COMMIT_MS", "5")),
+    batch_size=int(os.getenv("DB_GROUP_COMMIT_MAX", "64"))
+)
+
+# Handlers run on the asyncio event loop; blocking SQLite work goes through
+# run_db so one slow query doesn't stall every other update in flight.
+DB_WORKERS = int(os.getenv("DB_WORKERS", "8"))
+DB_EXECUTOR = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="auction-db")
+
+async def run_db(func, *args, **kwargs):
+    """Run a blocking database helper on DB_EXECUTOR and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(DB_EXECUTOR, functools.partial(func, *args, **kwargs))
+
+class BidLanes:
+    """Serialises bids per auction while letting different auctions run in parallel.
+
+    Every auction_id hashes onto one of a fixed number of lanes. Each lane is an
+    asyncio queue drained by a single worker, so the bids of one auction are
+    validated and written strictly in arrival order and never race each other,
+    while lanes run their DB work side by side on DB_EXECUTOR.
+    """
+
+    def __init__(self, lanes):
+        self.size = max(1, lanes)
+        self.queues = []
+        self.workers = []
+        self.processed = [0] * self.size
+        self.max_depth = [0] * self.size
+        self._loop = None
+
+    def lane_for(self, auction_id):
+        return int(auction_id) % self.size
+
+    def _ensure_workers(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self.queues = [asyncio.Queue() for _ in range(self.size)]
+        self.workers = [loop.create_task(self._worker(lane)) for lane in range(self.size)]
+
+    async def _worker(self, lane):
+        queue = self.queues[lane]
+        while True:
+            func, args, future = await queue.get()
+            try:
+                result = await run_db(func, *args)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self.processed[lane] += 1
+                queue.task_done()
+
+    async def submit(self, auction_id, func, *args):
+        """Run func(*args) on the auction's lane after every bid queued before it"""
+        self._ensure_workers()
+        lane = self.lane_for(auction_id)
+        queue = self.queues[lane]
+        future = self._loop.create_future()
+        queue.put_nowait((func, args, future))
+        self.max_depth[lane] = max(self.max_depth[lane], queue.qsize())
+        return await future
+
+    def metrics(self):
+        """Per-lane queue depth, deepest backlog seen and bids applied"""
+        return [
+            {
+                'lane': lane,
+                'depth': self.queues[lane].qsize() if self.queues else 0,
+                'max_depth': self.max_depth[lane],
+                'processed': self.processed[lane],
+            }
+            for lane in range(self.size)
+        ]
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        self._loop = None
+
+BID_LANES = BidLanes(int(os.getenv("BID_LANES", "4")))
+
+# Priority classes for outbound Bot API calls, most urgent first
+PRIORITY_CONFIRM = 0    # replies and toasts to the user who is acting right now
+PRIORITY_CHANNEL = 1    # auction post edits in the channel
+PRIORITY_NOTIFY = 2     # outbid / win DMs and admin fan-out
+PRIORITY_LOG = 3        # logs channel
+PRIORITY_BULK = 4       # broadcasts
+
+API_PRIORITY = contextvars.ContextVar('api_priority', default=None)
+
+@contextmanager
+def api_priority(level):
+    """Send every Bot API call made inside the block at the given priority class"""
+    token = API_PRIORITY.set(level)
     try:
-        with db_connection() as conn:
-            c = conn.cursor()
+        yield
+    finally:
+        API_PRIORITY.reset(token)
+
+def with_api_priority(level):
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with api_priority(level):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
 
-            c.execute('''CREATE TABLE IF NOT EXISTS auctions
-                          (auction_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                          item_text TEXT NOT NULL,
-                          photo_id TEXT,
-                          base_price REAL NOT NULL,
-                          current_bid REAL,
-                          current_bidder_id INTEGER,
-                          current_bidder TEXT,
-                          previous_bidder TEXT,
-                          is_active BOOLEAN DEFAULT 1,
-                          auction_status TEXT DEFAULT 'active',
-                          channel_message_id INTEGER,
-                          discussion_message_id INTEGER,
-                          created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                          seller_id INTEGER,
-                          seller_name TEXT)''')
-
-
-            c.execute('''CREATE TABLE IF NOT EXISTS bids
-                         (bid_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                          auction_id INTEGER NOT NULL,
-                          bidder_id INTEGER NOT NULL,
-                          bidder_name TEXT NOT NULL,
-                          amount REAL NOT NULL,
-                          timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                          is_active BOOLEAN DEFAULT 1,
-                          FOREIGN KEY(auction_id) REFERENCES auctions(auction_id))''')
-
-            c.execute('''CREATE TABLE IF NOT EXISTS submissions
-                         (submission_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                          user_id INTEGER NOT NULL,
-                          data TEXT NOT NULL,
-                          status TEXT DEFAULT 'pending',
-                          created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                          channel_message_id INTEGER)''')
-
-            c.execute('''CREATE TABLE IF NOT EXISTS temp_data
-                         (user_id INTEGER PRIMARY KEY,
-                          data TEXT,
-                          timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-
-            c.execute('''CREATE TABLE IF NOT EXISTS system_status
-                         (id INTEGER PRIMARY KEY,
-                          submissions_open BOOLEAN DEFAULT 0,
-                          auctions_open BOOLEAN DEFAULT 0)''')
-
-            c.execute('''CREATE TABLE IF NOT EXISTS verification_messages
-                         (submission_id INTEGER,
-                          admin_id INTEGER,
-                          message_id INTEGER,
-                          PRIMARY KEY (submission_id, admin_id),
-                          FOREIGN KEY(submission_id) REFERENCES submissions(submission_id))''')
-            c.execute('''CREATE TABLE IF NOT EXISTS bot_admins
-                         (user_id INTEGER PRIMARY KEY,
-                          username TEXT,
-                          added_by INTEGER,
-                          added_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-            c.execute('''CREATE TABLE IF NOT EXISTS active_rejections
-                         (submission_id INTEGER PRIMARY KEY,
-                          admin_id INTEGER NOT NULL,
-                          user_id INTEGER NOT NULL,
-                          item_name TEXT NOT NULL,
-                          original_chat_id INTEGER NOT NULL,
-                          original_message_id INTEGER NOT NULL,
-                          created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-
-
-            c.execute("PRAGMA table_info(auctions)")
-            existing_columns = [col[1] for col in c.fetchall()]
-
-            if 'seller_id' not in existing_columns:
-                c.execute("ALTER TABLE auctions ADD COLUMN seller_id INTEGER")
-                debug_log("Added seller_id column to auctions table")
-
-            if 'seller_name' not in existing_columns:
-                c.execute("ALTER TABLE auctions ADD COLUMN seller_name TEXT")
-                debug_log("Added seller_name column to auctions table")
-
-            if 'auction_status' not in existing_columns:
-                c.execute("ALTER TABLE auctions ADD COLUMN auction_status TEXT DEFAULT 'active'")
-                debug_log("Added auction_status column to auctions table")
-
-            c.execute('''INSERT OR IGNORE INTO system_status (id, submissions_open, auctions_open)
-                         VALUES (1, 0, 0)''')
+class TokenBucket:
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
 
-            conn.commit()
-            debug_log("Database initialized successfully with all required columns")
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, now):
+        """Seconds until one token is available (0 if it is now)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+class ApiGateway(BaseRateLimiter):
+    """The single path every outbound Bot API call takes (installed as the bot's rate limiter).
+
+    Calls wait in one priority queue and are released against a global token
+    bucket plus a bucket per private chat and per group/channel, so a broadcast
+    or a burst of log messages can only use what bid confirmations leave over.
+    A RetryAfter from Telegram pauses the whole gateway for the advertised time
+    and the call is queued again at its own priority.
+    """
+
+    # calls that don't count against Telegram's message limits
+    UNLIMITED = {'answerCallbackQuery', 'getChat', 'getMe', 'setMyCommands', 'deleteMyCommands',
+                 'getChatMember', 'getFile'}
+
+    def __init__(self, global_rate=30, chat_rate=1.0, chat_burst=3, group_rate_per_min=20, group_burst=10,
+                 max_retries=3):
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate_per_min / 60.0
+        self.group_burst = group_burst
+        self.max_retries = max_retries
+        self.buckets = {}
+        self.waiters = []
+        self.counter = itertools.count()
+        self.blocked_until = 0.0
+        self.retry_after_hits = 0
+        self.stats = {}
+        self._wakeup = None
+        self._scheduler = None
+
+    async def initialize(self):
+        self._wakeup = asyncio.Event()
+
+    async def shutdown(self):
+        if self._scheduler:
+            self._scheduler.cancel()
+            await asyncio.gather(self._scheduler, return_exceptions=True)
+            self._scheduler = None
+
+    def classify(self, endpoint, data, rate_limit_args):
+        if isinstance(rate_limit_args, int):
+            return rate_limit_args
+        level = API_PRIORITY.get()
+        if level is not None:
+            return level
+        chat_id = data.get('chat_id')
+        if chat_id == LOGS_CHANNEL_ID and chat_id != CHANNEL_ID:
+            return PRIORITY_LOG
+        if chat_id == CHANNEL_ID:
+            return PRIORITY_CHANNEL
+        return PRIORITY_CONFIRM
+
+    def bucket_for(self, chat_id):
+        if chat_id is None:
+            return None
+        bucket = self.buckets.get(chat_id)
+        if bucket is None:
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            bucket = (TokenBucket(self.group_rate, self.group_burst) if is_group
+                      else TokenBucket(self.chat_rate, self.chat_burst))
+            self.buckets[chat_id] = bucket
+        return bucket
+
+    async def acquire(self, priority, chat_id):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self.counter), chat_id, future))
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.create_task(self._run())
+        self._wakeup.set()
+        await future
+
+    async def _run(self):
+        while True:
+            if not self.waiters:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            global_wait = self.global_bucket.wait_time(now)
+            if global_wait:
+                await asyncio.sleep(global_wait)
+                continue
+
+            # highest priority waiter whose chat still has budget; the ones passed over go back on the heap
+            held = []
+            released = False
+            soonest = None
+            while self.waiters:
+                entry = heapq.heappop(self.waiters)
+                _, _, chat_id, future = entry
+                if future.done():
+                    continue
+                bucket = self.bucket_for(chat_id)
+                wait = bucket.wait_time(now) if bucket else 0
+                if wait:
+                    held.append(entry)
+                    soonest = wait if soonest is None else min(soonest, wait)
+                    continue
+                self.global_bucket.take()
+                if bucket:
+                    bucket.take()
+                future.set_result(None)
+                released = True
+                break
+            for entry in held:
+                heapq.heappush(self.waiters, entry)
+            if not released:
+                self._wakeup.clear()
+                if soonest is not None:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), soonest)
+                    except asyncio.TimeoutError:
+                        pass
+
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        if endpoint in self.UNLIMITED:
+            return await callback(*args, **kwargs)
+
+        priority = self.classify(endpoint, data, rate_limit_args)
+        chat_id = data.get('chat_id')
+        stats = self.stats.setdefault(priority, {'calls': 0, 'waited': 0.0, 'max_wait': 0.0})
+        for attempt in range(self.max_retries + 1):
+            started = time.monotonic()
+            await self.acquire(priority, chat_id)
+            waited = time.monotonic() - started
+            stats['calls'] += 1
+            stats['waited'] += waited
+            stats['max_wait'] = max(stats['max_wait'], waited)
+            try:
+                return await callback(*args, **kwargs)
+            except telegram.error.RetryAfter as e:
+                self.retry_after_hits += 1
+                if attempt == self.max_retries:
+                    raise
+                retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, 'total_seconds') else e.retry_after
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+                debug_log(f"Flood control on {endpoint}: pausing all sends for {retry_after}s")
+
+    def reset_metrics(self):
+        self.stats = {}
+        self.retry_after_hits = 0
+
+    def metrics(self):
+        return {
+            'retry_after': self.retry_after_hits,
+            'queued': len(self.waiters),
+            'classes': {priority: dict(values, avg_wait=values['waited'] / values['calls'] if values['calls'] else 0.0)
+                        for priority, values in sorted(self.stats.items())},
+        }
+
+API_GATEWAY = ApiGateway(
+    global_rate=float(os.getenv("API_GLOBAL_RATE", "30")),
+    chat_rate=float(os.getenv("API_CHAT_RATE", "1")),
+    chat_burst=float(os.getenv("API_CHAT_BURST", "3")),
+    group_rate_per_min=float(os.getenv("API_GROUP_RATE_PER_MIN", "20")),
+    group_burst=float(os.getenv("API_GROUP_BURST", "10"))
+)
+
+# Update classes for PriorityUpdateProcessor, served in this order
+UPDATE_BID = 0          # bid amounts, bid/quick-bid buttons, /bids, /maxbid, bid deep links
+UPDATE_ADMIN = 1        # approvals, rejections and other admin commands
+UPDATE_DEFAULT = 2
+UPDATE_BROWSE = 3       # /items, Refresh, listings, leaderboards, broadcasts
+
+BID_COMMANDS = {'bids', 'maxbid'}
+BROWSE_COMMANDS = {'items', 'myitems', 'mybids', 'history', 'topbuyers', 'topsellers', 'profile', 'help',
+                   'increments', 'listverified', 'broad'}
+BID_CALLBACKS = ('bid_', 'qbid_')
+BROWSE_CALLBACKS = ('refresh_', 'items_', 'verified_')
+ADMIN_CALLBACKS = ('verify_', 'reject_', 'admin_verify_', 'admin_reject_', 'cancel_reject_', 'cancel_submission_reject_')
+
+def classify_update(update):
+    """Pick the dispatch class of an incoming update from its command or callback data"""
+    if not isinstance(update, Update):
+        return UPDATE_DEFAULT
+
+    query = update.callback_query
+    if query:
+        data = query.data or ''
+        if data.startswith(BID_CALLBACKS):
+            return UPDATE_BID
+        if data.startswith(BROWSE_CALLBACKS):
+            return UPDATE_BROWSE
+        if data.startswith(ADMIN_CALLBACKS):
+            return UPDATE_ADMIN
+        return UPDATE_DEFAULT
+
+    message = update.message
+    if not message or not message.text:
+        return UPDATE_DEFAULT
+    if not message.text.startswith('/'):
+        # plain text in a private chat is a bid amount (or an answer inside /add)
+        return UPDATE_BID if message.chat.type == 'private' else UPDATE_DEFAULT
+
+    parts = message.text.split(maxsplit=1)
+    command = parts[0][1:].split('@')[0].lower()
+    if command in BID_COMMANDS or (command == 'start' and len(parts) > 1 and parts[1].startswith('bid_')):
+        return UPDATE_BID
+    if command in BROWSE_COMMANDS:
+        return UPDATE_BROWSE
+    if message.from_user and message.from_user.id in ADMINS:
+        return UPDATE_ADMIN
+    return UPDATE_DEFAULT
+
+class PriorityUpdateProcessor(BaseUpdateProcessor):
+    """Runs at most `workers` updates at once, always starting the most urgent class first.
+
+    Each class also has a worker quota, so a flood of /items taps or Refresh
+    clicks can fill its own share of the workers but never the slots a bid
+    needs. Updates beyond the running set wait here rather than in the base
+    class's FIFO semaphore, which is only sized as a ceiling on pending
+    updates: were it as small as `workers`, a bid would queue behind the
+    whole flood before it ever got classified.
+
+    With a ledger, updates it has already seen are dropped before they are
+    classified or queued, and every update that runs to completion is
+    recorded in it. Users over their rate limit (admit_update) are turned
+    away before queueing too, so a flood never holds a worker slot.
+    """
+
+    def __init__(self, workers, quotas=None, max_pending=100000, ledger=None):
+        super().__init__(max_pending)
+        self.workers = workers
+        self.quotas = quotas or {}
+        self.running = {}
+        self.active = 0
+        self.waiters = []
+        self.counter = itertools.count()
+        self.processed = {}
+        self.ledger = ledger
+
+    async def initialize(self):
+        if self.ledger:
+            await run_db(self.ledger.load)
+
+    async def shutdown(self):
+        if self.ledger:
+            await self.ledger.close()
+
+    def quota(self, update_class):
+        return self.quotas.get(update_class, self.workers)
+
+    def _start(self, update_class):
+        self.active += 1
+        self.running[update_class] = self.running.get(update_class, 0) + 1
+
+    def _dispatch(self):
+        held = []
+        while self.waiters and self.active < self.workers:
+            entry = heapq.heappop(self.waiters)
+            update_class, _, future = entry
+            if future.done():
+                continue
+            if self.running.get(update_class, 0) >= self.quota(update_class):
+                held.append(entry)
+                continue
+            self._start(update_class)
+            future.set_result(None)
+        for entry in held:
+            heapq.heappush(self.waiters, entry)
+
+    async def do_process_update(self, update, coroutine):
+        if self.ledger and not self.ledger.begin(update):
+            coroutine.close()
+            return
+
+        finished = False
+        try:
+            update_class = classify_update(update)
+            if isinstance(update, Update) and not await admit_update(update, update_class):
+                coroutine.close()
+                finished = True
+                return
+
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self.waiters, (update_class, next(self.counter), future))
+            self._dispatch()
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.active -= 1
+                    self.running[update_class] -= 1
+                    self._dispatch()
+                coroutine.close()
+                raise
+
+            finished = True
+            try:
+                await coroutine
+            except asyncio.CancelledError:
+                # stopped mid-way (shutdown): not recorded as processed
+                finished = False
+                raise
+            finally:
+                self.active -= 1
+                self.running[update_class] -= 1
+                self.processed[update_class] = self.processed.get(update_class, 0) + 1
+                self._dispatch()
+        finally:
+            if self.ledger:
+                if finished:
+                    self.ledger.finish(update)
+                else:
+                    self.ledger.abandon(update)
+
+    def metrics(self):
+        metrics = {'active': self.active, 'waiting': len(self.waiters),
+                   'running': dict(self.running), 'processed': dict(self.processed)}
+        if self.ledger:
+            metrics['replays_skipped'] = self.ledger.skipped
+        return metrics
+
+def is_system_open(status_type):
+    """Read one of the system_status switches (submissions_open / auctions_open)"""
+    with db_connection() as conn:
+        return conn.execute(f"SELECT {status_type} FROM system_status WHERE id=1").fetchone()[0]
+
+def get_system_status():
+    """(submissions_open, auctions_open)"""
+    with db_connection() as conn:
+        return tuple(conn.execute("SELECT submissions_open, auctions_open FROM system_status WHERE id=1").fetchone())
+
+def set_system_status(status_type, is_open):
+    DB_WRITER.execute(f"UPDATE system_status SET {status_type}=? WHERE id=1", (1 if is_open else 0,))
+
+def backfill_item_summaries(c):
+    """Fill item_name/category on submissions and auctions written before those columns existed"""
+    c.execute("SELECT submission_id, data FROM submissions WHERE item_name IS NULL")
+    rows = c.fetchall()
+    for row in rows:
+        try:
+            name, category = get_item_summary(json.loads(row['data']))
+        except (ValueError, TypeError, AttributeError):
+            continue
+        c.execute("UPDATE submissions SET item_name=?, category=? WHERE submission_id=?",
+                  (name, category, row['submission_id']))
+
+    c.execute('''UPDATE auctions SET
+                 item_name = (SELECT s.item_name FROM submissions s
+                              WHERE s.channel_message_id = auctions.channel_message_id),
+                 category = (SELECT s.category FROM submissions s
+                             WHERE s.channel_message_id = auctions.channel_message_id)
+                 WHERE item_name IS NULL AND channel_message_id IS NOT NULL''')
+
+    c.execute("SELECT auction_id, item_text FROM auctions WHERE item_name IS NULL")
+    for row in c.fetchall():
+        c.execute("UPDATE auctions SET item_name=? WHERE auction_id=?",
+                  (extract_item_name(row['item_text'] or ''), row['auction_id']))
+
+    if rows:
+        debug_log(f"Backfilled item summaries for {len(rows)} submissions")
+
+def migrate_auctions_tables(c):
+    """auctions.db v1: every table, created as it looks today"""
+    c.execute('''CREATE TABLE IF NOT EXISTS auctions
+                  (auction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  item_text TEXT NOT NULL,
+                  photo_id TEXT,
+                  base_price REAL NOT NULL,
+                  current_bid REAL,
+                  current_bidder_id INTEGER,
+                  current_bidder TEXT,
+                  previous_bidder TEXT,
+                  is_active BOOLEAN DEFAULT 1,
+                  auction_status TEXT DEFAULT 'active',
+                  channel_message_id INTEGER,
+                  discussion_message_id INTEGER,
+                  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                  seller_id INTEGER,
+                  seller_name TEXT,
+                  state_version INTEGER DEFAULT 0,
+                  item_name TEXT,
+                  category TEXT,
+                  ends_at REAL)''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS bids
+                 (bid_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  auction_id INTEGER NOT NULL,
+                  bidder_id INTEGER NOT NULL,
+                  bidder_name TEXT NOT NULL,
+                  amount REAL NOT NULL,
+                  timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                  is_active BOOLEAN DEFAULT 1,
+                  FOREIGN KEY(auction_id) REFERENCES auctions(auction_id))''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS submissions
+                 (submission_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  user_id INTEGER NOT NULL,
+                  data TEXT NOT NULL,
+                  status TEXT DEFAULT 'pending',
+                  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                  channel_message_id INTEGER,
+                  item_name TEXT,
+                  category TEXT)''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS temp_data
+                 (user_id INTEGER PRIMARY KEY,
+                  data TEXT,
+                  timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS system_status
+                 (id INTEGER PRIMARY KEY,
+                  submissions_open BOOLEAN DEFAULT 0,
+                  auctions_open BOOLEAN DEFAULT 0)''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS verification_messages
+                 (submission_id INTEGER,
+                  admin_id INTEGER,
+                  message_id INTEGER,
+                  PRIMARY KEY (submission_id, admin_id),
+                  FOREIGN KEY(submission_id) REFERENCES submissions(submission_id))''')
+    c.execute('''CREATE TABLE IF NOT EXISTS bot_admins
+                 (user_id INTEGER PRIMARY KEY,
+                  username TEXT,
+                  added_by INTEGER,
+                  added_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS active_rejections
+                 (submission_id INTEGER PRIMARY KEY,
+                  admin_id INTEGER NOT NULL,
+                  user_id INTEGER NOT NULL,
+                  item_name TEXT NOT NULL,
+                  original_chat_id INTEGER NOT NULL,
+                  original_message_id INTEGER NOT NULL,
+                  created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS increment_tiers
+                 (threshold INTEGER PRIMARY KEY,
+                  increment INTEGER NOT NULL)''')
+
+    c.execute('''INSERT OR IGNORE INTO system_status (id, submissions_open, auctions_open)
+                 VALUES (1, 0, 0)''')
+
+def migrate_auctions_columns(c):
+    """auctions.db v2: columns added to auctions/submissions after their first release"""
+    c.execute("PRAGMA table_info(auctions)")
+    existing_columns = [col[1] for col in c.fetchall()]
+
+    if 'seller_id' not in existing_columns:
+        c.execute("ALTER TABLE auctions ADD COLUMN seller_id INTEGER")
+        debug_log("Added seller_id column to auctions table")
+
+    if 'seller_name' not in existing_columns:
+        c.execute("ALTER TABLE auctions ADD COLUMN seller_name TEXT")
+        debug_log("Added seller_name column to auctions table")
+
+    if 'auction_status' not in existing_columns:
+        c.execute("ALTER TABLE auctions ADD COLUMN auction_status TEXT DEFAULT 'active'")
+        debug_log("Added auction_status column to auctions table")
+
+    if 'state_version' not in existing_columns:
+        c.execute("ALTER TABLE auctions ADD COLUMN state_version INTEGER DEFAULT 0")
+        debug_log("Added state_version column to auctions table")
+
+    # item_name/category are denormalized from the submission JSON so list views
+    # (/mybids, /myitems) render from one query without parsing a row at a time
+    for column in ('item_name', 'category'):
+        if column not in existing_columns:
+            c.execute(f"ALTER TABLE auctions ADD COLUMN {column} TEXT")
+            debug_log(f"Added {column} column to auctions table")
+
+    if 'ends_at' not in existing_columns:
+        c.execute("ALTER TABLE auctions ADD COLUMN ends_at REAL")
+        debug_log("Added ends_at column to auctions table")
+
+    c.execute("PRAGMA table_info(submissions)")
+    submission_columns = [col[1] for col in c.fetchall()]
+    for column in ('item_name', 'category'):
+        if column not in submission_columns:
+            c.execute(f"ALTER TABLE submissions ADD COLUMN {column} TEXT")
+            debug_log(f"Added {column} column to submissions table")
+
+def migrate_auctions_bid_indexes(c):
+    """auctions.db v3: user_leading (seeded from auctions), proxy_bids and lookup indexes"""
+    # Current leader of every active auction, kept in step by the bid writers so
+    # /mybids is an indexed lookup on user_id instead of a scan over bids
+    c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='user_leading'")
+    leading_exists = c.fetchone() is not None
+    c.execute('''CREATE TABLE IF NOT EXISTS user_leading
+                 (auction_id INTEGER PRIMARY KEY,
+                  user_id INTEGER NOT NULL,
+                  amount REAL NOT NULL,
+                  FOREIGN KEY(auction_id) REFERENCES auctions(auction_id))''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_user_leading_user ON user_leading (user_id)")
+
+    c.execute('''CREATE TABLE IF NOT EXISTS proxy_bids
+                 (auction_id INTEGER NOT NULL,
+                  user_id INTEGER NOT NULL,
+                  bidder_name TEXT,
+                  max_amount REAL NOT NULL,
+                  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                  PRIMARY KEY (auction_id, user_id),
+                  FOREIGN KEY(auction_id) REFERENCES auctions(auction_id))''')
+    if not leading_exists:
+        c.execute('''INSERT INTO user_leading (auction_id, user_id, amount)
+                     SELECT auction_id, current_bidder_id, current_bid FROM auctions
+                     WHERE current_bidder_id IS NOT NULL AND current_bid IS NOT NULL
+                     AND auction_status = 'active' ''')
+
+    c.execute("CREATE INDEX IF NOT EXISTS idx_submissions_user_status ON submissions (user_id, status)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_auctions_channel_message ON auctions (channel_message_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_auctions_ends_at ON auctions (auction_status, ends_at)")
+
+def migrate_auctions_item_summaries(c):
+    """auctions.db v4: fill item_name/category on rows written before those columns existed"""
+    backfill_item_summaries(c)
+
+def migrate_auctions_bid_keys(c):
+    """auctions.db v5: idempotency key on bids, so a replayed update can't place the same bid twice"""
+    c.execute("PRAGMA table_info(bids)")
+    if 'idempotency_key' not in [col[1] for col in c.fetchall()]:
+        c.execute("ALTER TABLE bids ADD COLUMN idempotency_key TEXT")
+    c.execute('''CREATE UNIQUE INDEX IF NOT EXISTS idx_bids_idempotency_key ON bids (idempotency_key)
+                 WHERE idempotency_key IS NOT NULL''')
+
+def migrate_auctions_submission_claims(c):
+    """auctions.db v6: when a submission last changed status, so an abandoned 'processing' claim can expire"""
+    c.execute("PRAGMA table_info(submissions)")
+    if 'status_changed_at' not in [col[1] for col in c.fetchall()]:
+        c.execute("ALTER TABLE submissions ADD COLUMN status_changed_at REAL")
+
+def migrate_auctions_submission_auction(c):
+    """auctions.db v7: the auction an approval created, so one that dies half way can be taken down"""
+    c.execute("PRAGMA table_info(submissions)")
+    if 'auction_id' not in [col[1] for col in c.fetchall()]:
+        c.execute("ALTER TABLE submissions ADD COLUMN auction_id INTEGER")
+
+# Append new schema changes as the next number; never edit a migration that has shipped
+AUCTIONS_MIGRATIONS = [
+    (1, migrate_auctions_tables),
+    (2, migrate_auctions_columns),
+    (3, migrate_auctions_bid_indexes),
+    (4, migrate_auctions_item_summaries),
+    (5, migrate_auctions_bid_keys),
+    (6, migrate_auctions_submission_claims),
+    (7, migrate_auctions_submission_auction),
+]
+
+def run_migrations(db_name, migrations):
+    """Apply the migrations numbered above the file's PRAGMA user_version, all in one transaction.
+
+    migrations is a list of (version, function(cursor)) in ascending order. An
+    up-to-date file costs a single PRAGMA read. The first migration of every
+    file is written to also bring a file created before versioning (version 0,
+    tables already there) up to date. Returns the number of migrations applied.
+    """
+    latest = migrations[-1][0]
+    with db_connection(db_name) as conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= latest:
+            return 0
+
+        conn.isolation_level = None
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # re-read under the write lock in case another process migrated meanwhile
+            current = conn.execute("PRAGMA user_version").fetchone()[0]
+            c = conn.cursor()
+            applied = 0
+            for version, migrate in migrations:
+                if version > current:
+                    migrate(c)
+                    applied += 1
+                    debug_log(f"{db_name}: applied migration {version} ({migrate.__name__})")
+            conn.execute(f"PRAGMA user_version = {max(latest, current)}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return applied
+
+def init_db():
+    try:
+        applied = run_migrations('auctions.db', AUCTIONS_MIGRATIONS)
+        if applied:
+            debug_log(f"Database migrated ({applied} migrations)")
     except Exception as e:
         debug_log(f"Database initialization failed: {str(e)}")
         raise
 
-def init_verified_users_db():
-    try:
-        with db_connection('verified_users.db') as conn:
-            c = conn.cursor()
-            c.execute("PRAGMA foreign_keys = ON")
-
-            tables = {
-                'verified_users': '''
-                    CREATE TABLE IF NOT EXISTS verified_users (
-                        user_id INTEGER PRIMARY KEY,
-                        username TEXT NOT NULL,
-                        verified_by INTEGER NOT NULL,
-                        verified_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        last_active DATETIME,
-                        total_submissions INTEGER DEFAULT 0,
-                        total_bids INTEGER DEFAULT 0,
-                        FOREIGN KEY (verified_by) REFERENCES verified_users(user_id)
-                    )''',
-
-                'verification_requests': '''
-                    CREATE TABLE IF NOT EXISTS verification_requests (
-                        request_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER UNIQUE NOT NULL,
-                        username TEXT NOT NULL,
-                        request_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (user_id) REFERENCES verified_users(user_id) ON DELETE CASCADE
-                    )''',
-
-                'user_activity': '''
-                    CREATE TABLE IF NOT EXISTS user_activity (
-                        log_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER NOT NULL,
-                        action TEXT NOT NULL,
-                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        details TEXT,
-                        FOREIGN KEY (user_id) REFERENCES verified_users(user_id) ON DELETE CASCADE
-                    )'''
-            }
+def migrate_verified_users_v1(c):
+    """verified_users.db v1: users, requests and activity log"""
+    tables = {
+        'verified_users': '''
+            CREATE TABLE IF NOT EXISTS verified_users (
+                user_id INTEGER PRIMARY KEY,
+                username TEXT NOT NULL,
+                verified_by INTEGER NOT NULL,
+                verified_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                last_active DATETIME,
+                total_submissions INTEGER DEFAULT 0,
+                total_bids INTEGER DEFAULT 0,
+                FOREIGN KEY (verified_by) REFERENCES verified_users(user_id)
+            )''',
+
+        'verification_requests': '''
+            CREATE TABLE IF NOT EXISTS verification_requests (
+                request_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER UNIQUE NOT NULL,
+                username TEXT NOT NULL,
+                request_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES verified_users(user_id) ON DELETE CASCADE
+            )''',
+
+        'user_activity': '''
+            CREATE TABLE IF NOT EXISTS user_activity (
+                log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                action TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                details TEXT,
+                FOREIGN KEY (user_id) REFERENCES verified_users(user_id) ON DELETE CASCADE
+            )'''
+    }
 
-            for table_name, schema in tables.items():
-                c.execute(schema)
+    for table_name, schema in tables.items():
+        c.execute(schema)
 
-                c.execute(f"PRAGMA table_info({table_name})")
-                existing_columns = [col[1] for col in c.fetchall()]
+        c.execute(f"PRAGMA table_info({table_name})")
+        existing_columns = [col[1] for col in c.fetchall()]
 
-                if table_name == 'verified_users' and 'last_active' not in existing_columns:
-                    c.execute("ALTER TABLE verified_users ADD COLUMN last_active DATETIME")
-                if table_name == 'verified_users' and 'total_bids' not in existing_columns:
-                    c.execute("ALTER TABLE verified_users ADD COLUMN total_bids INTEGER DEFAULT 0")
+        if table_name == 'verified_users' and 'last_active' not in existing_columns:
+            c.execute("ALTER TABLE verified_users ADD COLUMN last_active DATETIME")
+        if table_name == 'verified_users' and 'total_bids' not in existing_columns:
+            c.execute("ALTER TABLE verified_users ADD COLUMN total_bids INTEGER DEFAULT 0")
 
-            c.execute('''CREATE INDEX IF NOT EXISTS idx_verified_users_id ON verified_users(user_id)''')
-            c.execute('''CREATE INDEX IF NOT EXISTS idx_activity_user ON user_activity(user_id)''')
-            c.execute('''CREATE INDEX IF NOT EXISTS idx_requests_date ON verification_requests(request_date)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_verified_users_id ON verified_users(user_id)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_activity_user ON user_activity(user_id)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_requests_date ON verification_requests(request_date)''')
 
-            conn.commit()
-            debug_log("Verified users database initialized")
+VERIFIED_USERS_MIGRATIONS = [
+    (1, migrate_verified_users_v1),
+]
+
+def init_verified_users_db():
+    try:
+        if run_migrations('verified_users.db', VERIFIED_USERS_MIGRATIONS):
+            debug_log("Verified users database migrated")
     except Exception as e:
         debug_log(f"Verified users DB init failed: {str(e)}")
         raise
@@ -223,20 +992,24 @@ def leaderboard_connection(db_name="leaderboard.db"):
     conn.row_factory = sqlite3.Row
     return conn
 
+def migrate_leaderboard_v1(c):
+    """leaderboard.db v1: wins and sales per user"""
+    c.execute('''CREATE TABLE IF NOT EXISTS leaderboard (
+                    user_id INTEGER PRIMARY KEY,
+                    username TEXT NOT NULL,
+                    total_wins INTEGER DEFAULT 0,
+                    total_sales INTEGER DEFAULT 0,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )''')
+
+LEADERBOARD_MIGRATIONS = [
+    (1, migrate_leaderboard_v1),
+]
+
 def init_leaderboard_db():
     try:
-        conn = leaderboard_connection()
-        c = conn.cursor()
-        c.execute('''CREATE TABLE IF NOT EXISTS leaderboard (
-                        user_id INTEGER PRIMARY KEY,
-                        username TEXT NOT NULL,
-                        total_wins INTEGER DEFAULT 0,
-                        total_sales INTEGER DEFAULT 0,
-                        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                    )''')
-        conn.commit()
-        conn.close()
-        debug_log("Leaderboard DB initialized")
+        if run_migrations('leaderboard.db', LEADERBOARD_MIGRATIONS):
+            debug_log("Leaderboard DB migrated")
     except Exception as e:
         debug_log(f"Leaderboard DB init failed: {str(e)}")
         raise
@@ -251,29 +1024,32 @@ def profile_connection(db_name='user_profiles.db'):
         debug_log(f"Error connecting to profile database {db_name}: {str(e)}")
         raise
 
+def migrate_profiles_v1(c):
+    """user_profiles.db v1: submission counters per user"""
+    c.execute('''CREATE TABLE IF NOT EXISTS user_profiles
+                 (user_id INTEGER PRIMARY KEY,
+                  username TEXT,
+                  first_name TEXT,
+                  total_submissions INTEGER DEFAULT 0,
+                  approved_submissions INTEGER DEFAULT 0,
+                  rejected_submissions INTEGER DEFAULT 0,
+                  pending_submissions INTEGER DEFAULT 0,
+                  revoked_submissions INTEGER DEFAULT 0,
+                  is_banned BOOLEAN DEFAULT 0,
+                  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_profiles_user_id
+                 ON user_profiles(user_id)''')
+
+PROFILES_MIGRATIONS = [
+    (1, migrate_profiles_v1),
+]
+
 def init_profiles_db():
     try:
-        with profile_connection() as conn:
-            c = conn.cursor()
-
-            c.execute('''CREATE TABLE IF NOT EXISTS user_profiles
-                         (user_id INTEGER PRIMARY KEY,
-                          username TEXT,
-                          first_name TEXT,
-                          total_submissions INTEGER DEFAULT 0,
-                          approved_submissions INTEGER DEFAULT 0,
-                          rejected_submissions INTEGER DEFAULT 0,
-                          pending_submissions INTEGER DEFAULT 0,
-                          revoked_submissions INTEGER DEFAULT 0,
-                          is_banned BOOLEAN DEFAULT 0,
-                          created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                          updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-
-            c.execute('''CREATE INDEX IF NOT EXISTS idx_profiles_user_id
-                         ON user_profiles(user_id)''')
-
-            conn.commit()
-            debug_log("User profiles database initialized successfully")
+        if run_migrations('user_profiles.db', PROFILES_MIGRATIONS):
+            debug_log("User profiles database migrated")
     except Exception as e:
         debug_log(f"Profiles database initialization failed: {str(e)}")
         raise
@@ -292,14 +1068,12 @@ def load_admins():
     try:
         with db_connection('auctions.db') as conn:
             c = conn.cursor()
-            
-            # Ensure table exists
-            c.execute('''CREATE TABLE IF NOT EXISTS bot_admins
-                         (user_id INTEGER PRIMARY KEY,
-                          username TEXT,
-                          added_by INTEGER,
-                          added_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-            
+
+            # bot_admins is created by the auctions.db migrations; before the first run there are none
+            c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='bot_admins'")
+            if not c.fetchone():
+                return env_admins
+
             c.execute('SELECT user_id FROM bot_admins')
             db_admins = [row['user_id'] for row in c.fetchall()]
             
@@ -310,6 +1084,12 @@ def load_admins():
         debug_log(f"Error loading admins from database: {str(e)}")
         return env_admins
 
+def get_bot_admins():
+    with db_connection('auctions.db') as conn:
+        return conn.execute('''SELECT user_id, username, added_at, added_by
+                               FROM bot_admins
+                               ORDER BY added_at''').fetchall()
+
 # Load ADMINS dynamically
 
 
@@ -322,6 +1102,69 @@ CHANNEL_ID = int(os.getenv("CHANNEL_ID", "-1003321180638"))
 CHANNEL_USERNAME = os.getenv("CHANNEL_USERNAME", "@sjsjwhabb")
 DISCUSSION_ID = int(os.getenv("DISCUSSION_ID", "-1003333433940"))
 LOGS_CHANNEL_ID = int(os.getenv("LOGS_CHANNEL_ID", "-1003333433940"))
+# Optional Bot API endpoint override (e.g. the local stand-in used by benchmarks/load_test.py)
+BOT_API_BASE_URL = os.getenv("BOT_API_BASE_URL") or None
+# How many updates the Application processes at once, and the HTTP connections shared by them
+CONCURRENT_UPDATES = int(os.getenv("CONCURRENT_UPDATES", "256"))
+# Share of those workers that browsing (/items, Refresh, ...) and unclassified updates may occupy;
+# bids and admin actions can use all of them
+BROWSE_UPDATE_SHARE = float(os.getenv("BROWSE_UPDATE_SHARE", "0.25"))
+DEFAULT_UPDATE_SHARE = float(os.getenv("DEFAULT_UPDATE_SHARE", "0.5"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "128"))
+# Bid log messages waiting on the logs channel's 20/minute budget beyond this many are dropped
+BID_LOG_MAX_BACKLOG = int(os.getenv("BID_LOG_MAX_BACKLOG", "200"))
+# Refresh backpressure: a user gets one real refresh per REFRESH_USER_COOLDOWN_SECONDS, a channel post is
+# re-edited at most once per REFRESH_MESSAGE_COOLDOWN_SECONDS, and refreshes are shed with a "busy" toast
+# while more than REFRESH_SHED_BACKLOG updates and API calls are waiting
+REFRESH_USER_COOLDOWN_SECONDS = float(os.getenv("REFRESH_USER_COOLDOWN_SECONDS", "3"))
+REFRESH_MESSAGE_COOLDOWN_SECONDS = float(os.getenv("REFRESH_MESSAGE_COOLDOWN_SECONDS", "2"))
+REFRESH_SHED_BACKLOG = int(os.getenv("REFRESH_SHED_BACKLOG", "200"))
+# user_data / bot_data / conversation persistence: dirty entries are written every USER_DATA_FLUSH_SECONDS,
+# users idle for USER_DATA_IDLE_SECONDS (or beyond the USER_DATA_MAX_RESIDENT most recent) are dropped from
+# memory and reloaded on their next update, and rows untouched for USER_DATA_TTL_DAYS are deleted
+BOT_STATE_DB = os.getenv("BOT_STATE_DB", "bot_state.db")
+USER_DATA_FLUSH_SECONDS = float(os.getenv("USER_DATA_FLUSH_SECONDS", "30"))
+USER_DATA_IDLE_SECONDS = float(os.getenv("USER_DATA_IDLE_SECONDS", "3600"))
+USER_DATA_MAX_RESIDENT = int(os.getenv("USER_DATA_MAX_RESIDENT", "5000"))
+USER_DATA_TTL_DAYS = float(os.getenv("USER_DATA_TTL_DAYS", "30"))
+# Session reaper: the /add wizard ends after ADD_CONVERSATION_TIMEOUT_SECONDS without an answer; every
+# SESSION_REAPER_INTERVAL_SECONDS stale temp_data rows, bid contexts and rejection sessions are removed,
+# SESSION_REAPER_CHUNK at a time
+ADD_CONVERSATION_TIMEOUT_SECONDS = float(os.getenv("ADD_CONVERSATION_TIMEOUT_SECONDS", "900"))
+BID_CONTEXT_TTL_SECONDS = float(os.getenv("BID_CONTEXT_TTL_SECONDS", "900"))
+REJECTION_TTL_SECONDS = float(os.getenv("REJECTION_TTL_SECONDS", "3600"))
+SESSION_REAPER_INTERVAL_SECONDS = float(os.getenv("SESSION_REAPER_INTERVAL_SECONDS", "300"))
+SESSION_REAPER_CHUNK = int(os.getenv("SESSION_REAPER_CHUNK", "500"))
+# Replay protection: the last fully processed update_id plus the update, callback query and message ids of
+# the last UPDATE_DEDUPE_WINDOW_SECONDS (at most UPDATE_DEDUPE_MAX_KEYS of them) are kept in BOT_STATE_DB,
+# and updates seen before are dropped before any handler runs
+UPDATE_DEDUPE_WINDOW_SECONDS = float(os.getenv("UPDATE_DEDUPE_WINDOW_SECONDS", "600"))
+UPDATE_DEDUPE_MAX_KEYS = int(os.getenv("UPDATE_DEDUPE_MAX_KEYS", "50000"))
+# processed updates are written to the ledger in one batch every UPDATE_LEDGER_FLUSH_SECONDS
+UPDATE_LEDGER_FLUSH_SECONDS = float(os.getenv("UPDATE_LEDGER_FLUSH_SECONDS", "1"))
+# Backups: daily at BACKUP_TIME (UTC, HH:MM; empty disables) BACKUP_DATABASES are copied into a timestamped
+# directory under BACKUP_DIR with SQLite's online backup API, BACKUP_PAGES_PER_STEP pages per step with
+# BACKUP_STEP_PAUSE_SECONDS between steps; the newest BACKUP_KEEP snapshots are kept
+BACKUP_DIR = os.getenv("BACKUP_DIR", "backups")
+BACKUP_DATABASES = [name.strip() for name in os.getenv(
+    "BACKUP_DATABASES", "auctions.db,verified_users.db,leaderboard.db,user_profiles.db").split(",") if name.strip()]
+BACKUP_TIME = os.getenv("BACKUP_TIME", "04:00")
+BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "7"))
+BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+BACKUP_STEP_PAUSE_SECONDS = float(os.getenv("BACKUP_STEP_PAUSE_SECONDS", "0.01"))
+# Per-user flood guard: "class=rate:burst" per update class (bid, browse, default), rate in calls per second
+DEFAULT_USER_RATE_LIMITS = "bid=2:6, browse=0.5:5, default=1:5"
+USER_RATE_LIMITS = os.getenv("USER_RATE_LIMITS", DEFAULT_USER_RATE_LIMITS)
+# Per-item closing: new listings end AUCTION_DURATION_MINUTES after approval (0 leaves /endauction as the
+# only close), and closing times are spread at least AUCTION_CLOSE_STAGGER_SECONDS apart
+AUCTION_DURATION_MINUTES = float(os.getenv("AUCTION_DURATION_MINUTES", "0"))
+AUCTION_CLOSE_STAGGER_SECONDS = float(os.getenv("AUCTION_CLOSE_STAGGER_SECONDS", "15"))
+# An approval still 'processing' this long after its claim was cut short by a crash; startup puts it back to pending
+SUBMISSION_CLAIM_TIMEOUT_MINUTES = float(os.getenv("SUBMISSION_CLAIM_TIMEOUT_MINUTES", "10"))
+# Soft close: a bid in the last ANTI_SNIPE_WINDOW_SECONDS of a timed item pushes its end to
+# ANTI_SNIPE_EXTENSION_SECONDS from the bid (0 disables)
+ANTI_SNIPE_WINDOW_SECONDS = float(os.getenv("ANTI_SNIPE_WINDOW_SECONDS", "120"))
+ANTI_SNIPE_EXTENSION_SECONDS = float(os.getenv("ANTI_SNIPE_EXTENSION_SECONDS", "120"))
 
 def ensure_single_instance():
     """
@@ -409,7 +1252,7 @@ def format_html_safe(*lines, escape_all=True):
         formatted_lines.append(line)
     return '<br>'.join(formatted_lines)
 
-def set_admin_commands(bot, admin_id):
+async def set_admin_commands(bot, admin_id):
     """Set admin commands for a specific admin"""
     admin_commands = [
         BotCommand('start', 'Start the bot'),
@@ -418,6 +1261,8 @@ def set_admin_commands(bot, admin_id):
         BotCommand('items', 'View auction items'),
         BotCommand('myitems', 'View your approved items'),
         BotCommand('mybids', 'View your active bids'),
+        BotCommand('bids', 'Bid on several items at once'),
+        BotCommand('maxbid', 'Set a maximum (proxy) bid'),
         BotCommand('topsellers', 'View Top sellers'),
         BotCommand('topbuyers', 'View Top buyers'),
         BotCommand('profile', 'View your Profile'),
@@ -435,11 +1280,14 @@ def set_admin_commands(bot, admin_id):
         BotCommand('addadmin', 'Add new admin'),
         BotCommand('removeadmin', 'Remove admin'),
         BotCommand('listadmins', 'List all admins'),
+        BotCommand('setincrements', 'Change bid increment tiers'),
+        BotCommand('bidlanes', 'Show bid lane queue depths'),
+        BotCommand('setend', 'Set an item closing time'),
     ]
     
-    bot.set_my_commands(admin_commands, scope=BotCommandScopeChat(admin_id))
+    await bot.set_my_commands(admin_commands, scope=BotCommandScopeChat(admin_id))
 
-def set_bot_commands(updater):
+async def set_bot_commands(application):
     user_commands = [
         BotCommand('start', 'Start the bot'),
         BotCommand('add', 'Submit new item'),
@@ -447,6 +1295,8 @@ def set_bot_commands(updater):
         BotCommand('items', 'View auction items'),
         BotCommand('myitems', 'View your approved items'),
         BotCommand('mybids', 'View your active bids'),
+        BotCommand('bids', 'Bid on several items at once'),
+        BotCommand('maxbid', 'Set a maximum (proxy) bid'),
         BotCommand('topsellers', 'View Top sellers'),
         BotCommand('topbuyers', 'View Top buyers'),
         BotCommand('profile', 'View your Profile'),
@@ -467,19 +1317,22 @@ def set_bot_commands(updater):
         BotCommand('addadmin', 'Add new admin'),
         BotCommand('removeadmin', 'Remove admin'),
         BotCommand('listadmins', 'List all admins'),
+        BotCommand('setincrements', 'Change bid increment tiers'),
+        BotCommand('bidlanes', 'Show bid lane queue depths'),
+        BotCommand('setend', 'Set an item closing time'),
     ]
 
     try:
-        updater.bot.set_my_commands(user_commands)
+        await application.bot.set_my_commands(user_commands)
         for admin_id in ADMINS:
             try:
-                set_admin_commands(updater.bot, admin_id)
+                await set_admin_commands(application.bot, admin_id)
             except Exception as e:
                 debug_log(f"Failed to set admin commands for {admin_id}: {str(e)}")
     except Exception as e:
         debug_log(f"Error setting bot commands: {str(e)}")
 
-def show_help(update: Update, context: CallbackContext):
+async def show_help(update: Update, context: CallbackContext):
     is_admin = update.effective_user.id in ADMINS
 
     help_text = [
@@ -492,9 +1345,12 @@ def show_help(update: Update, context: CallbackContext):
         "/items - View auction items",
         "/myitems - View your approved items",
         "/mybids - View your active bids",
+        "/bids - Bid on several items at once, one <code>ID amount</code> per line",
+        "/maxbid - Let the bot bid for you up to a maximum",
         "/topsellers - View Top Sellers",
         "/topbuyers - View Top Buyers",
         "/profile - View your profile",
+        "/increments - View minimum bid increments",
     ]
 
     if is_admin:
@@ -511,20 +1367,23 @@ def show_help(update: Update, context: CallbackContext):
             "/unverify - Unverify a user",
             "/broad - Broadcast a message",
             "/msg - Message to specific user",
+            "/setincrements - Change bid increment tiers",
+            "/bidlanes - Show bid lane queue depths",
+            "/setend - Set when a single item closes",
         ])
 
-    update.message.reply_text("\n".join(help_text), parse_mode='HTML')
+    await update.message.reply_text("\n".join(help_text), parse_mode='HTML')
 
 def admin_only(func):
-    def wrapper(update: Update, context: CallbackContext):
+    async def wrapper(update: Update, context: CallbackContext):
         # Reload admins to ensure we have the latest list
         global ADMINS
-        ADMINS = load_admins()
+        ADMINS = await run_db(load_admins)
         
         if update.effective_user.id not in ADMINS:
-            update.message.reply_text("🚫 Admin only command")
+            await update.message.reply_text("🚫 Admin only command")
             return
-        return func(update, context)
+        return await func(update, context)
     return wrapper
 
 def is_forwarded_from_hexamon(update: Update) -> bool:
@@ -534,33 +1393,110 @@ def is_forwarded_from_hexamon(update: Update) -> bool:
     return (forward_from.username and
             forward_from.username.lower().replace(" ", "") == "hexamonbot")
 
+# Minimum bid increment ladder: (threshold, increment) pairs sorted by threshold.
+# A bid at or above a threshold must be raised by that tier's increment. The bot
+# runs one auction event at a time (/startauction ... /endauction), so the ladder
+# admins save with /setincrements is that event's ladder.
+DEFAULT_INCREMENT_TIERS = (
+    (0, 1000),
+    (20000, 2000),
+    (40000, 3000),
+    (70000, 4000),
+    (100000, 5000),
+    (200000, 10000),
+    (400000, 20000),
+    (600000, 30000),
+    (800000, 40000),
+    (1000000, 50000),
+)
+
+INCREMENT_THRESHOLDS = [threshold for threshold, _ in DEFAULT_INCREMENT_TIERS]
+INCREMENT_VALUES = [increment for _, increment in DEFAULT_INCREMENT_TIERS]
+
+# Per-auction bid state (auction_id -> {'current_amount', 'next_bid'}), kept in step by record_bid/remove_last_bid
+AUCTION_STATE = {}
+
+def parse_increment_tiers(text):
+    """Parse "0:1k, 20k:2k, 40k:3k" into sorted (threshold, increment) pairs; raises ValueError"""
+    tiers = {}
+    for entry in re.split(r'[,\s]+', text.strip()):
+        if not entry:
+            continue
+        threshold_text, sep, increment_text = entry.partition(':')
+        threshold = parse_bid_amount(threshold_text)
+        increment = parse_bid_amount(increment_text)
+        if not sep or threshold is None or increment is None:
+            raise ValueError(f"Invalid tier '{entry}', expected threshold:increment")
+        if threshold < 0 or increment <= 0:
+            raise ValueError(f"Invalid tier '{entry}', threshold must be >= 0 and increment > 0")
+        if threshold in tiers:
+            raise ValueError(f"Duplicate threshold in tier '{entry}'")
+        tiers[threshold] = increment
+
+    if not tiers:
+        raise ValueError("No increment tiers given")
+    return sorted(tiers.items())
+
+def set_increment_tiers(tiers):
+    global INCREMENT_THRESHOLDS, INCREMENT_VALUES
+    tiers = sorted(tiers)
+    INCREMENT_THRESHOLDS = [threshold for threshold, _ in tiers]
+    INCREMENT_VALUES = [increment for _, increment in tiers]
+    AUCTION_STATE.clear()
+
+def load_increment_tiers():
+    """Load the ladder from the increment_tiers table, falling back to INCREMENT_TIERS in the env, then the defaults"""
+    tiers = None
+    try:
+        with db_connection() as conn:
+            rows = conn.execute("SELECT threshold, increment FROM increment_tiers ORDER BY threshold").fetchall()
+            if rows:
+                tiers = [(int(row['threshold']), int(row['increment'])) for row in rows]
+    except Exception as e:
+        debug_log(f"Error loading increment tiers from database: {str(e)}")
+
+    if not tiers and os.getenv("INCREMENT_TIERS"):
+        try:
+            tiers = parse_increment_tiers(os.getenv("INCREMENT_TIERS"))
+        except ValueError as e:
+            debug_log(f"Ignoring INCREMENT_TIERS: {str(e)}")
+
+    set_increment_tiers(tiers or DEFAULT_INCREMENT_TIERS)
+    debug_log(f"Loaded {len(INCREMENT_THRESHOLDS)} increment tiers")
+
+def save_increment_tiers(tiers):
+    with db_connection() as conn:
+        c = conn.cursor()
+        c.execute("DELETE FROM increment_tiers")
+        c.executemany("INSERT INTO increment_tiers (threshold, increment) VALUES (?, ?)", tiers)
+        conn.commit()
+    set_increment_tiers(tiers)
+
 def get_min_increment(current_bid):
-    if current_bid is None or current_bid == 0:
-        return 1000
+    if not current_bid:
+        return INCREMENT_VALUES[0]
     try:
-        current_bid = float(current_bid)
-        if current_bid < 20000:
-            return 1000
-        elif current_bid < 40000:
-            return 2000
-        elif current_bid < 70000:
-            return 3000
-        elif current_bid < 100000:
-            return 4000
-        elif current_bid < 200000:
-            return 5000
-        elif current_bid < 400000:
-            return 10000
-        elif current_bid < 600000:
-            return 20000
-        elif current_bid < 800000:
-            return 30000
-        elif current_bid < 1000000:
-            return 40000
-        else:  
-            return 50000
-    except (TypeError, ValueError):
-        return 1000
+        index = bisect.bisect_right(INCREMENT_THRESHOLDS, current_bid) - 1
+    except TypeError:
+        # numeric strings from older callers
+        try:
+            index = bisect.bisect_right(INCREMENT_THRESHOLDS, float(current_bid)) - 1
+        except (TypeError, ValueError):
+            return INCREMENT_VALUES[0]
+    return INCREMENT_VALUES[index] if index > 0 else INCREMENT_VALUES[0]
+
+def get_next_valid_bid(auction):
+    """Smallest acceptable bid for an auction dict, served from AUCTION_STATE when still current"""
+    current_amount = auction.get('current_bid') or auction.get('base_price', 0)
+    state = AUCTION_STATE.get(auction['auction_id'])
+    if state and state['current_amount'] == current_amount:
+        return state['next_bid']
+    return update_auction_state(auction['auction_id'], current_amount)
+
+def update_auction_state(auction_id, current_amount):
+    next_bid = current_amount + get_min_increment(current_amount)
+    AUCTION_STATE[auction_id] = {'current_amount': current_amount, 'next_bid': next_bid}
+    return next_bid
 
 def format_bid_amount(amount):
     try:
@@ -607,18 +1543,23 @@ def parse_bid_amount(text):
     try:
         if text.endswith('k'):
             number_part = text[:-1]
-            return int(round(float(number_part) * 1000))
+            amount = float(number_part) * 1000
 
         elif text.endswith('m'):
             number_part = text[:-1]
-            return int(round(float(number_part) * 1000000))
+            amount = float(number_part) * 1000000
 
         else:
-            return int(round(float(text)))
+            amount = float(text)
 
     except (ValueError, AttributeError):
         return None
 
+    # "inf", "nan" and "1e999" parse as floats but are no amount
+    if not math.isfinite(amount):
+        return None
+    return int(round(amount))
+
 def extract_base_price(text):
     try:
         if not text:
@@ -633,7 +1574,8 @@ def extract_base_price(text):
     except (ValueError, AttributeError):
         return None
 
-def save_auction(item_text, photo_id, base_price, seller_id, seller_name, channel_msg_id=None):
+def save_auction(item_text, photo_id, base_price, seller_id, seller_name, channel_msg_id=None,
+                 item_name=None, category=None, submission_id=None):
     try:
         if not item_text or base_price is None:
             raise ValueError("Missing required fields (item_text or base_price)")
@@ -641,7 +1583,7 @@ def save_auction(item_text, photo_id, base_price, seller_id, seller_name, channe
         if seller_name:
             seller_name = seller_name.replace('\\', '')
 
-        with db_connection() as conn:
+        def insert_auction(conn):
             c = conn.cursor()
 
             if channel_msg_id:
@@ -651,20 +1593,28 @@ def save_auction(item_text, photo_id, base_price, seller_id, seller_name, channe
                     return None
 
             c.execute('''INSERT INTO auctions
-                        (item_text, photo_id, base_price, channel_message_id, is_active, seller_id, seller_name)
-                        VALUES (?, ?, ?, ?, 1, ?, ?)''',
+                        (item_text, photo_id, base_price, channel_message_id, is_active, seller_id, seller_name,
+                         item_name, category)
+                        VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?)''',
                     (str(item_text),
                      str(photo_id) if photo_id else None,
                      float(base_price),
                      channel_msg_id,
                      seller_id,
-                     seller_name))
-
+                     seller_name,
+                     item_name,
+                     category))
             auction_id = c.lastrowid
-            conn.commit()
-            debug_log(f"Successfully saved auction ID {auction_id}")
+            if submission_id is not None:
+                # in the same write, so an approval that dies after this leaves no auction nobody knows about
+                c.execute("UPDATE submissions SET auction_id=? WHERE submission_id=?", (auction_id, submission_id))
             return auction_id
 
+        auction_id = DB_WRITER.write(insert_auction)
+        if auction_id:
+            debug_log(f"Successfully saved auction ID {auction_id}")
+        return auction_id
+
     except Exception as e:
         debug_log(f"Critical error saving auction: {str(e)}")
         raise
@@ -695,74 +1645,337 @@ def verify_auction_integrity():
 
         return True
 
-def record_bid(auction_id, bidder_id, bidder_name, amount, context=None):
+def set_auction_leader(c, auction_id, bidder_id, amount):
+    """Point user_leading at the auction's new top bidder (None clears it); runs inside the bid transaction"""
+    if bidder_id is None:
+        c.execute("DELETE FROM user_leading WHERE auction_id=?", (auction_id,))
+    else:
+        c.execute('''INSERT OR REPLACE INTO user_leading (auction_id, user_id, amount)
+                     VALUES (?, ?, ?)''', (auction_id, bidder_id, amount))
+
+def bidder_labels(bidder_id, bidder_name):
+    """(name stored on the bid row, display string stored on the auction) for a bidder"""
+    if bidder_name and 'tg://user?id=' in bidder_name:
+        bidder_parts = bidder_name.split(' ')
+        if len(bidder_parts) > 1:
+            plain_bidder_name = bidder_parts[-1]
+        else:
+            plain_bidder_name = bidder_name
+    else:
+        plain_bidder_name = bidder_name.replace('\\', '') if bidder_name else "Unknown"
+
+    bidder_display = f"{plain_bidder_name} ({bidder_id})" if plain_bidder_name else f"User ({bidder_id})"
+    return plain_bidder_name, bidder_display
+
+def update_key_prefix(context, update):
+    """"<epoch>:<update_id>": the same for a replay of the update, never reused once Telegram restarts update_ids"""
+    ledger = getattr(context.application.update_processor, 'ledger', None)
+    return f"{ledger.epoch if ledger else 0}:{update.update_id}"
+
+def bid_idempotency_key(context, update, auction_id):
+    """Key of the bid an update places on an auction; a replay of the update derives the same one"""
+    return f"{update_key_prefix(context, update)}:{auction_id}"
+
+def find_keyed_bid(c, idempotency_key):
+    """The bid already written under idempotency_key, or None"""
+    if not idempotency_key:
+        return None
+    c.execute("SELECT bid_id, amount FROM bids WHERE idempotency_key=?", (idempotency_key,))
+    return c.fetchone()
+
+def write_bid(c, auction_id, bidder_id, plain_bidder_name, bidder_display, amount, idempotency_key=None,
+              expected_version=None):
+    """Validate and insert one bid on the writer's cursor.
+
+    The minimum is re-checked against the row as the writer sees it, so a bid
+    validated on a stale read can never be written under a higher one. With
+    expected_version the bid is refused as 'stale' if the auction's
+    state_version moved since it was read, whatever wrote in between. A bid
+    whose idempotency_key was already written comes back as 'duplicate'.
+    """
+    existing = find_keyed_bid(c, idempotency_key)
+    if existing:
+        return {'status': 'duplicate', 'amount': existing['amount']}
+
+    c.execute('''SELECT current_bid, base_price, ends_at, state_version FROM auctions
+                 WHERE auction_id=? AND auction_status='active' ''', (auction_id,))
+    auction = c.fetchone()
+    if not auction or (auction['ends_at'] and auction['ends_at'] <= time.time()):
+        return {'status': 'missing'}
+
+    current_amount = auction['current_bid'] or auction['base_price'] or 0
+    min_bid = current_amount + get_min_increment(current_amount)
+    if expected_version is not None and (auction['state_version'] or 0) != expected_version:
+        return {'status': 'stale', 'current_amount': current_amount, 'min_bid': min_bid}
+    if amount < int(min_bid):
+        return {'status': 'too_low', 'current_amount': current_amount, 'min_bid': min_bid}
+
+    prev_bidder = insert_bid_row(c, auction_id, bidder_id, plain_bidder_name, bidder_display, amount,
+                                 idempotency_key)
+    outcome = {'status': 'accepted', 'prev_bidder': prev_bidder, 'final_amount': amount}
+
+    proxy = resolve_proxy_bids(c, auction_id)
+    if proxy:
+        outcome['proxy'] = proxy
+        outcome['final_amount'] = proxy['amount']
+        outcome['outbid_by_proxy'] = proxy['bidder_id'] != bidder_id
+
+    extended_to = extend_for_late_bid(c, auction_id, auction['ends_at'])
+    if extended_to:
+        outcome['extended_to'] = extended_to
+    return outcome
+
+def extend_for_late_bid(c, auction_id, ends_at):
+    """Soft close: push a timed item's end back when a bid lands in its final window.
+
+    Only ends_at moves here; the close timer still fires at the old time, sees the
+    later deadline and re-arms itself once, so bursts of late bids don't churn the
+    JobQueue.
+    """
+    if not ends_at or ANTI_SNIPE_EXTENSION_SECONDS <= 0:
+        return None
+    now = time.time()
+    if ends_at - now > ANTI_SNIPE_WINDOW_SECONDS:
+        return None
+    new_end = now + ANTI_SNIPE_EXTENSION_SECONDS
+    if new_end <= ends_at:
+        return None
+    c.execute("UPDATE auctions SET ends_at=? WHERE auction_id=?", (new_end, auction_id))
+    return new_end
+
+def insert_bid_row(c, auction_id, bidder_id, plain_bidder_name, bidder_display, amount, idempotency_key=None):
+    """Insert a bid and make it the auction's current bid; returns the bid it displaced"""
+    c.execute('''SELECT bidder_id, bidder_name, amount
+                 FROM bids
+                 WHERE auction_id=? AND is_active=1
+                 ORDER BY amount DESC
+                 LIMIT 1''', (auction_id,))
+    prev_bidder = c.fetchone()
+
+    c.execute('''INSERT INTO bids (auction_id, bidder_id, bidder_name, amount, idempotency_key)
+                 VALUES (?, ?, ?, ?, ?)''',
+             (auction_id, bidder_id, plain_bidder_name, amount, idempotency_key))
+
+    if prev_bidder:
+        previous_bidder_name = prev_bidder['bidder_name'] if prev_bidder['bidder_name'] else None
+    else:
+        previous_bidder_name = None
+
+    c.execute('''UPDATE auctions SET
+                 current_bid=?,
+                 current_bidder_id=?,
+                 previous_bidder=?,
+                 current_bidder=?,
+                 state_version=state_version + 1
+                 WHERE auction_id=?''',
+              (amount, bidder_id, previous_bidder_name, bidder_display, auction_id))
+    set_auction_leader(c, auction_id, bidder_id, amount)
+    return prev_bidder
+
+def resolve_proxy_bids(c, auction_id):
+    """Settle competing proxy (max) bids on an auction inside the current bid transaction.
+
+    The highest maximum wins (of equal maxima, the one registered first) at one
+    increment over the runner-up's maximum, capped at its own.
+    Only that final bid is written, so a proxy war costs one bid row and one
+    channel edit. Returns {'bidder_id', 'amount', 'displaced'} or None when no
+    proxy can move the price.
+    """
+    c.execute("SELECT current_bid, current_bidder_id FROM auctions WHERE auction_id=?", (auction_id,))
+    auction = c.fetchone()
+    if not auction or auction['current_bid'] is None:
+        return None
+    price, leader = auction['current_bid'], auction['current_bidder_id']
+    next_bid = price + get_min_increment(price)
+
+    # INSERT OR REPLACE gives a changed maximum a new rowid, so rowid order is registration order
+    c.execute('''SELECT rowid, user_id, bidder_name, max_amount FROM proxy_bids
+                 WHERE auction_id=?
+                 ORDER BY max_amount DESC, rowid ASC''', (auction_id,))
+    proxies = c.fetchall()
+    challengers = [p for p in proxies if p['user_id'] != leader and p['max_amount'] >= next_bid]
+    if not challengers:
+        return None
+
+    leader_proxy = next((p for p in proxies if p['user_id'] == leader), None)
+    leader_max = max(price, leader_proxy['max_amount']) if leader_proxy else price
+    top = challengers[0]
+    # the leader can only tie through a proxy; a proxy that just took the lead with its opening bid
+    # must not win a tie against a maximum registered before it
+    leader_wins = leader_max > top['max_amount'] or (
+        leader_max == top['max_amount'] and leader_proxy['rowid'] < top['rowid'])
+    if leader_wins:
+        winner, winner_max, winner_name = leader, leader_max, None
+        runner_up = top['max_amount']
+    else:
+        winner, winner_max, winner_name = top['user_id'], top['max_amount'], top['bidder_name']
+        runner_up = max([leader_max] + [p['max_amount'] for p in challengers[1:]])
+
+    amount = min(winner_max, runner_up + get_min_increment(runner_up))
+    if winner == leader:
+        c.execute('''SELECT bidder_name FROM bids WHERE auction_id=? AND bidder_id=? AND is_active=1
+                     ORDER BY bid_id DESC LIMIT 1''', (auction_id, leader))
+        row = c.fetchone()
+        winner_name = row['bidder_name'] if row else None
+
+    plain_bidder_name, bidder_display = bidder_labels(winner, winner_name)
+    insert_bid_row(c, auction_id, winner, plain_bidder_name, bidder_display, amount)
+
+    # maxima the new price has passed can never bid again
+    c.execute('''DELETE FROM proxy_bids WHERE auction_id=? AND user_id != ? AND max_amount < ?''',
+              (auction_id, winner, amount + get_min_increment(amount)))
+    return {'bidder_id': winner, 'amount': amount, 'displaced': leader if winner != leader else None}
+
+def register_proxy_bid(c, auction_id, bidder_id, plain_bidder_name, bidder_display, max_amount):
+    """Store a user's maximum for an auction and bid for them right away if they are not leading"""
+    c.execute('''SELECT current_bid, base_price, current_bidder_id, ends_at FROM auctions
+                 WHERE auction_id=? AND auction_status='active' ''', (auction_id,))
+    auction = c.fetchone()
+    if not auction or (auction['ends_at'] and auction['ends_at'] <= time.time()):
+        return {'status': 'missing'}
+
+    current_amount = auction['current_bid'] or auction['base_price'] or 0
+    min_bid = current_amount + get_min_increment(current_amount)
+    leading = auction['current_bidder_id'] == bidder_id and auction['current_bid'] is not None
+    if max_amount < (current_amount + 1 if leading else int(min_bid)):
+        return {'status': 'too_low', 'current_amount': current_amount, 'min_bid': min_bid}
+
+    c.execute('''INSERT OR REPLACE INTO proxy_bids (auction_id, user_id, bidder_name, max_amount)
+                 VALUES (?, ?, ?, ?)''', (auction_id, bidder_id, plain_bidder_name, max_amount))
+
+    if leading:
+        return {'status': 'proxy_set', 'current_amount': current_amount}
+    outcome = write_bid(c, auction_id, bidder_id, plain_bidder_name, bidder_display, int(min_bid))
+    outcome['bid_amount'] = int(min_bid)
+    return outcome
+
+def record_bid(auction_id, bidder_id, bidder_name, amount, idempotency_key=None, expected_version=None):
     try:
         if bidder_id not in ADMINS and not check_verification_status(bidder_id):
             debug_log(f"Unverified user {bidder_id} attempted to place bid")
             raise ValueError("User not verified")
 
-        with db_connection() as conn:
-            c = conn.cursor()
+        plain_bidder_name, bidder_display = bidder_labels(bidder_id, bidder_name)
 
-            if bidder_name and 'tg://user?id=' in bidder_name:
-                bidder_parts = bidder_name.split(' ')
-                if len(bidder_parts) > 1:
-                    plain_bidder_name = bidder_parts[-1]  
-                else:
-                    plain_bidder_name = bidder_name
-            else:
-                plain_bidder_name = bidder_name.replace('\\', '') if bidder_name else "Unknown"
+        outcome = DB_WRITER.write(
+            lambda conn: write_bid(conn.cursor(), auction_id, bidder_id, plain_bidder_name, bidder_display, amount,
+                                   idempotency_key, expected_version)
+        )
+        if outcome['status'] == 'accepted':
+            update_auction_state(auction_id, outcome['final_amount'])
 
-            bidder_display = f"{plain_bidder_name} ({bidder_id})" if plain_bidder_name else f"User ({bidder_id})"
+        return outcome
 
-            c.execute('''SELECT bidder_id, bidder_name, amount
-                         FROM bids
-                         WHERE auction_id=? AND is_active=1
-                         ORDER BY amount DESC
-                         LIMIT 1''', (auction_id,))
-            prev_bidder = c.fetchone()
+    except Exception as e:
+        debug_log(f"Error in record_bid: {str(e)}")
+        raise
 
-            c.execute('''INSERT INTO bids (auction_id, bidder_id, bidder_name, amount)
-                         VALUES (?, ?, ?, ?)''',
-                     (auction_id, bidder_id, plain_bidder_name, amount))
+def record_bids(bidder_id, bidder_name, bids, key_prefix=None):
+    """Validate and write several (auction_id, amount) bids in one writer transaction.
 
-            if prev_bidder:
-                previous_bidder_name = prev_bidder['bidder_name'] if prev_bidder['bidder_name'] else None
-            else:
-                previous_bidder_name = None
+    Returns (auction_id, amount, outcome) per bid in input order; outcomes are
+    the same dicts apply_bid returns. With key_prefix each bid is keyed
+    "<key_prefix>:<auction_id>", so replaying the batch writes nothing twice.
+    """
+    if bidder_id not in ADMINS and not check_verification_status(bidder_id):
+        debug_log(f"Unverified user {bidder_id} attempted to place bid")
+        raise ValueError("User not verified")
 
-            c.execute('''UPDATE auctions SET
-                         current_bid=?,
-                         current_bidder_id=?,
-                         previous_bidder=?,
-                         current_bidder=?
-                         WHERE auction_id=?''',
-                      (amount, bidder_id, previous_bidder_name, bidder_display, auction_id))
+    plain_bidder_name, bidder_display = bidder_labels(bidder_id, bidder_name)
 
-            conn.commit()
-            
-            if context:
-                try:
-                    send_bid_log(context, auction_id, bidder_id, bidder_name, amount, prev_bidder)
-                except Exception as e:
-                    debug_log(f"Failed to send bid log: {str(e)}")
-            
-            return prev_bidder, auction_id
+    def insert_bids(conn):
+        c = conn.cursor()
+        results = [(auction_id, amount, write_bid(c, auction_id, bidder_id, plain_bidder_name, bidder_display, amount,
+                                                  f"{key_prefix}:{auction_id}" if key_prefix is not None else None))
+                   for auction_id, amount in bids]
+        # the rows these bids left, read on the writer's own cursor instead of one get_auction per bid
+        accepted = {auction_id for auction_id, _, outcome in results if outcome['status'] == 'accepted'}
+        if accepted:
+            c.execute(f"SELECT * FROM auctions WHERE auction_id IN ({','.join('?' * len(accepted))})",
+                      list(accepted))
+            rows = {row['auction_id']: auction_dict(row) for row in c.fetchall()}
+            for auction_id, _, outcome in results:
+                if outcome['status'] == 'accepted':
+                    outcome['auction'] = rows.get(auction_id)
+        return results
+
+    results = DB_WRITER.write(insert_bids)
+    for auction_id, amount, outcome in results:
+        if outcome['status'] == 'accepted':
+            update_auction_state(auction_id, outcome['final_amount'])
+    return results
+
+def apply_proxy_bid(auction_id, bidder_id, bidder_name, max_amount):
+    """Register (or with max_amount None, cancel) a proxy bid; runs on the auction's bid lane"""
+    if bidder_id not in ADMINS and not check_verification_status(bidder_id):
+        debug_log(f"Unverified user {bidder_id} attempted to place bid")
+        raise ValueError("User not verified")
+
+    if max_amount is None:
+        removed = DB_WRITER.execute("DELETE FROM proxy_bids WHERE auction_id=? AND user_id=?",
+                                    (auction_id, bidder_id))
+        return {'status': 'proxy_cancelled' if removed else 'no_proxy'}
+
+    plain_bidder_name, bidder_display = bidder_labels(bidder_id, bidder_name)
+    outcome = DB_WRITER.write(
+        lambda conn: register_proxy_bid(conn.cursor(), auction_id, bidder_id, plain_bidder_name,
+                                        bidder_display, max_amount)
+    )
+    if outcome['status'] == 'accepted':
+        update_auction_state(auction_id, outcome['final_amount'])
+        outcome['auction'] = get_auction(auction_id)
+    return outcome
+
+def apply_bid(auction_id, bidder_id, bidder_name, amount, expected_current=None, idempotency_key=None):
+    """Check a bid against the auction's current state and record it if it is high enough.
+
+    Runs on the auction's bid lane, so the minimum it checks against is the one
+    the bid is actually written over. Quick bids pass the price their button was
+    rendered for as expected_current and are refused as 'stale' once it moved;
+    the state_version read here is checked again in the write, since /bids
+    batches and admin edits reach the writer without going through the lane.
+    A bid already written under idempotency_key is reported as 'duplicate'
+    before the price checks, which it would now fail against itself.
+    """
+    auction = get_auction(auction_id)
+    if not auction:
+        return {'status': 'missing'}
 
-    except Exception as e:
-        debug_log(f"Error in record_bid: {str(e)}")
-        raise
+    if idempotency_key:
+        with db_connection() as conn:
+            existing = find_keyed_bid(conn.cursor(), idempotency_key)
+        if existing:
+            return {'status': 'duplicate', 'amount': existing['amount'], 'auction': auction}
+
+    current_amount = auction.get('current_bid') or auction.get('base_price', 0)
+    min_bid = get_next_valid_bid(auction)
 
-def send_bid_log(context, auction_id, bidder_id, bidder_name, amount, previous_bid):
+    if expected_current is not None and int(current_amount) != expected_current:
+        return {'status': 'stale', 'current_amount': current_amount, 'min_bid': min_bid, 'auction': auction}
+
+    debug_log(f"BID DEBUG: bid_amount_int={amount}, current_amount_int={int(current_amount)}, min_bid_int={int(min_bid)}")
+
+    if amount < int(min_bid):
+        debug_log(f"BID REJECTED: {amount} < {int(min_bid)}")
+        return {'status': 'too_low', 'current_amount': current_amount, 'min_bid': min_bid}
+
+    expected_version = (auction.get('state_version') or 0) if expected_current is not None else None
+    outcome = record_bid(auction_id, bidder_id, bidder_name, amount, idempotency_key, expected_version)
+    if outcome['status'] in ('accepted', 'stale'):
+        outcome['auction'] = get_auction(auction_id)
+    return outcome
+
+@with_api_priority(PRIORITY_LOG)
+async def send_bid_log(context, auction_id, bidder_id, bidder_name, amount, previous_bid):
     try:
         if not LOGS_CHANNEL_ID:
             return
 
-        auction = get_auction(auction_id)
+        auction = await run_db(get_auction, auction_id)
         if not auction:
             return
 
-        user = context.bot.get_chat(bidder_id)
+        user = await context.bot.get_chat(bidder_id)
         full_name = user.first_name
         if user.last_name:
             full_name += f" {user.last_name}"
@@ -789,7 +2002,7 @@ def send_bid_log(context, auction_id, bidder_id, bidder_name, amount, previous_b
             f"⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         )
         
-        context.bot.send_message(
+        await context.bot.send_message(
             chat_id=LOGS_CHANNEL_ID,
             text=log_message,
             parse_mode='HTML',
@@ -805,25 +2018,26 @@ def get_auction(auction_id):
             c = conn.cursor()
             c.execute('''SELECT * FROM auctions WHERE auction_id=? AND auction_status='active' ''', (auction_id,))
             result = c.fetchone()
+            return auction_dict(result) if result else None
+    except Exception as e:
+        debug_log(f"Error in get_auction: {str(e)}")
+        return None
 
-            if result:
-                auction_dict = dict(result)
+def auction_dict(row):
+    """An auctions row as the dict get_auction returns, with its defaults filled in"""
+    auction = dict(row)
 
-                defaults = {
-                    'seller_id': None,
-                    'seller_name': 'Unknown',
-                    'auction_status': 'active'
-                }
+    defaults = {
+        'seller_id': None,
+        'seller_name': 'Unknown',
+        'auction_status': 'active'
+    }
 
-                for key, default_value in defaults.items():
-                    if key not in auction_dict or auction_dict[key] is None:
-                        auction_dict[key] = default_value
+    for key, default_value in defaults.items():
+        if key not in auction or auction[key] is None:
+            auction[key] = default_value
 
-                return auction_dict
-            return None
-    except Exception as e:
-        debug_log(f"Error in get_auction: {str(e)}")
-        return None
+    return auction
 
 def get_auction_by_channel_id_any_status(channel_message_id):
     try:
@@ -853,18 +2067,23 @@ def get_auction_by_channel_id(channel_message_id):
 
 def save_submission(user_id, data):
     try:
-        with db_connection() as conn:
-            c = conn.cursor()
-            c.execute('''INSERT INTO submissions (user_id, data)
-                         VALUES (?, ?)''',
-                     (user_id, json.dumps(data)))
-            submission_id = c.lastrowid
-            conn.commit()
-            return submission_id
+        if 'parsed' not in data:
+            data['parsed'] = CAPTION_PARSER.parse(data)
+        item_name, category = get_item_summary(data)
+        return DB_WRITER.write(
+            lambda conn: conn.execute('''INSERT INTO submissions (user_id, data, item_name, category)
+                                         VALUES (?, ?, ?, ?)''',
+                                      (user_id, json.dumps(data), item_name, category)).lastrowid
+        )
     except Exception as e:
         debug_log(f"Error saving submission: {str(e)}")
         raise
 
+def get_submission_by_channel_message(channel_message_id):
+    with db_connection() as conn:
+        return conn.execute('''SELECT user_id, data FROM submissions
+                               WHERE channel_message_id = ?''', (channel_message_id,)).fetchone()
+
 def get_submission(submission_id):
     try:
         with db_connection() as conn:
@@ -885,14 +2104,126 @@ def get_submission(submission_id):
         debug_log(f"Error getting submission: {str(e)}")
         return None
 
+# Allowed submission status changes: an approval claims the row as 'processing'
+# before any auction is created, so only one admin can ever get that far
+SUBMISSION_TRANSITIONS = {
+    ('pending', 'processing'),
+    ('processing', 'approved'),
+    ('processing', 'failed'),
+    ('failed', 'pending'),
+    ('pending', 'rejected'),
+}
+
+def transition_submission_row(conn, submission_id, from_status, to_status, channel_message_id=None):
+    """Compare-and-set a submission's status on the writer's connection; True only if this call moved it"""
+    if (from_status, to_status) not in SUBMISSION_TRANSITIONS:
+        raise ValueError(f"Invalid submission transition {from_status} -> {to_status}")
+    return conn.execute(
+        '''UPDATE submissions SET status=?, channel_message_id=COALESCE(?, channel_message_id), status_changed_at=?
+           WHERE submission_id=? AND status=?''',
+        (to_status, channel_message_id, time.time(), submission_id, from_status)
+    ).rowcount == 1
+
+def transition_submission(submission_id, from_status, to_status, channel_message_id=None):
+    """Compare-and-set a submission's status; True only for the one caller that moved it.
+
+    The UPDATE matches on the expected status, so of several admins acting on
+    the same submission at once exactly one sees a rowcount of 1.
+    """
+    return DB_WRITER.write(
+        lambda conn: transition_submission_row(conn, submission_id, from_status, to_status, channel_message_id)
+    )
+
+def complete_approval(submission_id, auction_id, channel_message_id, ends_at):
+    """processing -> approved together with the auction's channel post, in one write.
+
+    Returns False when the claim was no longer ours (it expired and was taken
+    again); the auction created under it is deleted in that same write.
+    """
+    def approve(conn):
+        if not transition_submission_row(conn, submission_id, 'processing', 'approved', channel_message_id):
+            conn.execute("DELETE FROM auctions WHERE auction_id=?", (auction_id,))
+            return False
+        conn.execute("UPDATE auctions SET channel_message_id=?, ends_at=? WHERE auction_id=?",
+                     (channel_message_id, ends_at, auction_id))
+        return True
+    return DB_WRITER.write(approve)
+
+def record_submission_post(submission_id, channel_message_id):
+    """Remember the channel post of an approval in progress, so it can be deleted if the approval never completes"""
+    DB_WRITER.execute("UPDATE submissions SET channel_message_id=? WHERE submission_id=? AND status='processing'",
+                      (channel_message_id, submission_id))
+
+def discard_submission_auction(c, submission_id):
+    """Take down the auction an unfinished approval created, the way /removeitem does, and unlink it.
+
+    Returns (auction_id, channel_message_id) so the caller can delete the post, or None if there was none.
+    """
+    c.execute("SELECT auction_id, channel_message_id FROM submissions WHERE submission_id=?", (submission_id,))
+    row = c.fetchone()
+    if not row or not row['auction_id']:
+        return None
+    auction_id = row['auction_id']
+    c.execute('''UPDATE auctions SET is_active=0, auction_status='removed', state_version=state_version + 1
+                 WHERE auction_id=? AND auction_status='active' ''', (auction_id,))
+    set_auction_leader(c, auction_id, None, None)
+    c.execute("DELETE FROM proxy_bids WHERE auction_id=?", (auction_id,))
+    c.execute("UPDATE submissions SET auction_id=NULL, channel_message_id=NULL WHERE submission_id=?",
+              (submission_id,))
+    AUCTION_STATE.pop(auction_id, None)
+    forget_channel_post(auction_id)
+    return auction_id, row['channel_message_id']
+
+def fail_approval(submission_id):
+    """processing -> failed, taking down whatever the approval had created; returns its post as discard_submission_auction"""
+    def fail(conn):
+        if not transition_submission_row(conn, submission_id, 'processing', 'failed'):
+            return None
+        return discard_submission_auction(conn.cursor(), submission_id)
+    return DB_WRITER.write(fail)
+
+def release_stale_submission_claims(max_age_seconds):
+    """Put approvals left 'processing' longer than max_age_seconds (the bot died mid-approval) back to pending.
+
+    The auction each one had created is taken down in the same write; returns the
+    (auction_id, channel_message_id) of those, for delete_orphaned_posts.
+    """
+    def release(conn):
+        now = time.time()
+        stale = [row[0] for row in conn.execute(
+            '''SELECT submission_id FROM submissions
+               WHERE status='processing' AND (status_changed_at IS NULL OR status_changed_at < ?)''',
+            (now - max_age_seconds,))]
+        orphans = []
+        for submission_id in stale:
+            orphan = discard_submission_auction(conn.cursor(), submission_id)
+            if orphan:
+                orphans.append(orphan)
+            conn.execute("UPDATE submissions SET status='pending', status_changed_at=? WHERE submission_id=?",
+                         (now, submission_id))
+        return stale, orphans
+
+    stale, orphans = DB_WRITER.write(release)
+    if stale:
+        debug_log(f"Released {len(stale)} stale submission claim(s) back to pending, "
+                  f"taking down {len(orphans)} unfinished auction(s)")
+    return orphans
+
+async def delete_orphaned_posts(bot, orphans):
+    """Delete the channel posts of auctions taken down by fail_approval or release_stale_submission_claims"""
+    for auction_id, channel_message_id in orphans:
+        if not channel_message_id:
+            continue
+        try:
+            await bot.delete_message(chat_id=CHANNEL_ID, message_id=channel_message_id)
+        except Exception as e:
+            debug_log(f"Could not delete the post of unfinished auction {auction_id}: {str(e)}")
+
 def save_temp_data(user_id, data):
     try:
-        with db_connection() as conn:
-            c = conn.cursor()
-            c.execute('''INSERT OR REPLACE INTO temp_data (user_id, data)
-                         VALUES (?, ?)''',
-                     (user_id, json.dumps(data)))
-            conn.commit()
+        DB_WRITER.execute('''INSERT OR REPLACE INTO temp_data (user_id, data)
+                             VALUES (?, ?)''',
+                          (user_id, json.dumps(data)))
     except Exception as e:
         debug_log(f"Temp data save failed: {str(e)}")
         raise
@@ -910,9 +2241,7 @@ def load_temp_data(user_id):
 
 def cleanup_temp_data(user_id):
     try:
-        with db_connection() as conn:
-            conn.execute('''DELETE FROM temp_data WHERE user_id=?''', (user_id,))
-            conn.commit()
+        DB_WRITER.execute('''DELETE FROM temp_data WHERE user_id=?''', (user_id,))
     except Exception as e:
         debug_log(f"Cleanup failed: {str(e)}")
 
@@ -930,9 +2259,115 @@ def get_user_active_bids(user_id):
         debug_log(f"Error getting user bids: {str(e)}")
         return []
 
-def format_auction(auction):
-    try:
-        auction_id = str(auction.get('auction_id', '?'))
+class HexaCaptionParser:
+    """Single-pass parser for HexaMon captions with every pattern compiled once at import"""
+
+    LEVEL = re.compile(r'Lv\.\s*(\d+)')
+    NATURE = re.compile(r'Nature:\s*([A-Za-z]+)')
+    IV_LINE = re.compile(r'^\s*(HP|Attack|Defense|Sp\. Attack|Sp\. Defense|Speed|Total):\s*(\d+)', re.MULTILINE)
+    MOVE_LINE = re.compile(r'^([^\n\[\]:]+?)\s*\[', re.MULTILINE)
+    TM_CODE = re.compile(r'TM\d+')
+    TM_SELL_LINE = re.compile(r'you can sell this tm', re.IGNORECASE)
+    POKEMON_LINE = re.compile(r'Pokémon:\s*([^\n]+)', re.IGNORECASE)
+    ITEM_NAME_FALLBACKS = (
+        re.compile(r'💿\s*([^\n]+)', re.IGNORECASE),
+        re.compile(r'Technical Machine[^\n]*', re.IGNORECASE),
+        re.compile(r'TM:\s*([^\n]+)', re.IGNORECASE),
+    )
+
+    def parse(self, data):
+        """Parse submission data into a record with name, level, nature, IVs, moves and TM code"""
+        record = {
+            'category': data.get('category', ''),
+            'name': None,
+            'level': None,
+            'nature': None,
+            'ivs': {},
+            'moves': [],
+            'tm_code': None,
+            'tm_text': None,
+        }
+
+        if record['category'] == 'tms':
+            tm_text = (data.get('tm_details') or {}).get('text', 'TM details not available').replace('\\', '')
+            tm_match = self.TM_CODE.search(tm_text)
+            record['tm_code'] = tm_match.group(0) if tm_match else None
+            record['tm_text'] = self.clean_tm_text(tm_text)
+            record['name'] = record['tm_code'] or "TM"
+            return record
+
+        record['name'] = data.get('pokemon_name')
+
+        nature_text = (data.get('nature') or {}).get('text', '')
+        level_match = self.LEVEL.search(nature_text)
+        nature_match = self.NATURE.search(nature_text)
+        if level_match:
+            record['level'] = level_match.group(1)
+        if nature_match:
+            record['nature'] = nature_match.group(1)
+
+        ivs_text = (data.get('ivs') or {}).get('text', '')
+        record['ivs'] = {stat: int(value) for stat, value in self.IV_LINE.findall(ivs_text)}
+
+        moveset_text = (data.get('moveset') or {}).get('text', '')
+        record['moves'] = [move.strip() for move in self.MOVE_LINE.findall(moveset_text)]
+
+        return record
+
+    def clean_tm_text(self, tm_text):
+        cleaned_lines = []
+        for line in tm_text.split('\n'):
+            if self.TM_SELL_LINE.search(line):
+                continue
+            if not cleaned_lines and not line.strip():
+                continue
+            cleaned_lines.append(line)
+        return '\n'.join(cleaned_lines).strip()
+
+    @functools.lru_cache(maxsize=1024)
+    def item_name(self, item_text):
+        """Display name for a rendered auction caption, memoized per caption text"""
+        if not item_text:
+            return "Unknown Item"
+
+        tm_match = self.TM_CODE.search(item_text)
+        if tm_match:
+            return tm_match.group(0)
+
+        pokemon_match = self.POKEMON_LINE.search(item_text)
+        if pokemon_match:
+            return pokemon_match.group(1).strip()
+
+        for pattern in self.ITEM_NAME_FALLBACKS:
+            match = pattern.search(item_text)
+            if match:
+                if match.groups():
+                    return match.group(1).strip()
+                return match.group(0).strip()
+
+        for line in item_text.split('\n'):
+            if line.strip():
+                return line[:30] + "..." if len(line) > 30 else line
+
+        return "Auction Item"
+
+CAPTION_PARSER = HexaCaptionParser()
+
+def get_caption_record(data):
+    """Parsed caption record stored with the submission, parsing on the fly for older submissions"""
+    record = data.get('parsed')
+    if record is None:
+        record = CAPTION_PARSER.parse(data)
+    return record
+
+def get_item_summary(data):
+    """(item_name, category) stored alongside submissions and auctions for list views"""
+    name = get_caption_record(data).get('name') or 'Unknown Pokémon'
+    return name, data.get('category') or 'unknown'
+
+def format_auction(auction):
+    try:
+        auction_id = str(auction.get('auction_id', '?'))
 
         item_text = auction.get('item_text', 'No description available')
         item_text = item_text.replace('\\', '')
@@ -958,6 +2393,173 @@ def format_auction(auction):
         current_bid_str = format_bid_amount(current_bid) if current_bid is not None else 'None'
         return f"Item #{auction.get('auction_id', '?')}\n\n{item_text}\n\nCurrent Bid: {current_bid_str}"
 
+# Rendered captions per auction: auction_id -> (state_version, html_caption, plain_caption)
+RENDERED_CAPTIONS = {}
+# state_version of the caption currently shown on each auction's channel post
+CHANNEL_VERSIONS = {}
+
+def forget_channel_post(auction_id):
+    """Drop the cached caption and shown version of an auction that has left the market"""
+    RENDERED_CAPTIONS.pop(auction_id, None)
+    CHANNEL_VERSIONS.pop(auction_id, None)
+
+class RefreshThrottle:
+    """Cooldown bookkeeping and outcome counts for the Refresh button (per user and per channel post)"""
+
+    PRUNE_AT = 10000
+
+    def __init__(self):
+        self.user_clicks = {}
+        self.message_refreshes = {}
+        self.counts = {'edited': 0, 'unchanged': 0, 'cooldown': 0, 'shed': 0}
+
+    def _prune(self, stamps, cooldown, now):
+        if len(stamps) > self.PRUNE_AT:
+            for key in [key for key, stamp in stamps.items() if now - stamp >= cooldown]:
+                del stamps[key]
+
+    def cooling_down(self, user_id, message_key, now):
+        """True if this click comes too soon after the user's last refresh or the post's last one.
+
+        A click that gets through claims both slots right away, so concurrent
+        clicks on the same post don't all go on to edit it.
+        """
+        last_click = self.user_clicks.get(user_id)
+        last_refresh = self.message_refreshes.get(message_key)
+        if last_click is not None and now - last_click < REFRESH_USER_COOLDOWN_SECONDS:
+            return True
+        if last_refresh is not None and now - last_refresh < REFRESH_MESSAGE_COOLDOWN_SECONDS:
+            return True
+        self._prune(self.user_clicks, REFRESH_USER_COOLDOWN_SECONDS, now)
+        self._prune(self.message_refreshes, REFRESH_MESSAGE_COOLDOWN_SECONDS, now)
+        self.user_clicks[user_id] = now
+        self.message_refreshes[message_key] = now
+        return False
+
+    def count(self, outcome):
+        self.counts[outcome] += 1
+
+REFRESH_THROTTLE = RefreshThrottle()
+
+def dispatch_backlog(application):
+    """Updates waiting for a worker plus Bot API calls waiting in the gateway"""
+    processor = application.update_processor
+    waiting = len(processor.waiters) if isinstance(processor, PriorityUpdateProcessor) else 0
+    return waiting + len(API_GATEWAY.waiters)
+
+UPDATE_CLASS_NAMES = {'bid': UPDATE_BID, 'admin': UPDATE_ADMIN, 'default': UPDATE_DEFAULT, 'browse': UPDATE_BROWSE}
+
+def parse_user_rate_limits(text):
+    """Parse "bid=2:6, browse=0.5:5" into {update_class: (rate, burst)}; raises ValueError"""
+    limits = {}
+    for entry in re.split(r'[,\s]+', text.strip()):
+        if not entry:
+            continue
+        name, sep, spec = entry.partition('=')
+        rate_text, colon, burst_text = spec.partition(':')
+        if not sep or not colon or name not in UPDATE_CLASS_NAMES:
+            raise ValueError(f"Invalid limit '{entry}', expected class=rate:burst")
+        rate, burst = float(rate_text), float(burst_text)
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Invalid limit '{entry}', rate must be > 0 and burst >= 1")
+        limits[UPDATE_CLASS_NAMES[name]] = (rate, burst)
+    return limits
+
+class UserRateLimiter:
+    """Token bucket per (user, update class), checked by admit_update before an update queues for a worker.
+
+    The first call over the limit gets a warning; further ones are dropped
+    silently until the user's bucket has a token again.
+    """
+
+    PRUNE_AT = 50000
+
+    def __init__(self, limits):
+        self.limits = limits
+        self.buckets = {}
+        self.warned = set()
+        self.counts = {'allowed': 0, 'warned': 0, 'dropped': 0}
+
+    def _prune(self, now):
+        idle = [key for key, bucket in self.buckets.items()
+                if not bucket.wait_time(now) and bucket.tokens >= bucket.capacity]
+        for key in idle:
+            del self.buckets[key]
+            self.warned.discard(key)
+
+    def check(self, user_id, update_class, now):
+        """Return 'allowed', 'warned' or 'dropped' for one call"""
+        limit = self.limits.get(update_class)
+        if not limit:
+            return 'allowed'
+
+        key = (user_id, update_class)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.PRUNE_AT:
+                self._prune(now)
+            bucket = self.buckets[key] = TokenBucket(*limit)
+
+        if not bucket.wait_time(now):
+            bucket.take()
+            self.warned.discard(key)
+            verdict = 'allowed'
+        elif key in self.warned:
+            verdict = 'dropped'
+        else:
+            self.warned.add(key)
+            verdict = 'warned'
+        self.counts[verdict] += 1
+        return verdict
+
+try:
+    USER_RATE_LIMITER = UserRateLimiter(parse_user_rate_limits(USER_RATE_LIMITS))
+except ValueError as e:
+    debug_log(f"Ignoring USER_RATE_LIMITS: {str(e)}")
+    USER_RATE_LIMITER = UserRateLimiter(parse_user_rate_limits(DEFAULT_USER_RATE_LIMITS))
+
+async def admit_update(update, update_class):
+    """Apply the per-user rate limit; False drops the update before it ever takes a worker slot"""
+    user = update.effective_user
+    if not user or user.id in ADMINS:
+        return True
+
+    verdict = USER_RATE_LIMITER.check(user.id, update_class, time.monotonic())
+    if verdict == 'allowed':
+        return True
+
+    if verdict == 'warned':
+        debug_log(f"Rate limiting user {user.id}")
+        try:
+            with api_priority(PRIORITY_NOTIFY):
+                if update.callback_query:
+                    await update.callback_query.answer("⏳ You're going too fast, please slow down.")
+                elif update.effective_message and update.effective_chat.type == 'private':
+                    await update.effective_message.reply_text("⏳ You're going too fast, please wait a few seconds.")
+        except Exception as e:
+            debug_log(f"Couldn't send rate limit warning: {str(e)}")
+    return False
+
+def cached_bid_toast(auction_id, prefix):
+    """Callback toast with the current bid as last seen by the bid path, without touching the database"""
+    state = AUCTION_STATE.get(auction_id)
+    if not state:
+        return prefix
+    return f"{prefix}\n💰 Current bid: {format_bid_amount(state['current_amount'])}"
+
+def render_auction(auction):
+    """HTML caption and plain-text fallback for an auction, memoized on (auction_id, state_version)"""
+    auction_id = auction.get('auction_id')
+    version = auction.get('state_version') or 0
+    cached = RENDERED_CAPTIONS.get(auction_id)
+    if cached and cached[0] == version:
+        return cached[1], cached[2]
+
+    caption = format_auction(auction)
+    plain_caption = caption.replace('<br>', '\n').replace('<a href="', '').replace('">', ' ').replace('</a>', '')
+    RENDERED_CAPTIONS[auction_id] = (version, caption, plain_caption)
+    return caption, plain_caption
+
 def format_pokemon_auction_item(data, auction_id=None):
     seller_id = data.get('seller_id', '')
     seller_username = data.get('seller_username', 'Unknown')
@@ -981,17 +2583,9 @@ def format_pokemon_auction_item(data, auction_id=None):
     pokemon_name = data['pokemon_name']
     base_price = f"{data.get('base_price', 0):,}"
 
-    nature_text = data['nature'].get('text', '')
-    level = "Unknown"
-    nature = "Unknown"
-
-    level_match = re.search(r'Lv\.\s*(\d+)', nature_text)
-    nature_match = re.search(r'Nature:\s*([A-Za-z]+)', nature_text)
-
-    if level_match:
-        level = level_match.group(1)
-    if nature_match:
-        nature = nature_match.group(1)
+    record = get_caption_record(data)
+    level = record.get('level') or "Unknown"
+    nature = record.get('nature') or "Unknown"
 
     ivs_text = data['ivs'].get('text', '')
 
@@ -1038,20 +2632,7 @@ def format_tm_auction_item(data, auction_id=None):
     if seller_first_name:
         seller_first_name = seller_first_name.replace('\\', '')
 
-    tm_details_text = data.get('tm_details', {}).get('text', 'TM details not available')
-    tm_details_text = tm_details_text.replace('\\', '')  
-
-    lines = tm_details_text.split('\n')
-    cleaned_lines = []
-
-    for line in lines:
-        if re.search(r'you can sell this tm', line, re.IGNORECASE):
-            continue
-        if not cleaned_lines and not line.strip():
-            continue
-        cleaned_lines.append(line)
-
-    cleaned_text = '\n'.join(cleaned_lines).strip()
+    cleaned_text = get_caption_record(data).get('tm_text') or ''
 
     base_price = f"{data.get('base_price', 0):,}"
 
@@ -1079,33 +2660,25 @@ def format_tm_auction_item(data, auction_id=None):
 
 def increment_win(user_id, username):
     try:
-        conn = leaderboard_connection()
-        c = conn.cursor()
-        c.execute('''INSERT INTO leaderboard (user_id, username, total_wins)
-                     VALUES (?, ?, 1)
-                     ON CONFLICT(user_id) DO UPDATE SET
-                     total_wins = total_wins + 1,
-                     username = excluded.username,
-                     updated_at = CURRENT_TIMESTAMP''',
-                  (user_id, username or "Unknown"))
-        conn.commit()
-        conn.close()
+        DB_WRITER.execute('''INSERT INTO leaderboard (user_id, username, total_wins)
+                             VALUES (?, ?, 1)
+                             ON CONFLICT(user_id) DO UPDATE SET
+                             total_wins = total_wins + 1,
+                             username = excluded.username,
+                             updated_at = CURRENT_TIMESTAMP''',
+                          (user_id, username or "Unknown"), db_name="leaderboard.db")
     except Exception as e:
         debug_log(f"Error incrementing win: {str(e)}")
 
 def increment_sale(user_id, username):
     try:
-        conn = leaderboard_connection()
-        c = conn.cursor()
-        c.execute('''INSERT INTO leaderboard (user_id, username, total_sales)
-                     VALUES (?, ?, 1)
-                     ON CONFLICT(user_id) DO UPDATE SET
-                     total_sales = total_sales + 1,
-                     username = excluded.username,
-                     updated_at = CURRENT_TIMESTAMP''',
-                  (user_id, username or "Unknown"))
-        conn.commit()
-        conn.close()
+        DB_WRITER.execute('''INSERT INTO leaderboard (user_id, username, total_sales)
+                             VALUES (?, ?, 1)
+                             ON CONFLICT(user_id) DO UPDATE SET
+                             total_sales = total_sales + 1,
+                             username = excluded.username,
+                             updated_at = CURRENT_TIMESTAMP''',
+                          (user_id, username or "Unknown"), db_name="leaderboard.db")
     except Exception as e:
         debug_log(f"Error incrementing sale: {str(e)}")
 
@@ -1136,16 +2709,16 @@ def get_top_sellers(limit=5):
 
 def require_verification(func):
     """Decorator to require verification for all commands"""
-    def wrapper(update: Update, context: CallbackContext):
+    async def wrapper(update: Update, context: CallbackContext):
         user_id = update.effective_user.id
         
         # Allow admins to use commands without verification
         if user_id in ADMINS:
-            return func(update, context)
+            return await func(update, context)
             
         # Check if user is verified
-        if check_verification_status(user_id):
-            return func(update, context)
+        if await run_db(check_verification_status, user_id):
+            return await func(update, context)
         
         # User is not verified - show verification request
         keyboard = [
@@ -1162,8 +2735,8 @@ def require_verification(func):
         # Check if this is a callback query (button press) or regular message
         if update.callback_query:
             try:
-                update.callback_query.answer()
-                update.callback_query.edit_message_text(
+                await update.callback_query.answer()
+                await update.callback_query.edit_message_text(
                     "\n".join(response),
                     parse_mode='HTML',
                     reply_markup=InlineKeyboardMarkup(keyboard)
@@ -1171,7 +2744,7 @@ def require_verification(func):
             except Exception as e:
                 debug_log(f"Error editing callback message: {str(e)}")
         else:
-            update.message.reply_text(
+            await update.message.reply_text(
                 "\n".join(response),
                 parse_mode='HTML',
                 reply_markup=InlineKeyboardMarkup(keyboard)
@@ -1182,20 +2755,20 @@ def require_verification(func):
     return wrapper
 
 
-def start(update: Update, context: CallbackContext):
+async def start(update: Update, context: CallbackContext):
     if update.message.chat.type != "private":
-        update.message.reply_text("❌ Please use this bot in private messages (DM) only!")
+        await update.message.reply_text("❌ Please use this bot in private messages (DM) only!")
         return
 
     if context.args and context.args[0].startswith('bid_'):
         try:
             user_id = update.effective_user.id
-            if user_id not in ADMINS and not check_verification_status(user_id):
+            if user_id not in ADMINS and not await run_db(check_verification_status, user_id):
                 # Show verification request button instead of just text
                 keyboard = [
                     [InlineKeyboardButton("🔐 Request Verification", callback_data="request_verification")]
                 ]
-                update.message.reply_text(
+                await update.message.reply_text(
                     "🔒 Verification Required\n\n"
                     "You need to be verified to place bids.\n"
                     "Click the button below to request verification:",
@@ -1204,28 +2777,32 @@ def start(update: Update, context: CallbackContext):
                 return
 
             auction_id = int(context.args[0].split('_')[1])
-            auction = get_auction(auction_id)
+            auction = await run_db(get_auction, auction_id)
 
             if not auction:
-                update.message.reply_text("❌ Auction not found!")
+                await update.message.reply_text("❌ Auction not found!")
                 return
 
             current_amount = auction.get('current_bid') or auction.get('base_price', 0)
-            min_bid = current_amount + get_min_increment(current_amount)
+            min_bid = get_next_valid_bid(auction)
 
             context.user_data['bid_context'] = {
                 'auction_id': auction_id,
                 'channel_msg_id': auction['channel_message_id'],
                 'min_bid': min_bid,
                 'current_bidder': auction.get('current_bidder'),
-                'item_text': auction['item_text']
+                'item_text': auction['item_text'],
+                'created_at': time.time()
             }
 
-            update.message.reply_text(
+            ends_line = f"Ends: {format_end_time(auction['ends_at'])}\n" if auction.get('ends_at') else ""
+            await update.message.reply_text(
                 f"Item #{auction_id}\n\n"
                 f"Current Bid: {current_amount:,}\n"
-                f"Minimum Bid: {min_bid:,}\n\n"
-                "Please enter your bid amount:"
+                f"Minimum Bid: {min_bid:,}\n"
+                f"{ends_line}\n"
+                "Please enter your bid amount or tap a quick bid:",
+                reply_markup=quick_bid_keyboard(auction)
             )
             return
         except Exception as e:
@@ -1233,7 +2810,7 @@ def start(update: Update, context: CallbackContext):
 
     # Check if user is verified or admin
     user_id = update.effective_user.id
-    if user_id not in ADMINS and not check_verification_status(user_id):
+    if user_id not in ADMINS and not await run_db(check_verification_status, user_id):
         # Show welcome message with verification button
         keyboard = [
             [InlineKeyboardButton("🔐 Request Verification", callback_data="request_verification")]
@@ -1250,7 +2827,7 @@ def start(update: Update, context: CallbackContext):
         try:
             gif_url = "https://i.ibb.co/vxZLvHLJ/New-Project-19.gif"
             
-            update.message.reply_animation(
+            await update.message.reply_animation(
                 animation=gif_url,
                 caption="\n".join(response),
                 parse_mode='HTML',
@@ -1258,7 +2835,7 @@ def start(update: Update, context: CallbackContext):
             )
         except Exception as e:
             debug_log(f"Error sending GIF: {str(e)}")
-            update.message.reply_text(
+            await update.message.reply_text(
                 "\n".join(response),
                 parse_mode='HTML',
                 reply_markup=InlineKeyboardMarkup(keyboard)
@@ -1266,8 +2843,7 @@ def start(update: Update, context: CallbackContext):
         return
 
     # User is verified or admin - show normal start message
-    with db_connection() as conn:
-        status = conn.execute("SELECT submissions_open, auctions_open FROM system_status WHERE id=1").fetchone()
+    status = await run_db(get_system_status)
 
     submissions_open = "🔓 OPEN" if status[0] else "🔒 CLOSED"
     auctions_open = "🔓 OPEN" if status[1] else "🔒 CLOSED"
@@ -1300,7 +2876,7 @@ def start(update: Update, context: CallbackContext):
     try:
         gif_url = "https://i.pinimg.com/originals/88/68/bd/8868bd004a632438c53a1197061c37c9.gif"
 
-        update.message.reply_animation(
+        await update.message.reply_animation(
             animation=gif_url,
             caption="\n".join(response),
             parse_mode='HTML',
@@ -1308,57 +2884,34 @@ def start(update: Update, context: CallbackContext):
         )
     except Exception as e:
         debug_log(f"Error sending GIF: {str(e)}")
-        update.message.reply_text(
+        await update.message.reply_text(
             "\n".join(response),
             parse_mode='HTML',
             reply_markup=reply_markup
         )
 
-def handle_verification_request_button(update: Update, context: CallbackContext):
+async def handle_verification_request_button(update: Update, context: CallbackContext):
     """Handle when user clicks the verification request button"""
     query = update.callback_query
-    query.answer()
+    await query.answer()
     
     user = query.from_user
-    
-    # Check if already verified
-    if check_verification_status(user.id):
-        # Use edit_message_caption if it's a media message, otherwise edit_message_text
-        try:
-            if hasattr(query.message, 'caption') and query.message.caption:
-                query.edit_message_caption(caption="✅ You are already verified!")
-            else:
-                query.edit_message_text("✅ You are already verified!")
-        except Exception as e:
-            debug_log(f"Error editing verification message: {str(e)}")
-        return
-    
-    # Check if already has pending request
-    try:
-        with db_connection('verified_users.db') as conn:
-            c = conn.cursor()
-            c.execute('SELECT 1 FROM verification_requests WHERE user_id=?', (user.id,))
-            if c.fetchone():
-                try:
-                    if hasattr(query.message, 'caption') and query.message.caption:
-                        query.edit_message_caption(caption="⏳ Your verification request is already pending. Please wait for admin approval.")
-                    else:
-                        query.edit_message_text("⏳ Your verification request is already pending. Please wait for admin approval.")
-                except Exception as e:
-                    debug_log(f"Error editing pending message: {str(e)}")
-                return
-    except Exception as e:
-        debug_log(f"Error checking verification request: {str(e)}")
-    
-    # Process verification request
+
+    # Process verification request, unless the user is already verified or waiting
     try:
-        with db_connection('verified_users.db') as conn:
-            c = conn.cursor()
-            c.execute('''INSERT INTO verification_requests
-                        (user_id, username)
-                        VALUES (?, ?)''',
-                    (user.id, user.username or user.first_name))
-            conn.commit()
+        outcome = await run_db(add_verification_request, user.id, user.username or user.first_name)
+        if outcome != 'requested':
+            status_message = ("✅ You are already verified!" if outcome == 'verified' else
+                              "⏳ Your verification request is already pending. Please wait for admin approval.")
+            # Use edit_message_caption if it's a media message, otherwise edit_message_text
+            try:
+                if hasattr(query.message, 'caption') and query.message.caption:
+                    await query.edit_message_caption(caption=status_message)
+                else:
+                    await query.edit_message_text(status_message)
+            except Exception as e:
+                debug_log(f"Error editing verification message: {str(e)}")
+            return
 
         # Store verification request data for all admins
         request_data = {
@@ -1369,27 +2922,28 @@ def handle_verification_request_button(update: Update, context: CallbackContext)
 
         # Send verification request to all admins with buttons
         admin_messages = {}
-        for admin_id in ADMINS:
-            try:
-                message = send_message_with_retry(
-                    context.bot,
-                    chat_id=admin_id,
-                    text=f"🆕 Verification Request\n\n"
-                         f"👤 User: @{user.username or user.first_name}\n"
-                         f"🆔 User ID: <code>{user.id}</code>\n"
-                         f"📅 Requested: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                         f"Choose an action:",
-                    parse_mode='HTML',
-                    reply_markup=InlineKeyboardMarkup([
-                        [
-                            InlineKeyboardButton("✅ Verify", callback_data=f"admin_verify_{user.id}"),
-                            InlineKeyboardButton("❌ Reject", callback_data=f"admin_reject_{user.id}")
-                        ]
-                    ])
-                )
-                admin_messages[admin_id] = message.message_id
-            except Exception as e:
-                debug_log(f"Failed to notify admin {admin_id}: {str(e)}")
+        with api_priority(PRIORITY_NOTIFY):
+            for admin_id in ADMINS:
+                try:
+                    message = await send_message_with_retry(
+                        context.bot,
+                        chat_id=admin_id,
+                        text=f"🆕 Verification Request\n\n"
+                             f"👤 User: @{user.username or user.first_name}\n"
+                             f"🆔 User ID: <code>{user.id}</code>\n"
+                             f"📅 Requested: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+                             f"Choose an action:",
+                        parse_mode='HTML',
+                        reply_markup=InlineKeyboardMarkup([
+                            [
+                                InlineKeyboardButton("✅ Verify", callback_data=f"admin_verify_{user.id}"),
+                                InlineKeyboardButton("❌ Reject", callback_data=f"admin_reject_{user.id}")
+                            ]
+                        ])
+                    )
+                    admin_messages[admin_id] = message.message_id
+                except Exception as e:
+                    debug_log(f"Failed to notify admin {admin_id}: {str(e)}")
 
         # Store admin messages for later updates
         context.bot_data[f'verification_request_{user.id}'] = {
@@ -1407,15 +2961,15 @@ def handle_verification_request_button(update: Update, context: CallbackContext)
         try:
             if hasattr(query.message, 'caption') and query.message.caption:
                 # It's a media message with caption
-                query.edit_message_caption(caption=success_message)
+                await query.edit_message_caption(caption=success_message)
             else:
                 # It's a text message
-                query.edit_message_text(success_message)
+                await query.edit_message_text(success_message)
         except Exception as e:
             debug_log(f"Error updating verification request message: {str(e)}")
             # Try alternative approach - send a new message
             try:
-                context.bot.send_message(
+                await context.bot.send_message(
                     chat_id=user.id,
                     text=success_message
                 )
@@ -1428,52 +2982,53 @@ def handle_verification_request_button(update: Update, context: CallbackContext)
         error_message = "❌ Failed to send verification request. Please try again."
         try:
             if hasattr(query.message, 'caption') and query.message.caption:
-                query.edit_message_caption(caption=error_message)
+                await query.edit_message_caption(caption=error_message)
             else:
-                query.edit_message_text(error_message)
+                await query.edit_message_text(error_message)
         except Exception as edit_error:
             debug_log(f"Error editing error message: {str(edit_error)}")
 
 @admin_only
-def end_submission(update: Update, context: CallbackContext):
-    with db_connection() as conn:
-        conn.execute("UPDATE system_status SET submissions_open=0 WHERE id=1")
-        conn.commit()
-    update.message.reply_text("✅ Item submissions are now CLOSED")
+async def end_submission(update: Update, context: CallbackContext):
+    await run_db(set_system_status, 'submissions_open', False)
+    await update.message.reply_text("✅ Item submissions are now CLOSED")
 
 @admin_only
-def start_submission(update: Update, context: CallbackContext):
-    with db_connection() as conn:
-        conn.execute("UPDATE system_status SET submissions_open=1 WHERE id=1")
-        conn.commit()
-    update.message.reply_text("✅ Item submissions are now OPEN")
+async def start_submission(update: Update, context: CallbackContext):
+    await run_db(set_system_status, 'submissions_open', True)
+    await update.message.reply_text("✅ Item submissions are now OPEN")
 
 @admin_only
-def start_auction(update: Update, context: CallbackContext):
-    with db_connection() as conn:
-        conn.execute("UPDATE system_status SET auctions_open=1 WHERE id=1")
-        conn.commit()
-    update.message.reply_text("✅ Auctions are now OPEN")
+async def start_auction(update: Update, context: CallbackContext):
+    await run_db(set_system_status, 'auctions_open', True)
+    await update.message.reply_text("✅ Auctions are now OPEN")
+
+def format_win_message(item_text, channel_msg_id, amount, channel_username):
+    item_name = extract_item_name(item_text)
+
+    if channel_username and channel_msg_id:
+        message_link = f"https://t.me/{channel_username}/{channel_msg_id}"
+        item_display = f'<a href="{message_link}">{html.escape(item_name)}</a>'
+    else:
+        item_display = html.escape(item_name)
+
+    return (
+        f"<b>You have won the bid!</b>\n\n"
+        f"💫Item: {item_display}\n"
+        f"🤑Your Bid: {format_bid_amount(amount)} pd"
+    )
 
-def send_win_notifications(context):
+@with_api_priority(PRIORITY_NOTIFY)
+async def send_win_notifications(context, closed):
+    """Win DMs for the auctions /endauction just closed (close_auction_row outcomes)"""
     try:
-        with db_connection() as conn:
-            c = conn.cursor()
-            c.execute('''SELECT a.auction_id, a.item_text, a.channel_message_id, 
-                                b.bidder_id, b.bidder_name, b.amount
-                         FROM auctions a
-                         JOIN bids b ON a.auction_id = b.auction_id
-                         WHERE a.auction_status = 'active'
-                         AND b.amount = (
-                             SELECT MAX(amount) 
-                             FROM bids 
-                             WHERE auction_id = a.auction_id AND is_active = 1
-                         )
-                         AND b.is_active = 1''')
-            winning_bids = c.fetchall()
+        winning_bids = [(outcome['auction']['auction_id'], outcome['auction']['item_text'],
+                         outcome['auction']['channel_message_id'], outcome['winner']['bidder_id'],
+                         outcome['winner']['bidder_name'], outcome['winner']['amount'])
+                        for outcome in closed if outcome['winner'] and outcome['winner']['bidder_id']]
 
         try:
-            channel_entity = context.bot.get_chat(CHANNEL_ID)
+            channel_entity = await context.bot.get_chat(CHANNEL_ID)
             channel_username = channel_entity.username
             if not channel_username:
                 channel_username = f"c/{str(CHANNEL_ID).replace('-100', '')}"
@@ -1485,25 +3040,10 @@ def send_win_notifications(context):
 
         for bid in winning_bids:
             auction_id, item_text, channel_msg_id, bidder_id, bidder_name, amount = bid
-            
-            item_name = extract_item_name(item_text)
-            
-            if channel_username and channel_msg_id:
-                message_link = f"https://t.me/{channel_username}/{channel_msg_id}"
-                item_display = f'<a href="{message_link}">{html.escape(item_name)}</a>'
-            else:
-                item_display = html.escape(item_name)
-
-            formatted_bid = format_bid_amount(amount)
-
-            message = (
-                f"<b>You have won the bid!</b>\n\n"
-                f"💫Item: {item_display}\n"
-                f"🤑Your Bid: {formatted_bid} pd"
-            )
+            message = format_win_message(item_text, channel_msg_id, amount, channel_username)
 
             try:
-                context.bot.send_message(
+                await context.bot.send_message(
                     chat_id=bidder_id,
                     text=message,
                     parse_mode='HTML',
@@ -1511,10 +3051,8 @@ def send_win_notifications(context):
                 )
                 notifications_sent += 1
                 debug_log(f"Sent win notification to user {bidder_id} for auction {auction_id}")
-                
-                time.sleep(0.2)
-                
-            except telegram.error.Unauthorized:
+
+            except telegram.error.Forbidden:
                 debug_log(f"User {bidder_id} blocked the bot - cannot send win notification")
                 notifications_failed += 1
             except Exception as e:
@@ -1528,31 +3066,193 @@ def send_win_notifications(context):
         debug_log(f"Error in send_win_notifications: {str(e)}")
         return 0, 0
 
+def parse_duration(text):
+    """'90m' / '2h' / '1d' / '45' (minutes) to seconds, or None"""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([mhd]?)", str(text).strip().lower())
+    if not match:
+        return None
+    value, unit = float(match.group(1)), match.group(2) or 'm'
+    return value * {'m': 60, 'h': 3600, 'd': 86400}[unit]
+
+def format_end_time(ends_at):
+    return datetime.fromtimestamp(ends_at).strftime('%Y-%m-%d %H:%M')
+
+def next_close_slot(ends_at, auction_id=None):
+    """Push a closing time back until it is AUCTION_CLOSE_STAGGER_SECONDS clear of every other close.
+
+    auction_id, when re-timing an existing item, keeps its own current close out of the way.
+    """
+    if AUCTION_CLOSE_STAGGER_SECONDS <= 0:
+        return ends_at
+    with db_connection() as conn:
+        taken = [row[0] for row in conn.execute(
+            '''SELECT ends_at FROM auctions
+               WHERE auction_status = 'active' AND ends_at > ? AND auction_id IS NOT ?
+               ORDER BY ends_at''', (ends_at - AUCTION_CLOSE_STAGGER_SECONDS, auction_id))]
+    for other in taken:
+        if abs(other - ends_at) < AUCTION_CLOSE_STAGGER_SECONDS:
+            ends_at = other + AUCTION_CLOSE_STAGGER_SECONDS
+    return ends_at
+
+def set_auction_end(auction_id, ends_at):
+    return DB_WRITER.execute("UPDATE auctions SET ends_at=? WHERE auction_id=? AND auction_status='active'",
+                             (ends_at, auction_id))
+
+def schedule_auction_close(job_queue, auction_id, ends_at):
+    """(Re)arm the one-shot JobQueue timer that closes an auction at ends_at; None just cancels it"""
+    name = f"close_auction_{auction_id}"
+    for job in job_queue.get_jobs_by_name(name):
+        job.schedule_removal()
+    if ends_at is not None:
+        job_queue.run_once(close_auction_job, when=max(ends_at - time.time(), 0), data=auction_id, name=name)
+
+def close_auction_row(auction_id, force=False):
+    """Mark one auction ended once its time is up; runs on the auction's bid lane so no bid lands after it.
+
+    force closes it regardless of ends_at (/endauction) and clears ends_at in the same write, so a
+    close timer that fires later finds nothing to settle.
+    """
+    def mark_ended(conn):
+        c = conn.cursor()
+        c.execute("SELECT * FROM auctions WHERE auction_id=?", (auction_id,))
+        auction = c.fetchone()
+        if not auction or auction['auction_status'] != 'active' or not (force or auction['ends_at']):
+            return {'status': 'gone'}
+        if not force and auction['ends_at'] > time.time():
+            return {'status': 'pending', 'ends_at': auction['ends_at']}
+
+        c.execute('''UPDATE auctions SET auction_status='ended', ends_at=?, state_version=state_version + 1
+                     WHERE auction_id=?''', (None if force else auction['ends_at'], auction_id))
+        c.execute('''SELECT bidder_id, bidder_name, amount FROM bids
+                     WHERE auction_id=? AND is_active=1
+                     ORDER BY amount DESC LIMIT 1''', (auction_id,))
+        winner = c.fetchone()
+        set_auction_leader(c, auction_id, None, None)
+        c.execute("DELETE FROM proxy_bids WHERE auction_id=?", (auction_id,))
+        return {'status': 'ended', 'auction': dict(auction), 'winner': dict(winner) if winner else None}
+
+    outcome = DB_WRITER.write(mark_ended)
+    if outcome['status'] == 'ended':
+        AUCTION_STATE.pop(auction_id, None)
+        forget_channel_post(auction_id)
+    return outcome
+
+@with_api_priority(PRIORITY_NOTIFY)
+async def settle_closed_auction(context, auction, winner):
+    """Win DM, leaderboard and channel buttons for a single auction that just closed"""
+    await remove_bid_buttons(context, auction)
+    if not winner or not winner['bidder_id']:
+        return
+
+    channel_username = CHANNEL_USERNAME.lstrip('@') if CHANNEL_USERNAME else f"c/{str(CHANNEL_ID).replace('-100', '')}"
+    try:
+        await context.bot.send_message(
+            chat_id=winner['bidder_id'],
+            text=format_win_message(auction['item_text'], auction['channel_message_id'], winner['amount'], channel_username),
+            parse_mode='HTML'
+        )
+    except telegram.error.Forbidden:
+        debug_log(f"User {winner['bidder_id']} blocked the bot - cannot send win notification")
+    except Exception as e:
+        debug_log(f"Failed to send win notification to user {winner['bidder_id']}: {str(e)}")
+
+    try:
+        await run_db(increment_win, winner['bidder_id'], winner['bidder_name'] or f"User_{winner['bidder_id']}")
+        if auction['seller_id']:
+            await run_db(increment_sale, auction['seller_id'], auction['seller_name'] or f"User_{auction['seller_id']}")
+    except Exception as e:
+        debug_log(f"Failed to update leaderboard for auction {auction['auction_id']}: {str(e)}")
+
+async def close_auction_job(context: CallbackContext):
+    auction_id = context.job.data
+    try:
+        if not await run_db(is_system_open, 'auctions_open'):
+            # bidding is paused globally; look again once it reopens
+            context.job_queue.run_once(close_auction_job, when=60, data=auction_id, name=context.job.name)
+            return
+
+        outcome = await BID_LANES.submit(auction_id, close_auction_row, auction_id)
+        if outcome['status'] == 'pending':
+            schedule_auction_close(context.job_queue, auction_id, outcome['ends_at'])
+        elif outcome['status'] == 'ended':
+            debug_log(f"Auction #{auction_id} closed on schedule")
+            await settle_closed_auction(context, outcome['auction'], outcome['winner'])
+    except Exception as e:
+        debug_log(f"Error closing auction #{auction_id}: {str(e)}")
+
+def get_scheduled_closes():
+    with db_connection() as conn:
+        return conn.execute('''SELECT auction_id, ends_at FROM auctions
+                               WHERE auction_status = 'active' AND ends_at IS NOT NULL
+                               ORDER BY ends_at''').fetchall()
+
+async def schedule_pending_closes(application):
+    """Arm a timer for every auction with an ends_at; items that ran out while the bot was down close staggered"""
+    now = time.time()
+    overdue = 0
+    for row in await run_db(get_scheduled_closes):
+        ends_at = row['ends_at']
+        if ends_at <= now:
+            ends_at = now + overdue * AUCTION_CLOSE_STAGGER_SECONDS
+            overdue += 1
+        schedule_auction_close(application.job_queue, row['auction_id'], ends_at)
+
+@admin_only
+async def set_auction_end_command(update: Update, context: CallbackContext):
+    """/setend <item_id> <30m|2h|1d|off>: give an item its own closing time"""
+    if len(context.args) != 2 or not context.args[0].lstrip('#').isdigit():
+        await update.message.reply_text(
+            "❌ Usage: /setend <item_id> <duration|off>\n"
+            "Example: /setend 12 2h  (m = minutes, h = hours, d = days)"
+        )
+        return
+
+    auction_id = int(context.args[0].lstrip('#'))
+    if context.args[1].lower() == 'off':
+        ends_at = None
+    else:
+        duration = parse_duration(context.args[1])
+        if not duration:
+            await update.message.reply_text("❌ Invalid duration. Use e.g. 30m, 2h or 1d.")
+            return
+        ends_at = await run_db(next_close_slot, time.time() + duration, auction_id)
+
+    if not await run_db(set_auction_end, auction_id, ends_at):
+        await update.message.reply_text("❌ Active auction not found!")
+        return
+
+    schedule_auction_close(context.job_queue, auction_id, ends_at)
+    if ends_at is None:
+        await update.message.reply_text(f"✅ Item #{auction_id} no longer closes on its own.")
+    else:
+        await update.message.reply_text(f"✅ Item #{auction_id} closes at {format_end_time(ends_at)}.")
+
+def get_active_auction_ids():
+    with db_connection() as conn:
+        return [row[0] for row in conn.execute("SELECT auction_id FROM auctions WHERE auction_status = 'active'")]
+
 @admin_only
-def end_auction(update: Update, context: CallbackContext):
+async def end_auction(update: Update, context: CallbackContext):
     try:
-        with db_connection() as conn:
-            conn.execute("UPDATE system_status SET auctions_open=0 WHERE id=1")
-            conn.commit()
+        await run_db(set_system_status, 'auctions_open', False)
 
-        update.message.reply_text("📤 Sending win notifications to highest bidders...")
-        notifications_sent, notifications_failed = send_win_notifications(context)
+        # close every item on its own bid lane first: it is marked ended with its winner read in the
+        # same write, and its close timer is dropped, so nothing settles it a second time later
+        closed = []
+        for auction_id in await run_db(get_active_auction_ids):
+            outcome = await BID_LANES.submit(auction_id, close_auction_row, auction_id, True)
+            schedule_auction_close(context.job_queue, auction_id, None)
+            if outcome['status'] == 'ended':
+                closed.append(outcome)
 
-        with db_connection() as conn:
-            active_auctions = conn.execute(
-                "SELECT * FROM auctions WHERE auction_status = 'active'"
-            ).fetchall()
+        await update.message.reply_text("📤 Sending win notifications to highest bidders...")
+        notifications_sent, notifications_failed = await send_win_notifications(context, closed)
 
         updated_buyers = 0
         updated_sellers = 0
 
-        for auction in active_auctions:
-            with db_connection() as conn:
-                winner = conn.execute(
-                    "SELECT bidder_id, bidder_name FROM bids WHERE auction_id = ? AND is_active = 1 ORDER BY amount DESC LIMIT 1",
-                    (auction["auction_id"],)
-                ).fetchone()
-
+        for outcome in closed:
+            auction, winner = outcome['auction'], outcome['winner']
             if winner and winner["bidder_id"]:
                 winner_id = winner["bidder_id"]
                 winner_username = winner["bidder_name"] or f"User_{winner_id}"
@@ -1561,19 +3261,19 @@ def end_auction(update: Update, context: CallbackContext):
                 seller_username = auction["seller_name"] or f"User_{seller_id}" if seller_id else "Unknown"
 
                 try:
-                    increment_win(winner_id, winner_username)
+                    await run_db(increment_win, winner_id, winner_username)
                     updated_buyers += 1
                 except Exception as e:
                     debug_log(f"Failed to update buyer leaderboard for user {winner_id}: {str(e)}")
 
                 if seller_id:
                     try:
-                        increment_sale(seller_id, seller_username)
+                        await run_db(increment_sale, seller_id, seller_username)
                         updated_sellers += 1
                     except Exception as e:
                         debug_log(f"Failed to update seller leaderboard for user {seller_id}: {str(e)}")
 
-        removed_buttons_count = remove_bid_buttons_from_all_auctions(context)
+        removed_buttons_count = await remove_bid_buttons_from_all_auctions(context, [outcome['auction'] for outcome in closed])
 
         response = (
             "✅ Auction bidding is now CLOSED\n\n"
@@ -1582,39 +3282,40 @@ def end_auction(update: Update, context: CallbackContext):
             f"🔒 Buttons removed from: {removed_buttons_count} auctions"
         )
 
-        update.message.reply_text(response)
+        await update.message.reply_text(response)
 
     except Exception as e:
         debug_log(f"Error in end_auction: {str(e)}")
-        update.message.reply_text("❌ Error closing auctions. Check logs.")
+        await update.message.reply_text("❌ Error closing auctions. Check logs.")
 
-def remove_bid_buttons_from_all_auctions(context):
+async def remove_bid_buttons(context, auction):
+    """Strip the Refresh / Place Bid buttons from one auction's channel post"""
     try:
-        with db_connection() as conn:
-            active_auctions = conn.execute(
-                "SELECT auction_id, channel_message_id FROM auctions WHERE auction_status = 'active'"
-            ).fetchall()
+        if auction['channel_message_id']:
+            await context.bot.edit_message_reply_markup(
+                chat_id=CHANNEL_ID,
+                message_id=auction['channel_message_id'],
+                reply_markup=None
+            )
+            return True
+    except telegram.error.BadRequest as e:
+        if "Message is not modified" in str(e):
+            return True
+        elif "message to edit not found" in str(e):
+            debug_log(f"Message {auction['channel_message_id']} not found for auction {auction['auction_id']}")
+        else:
+            debug_log(f"Couldn't remove buttons from auction {auction['auction_id']}: {str(e)}")
+    except Exception as e:
+        debug_log(f"Error removing buttons from auction {auction['auction_id']}: {str(e)}")
+    return False
 
+async def remove_bid_buttons_from_all_auctions(context, auctions):
+    try:
         removed_count = 0
         
-        for auction in active_auctions:
-            try:
-                if auction['channel_message_id']:
-                    context.bot.edit_message_reply_markup(
-                        chat_id=CHANNEL_ID,
-                        message_id=auction['channel_message_id'],
-                        reply_markup=None
-                    )
-                    removed_count += 1
-            except telegram.error.BadRequest as e:
-                if "Message is not modified" in str(e):
-                    removed_count += 1
-                elif "message to edit not found" in str(e):
-                    debug_log(f"Message {auction['channel_message_id']} not found for auction {auction['auction_id']}")
-                else:
-                    debug_log(f"Couldn't remove buttons from auction {auction['auction_id']}: {str(e)}")
-            except Exception as e:
-                debug_log(f"Error removing buttons from auction {auction['auction_id']}: {str(e)}")
+        for auction in auctions:
+            if await remove_bid_buttons(context, auction):
+                removed_count += 1
 
         return removed_count
         
@@ -1622,94 +3323,129 @@ def remove_bid_buttons_from_all_auctions(context):
         debug_log(f"Error in remove_bid_buttons_from_all_auctions: {str(e)}")
         return 0
 
-def ensure_all_auctions_active():
-    try:
-        with db_connection() as conn:
-            conn.execute("UPDATE auctions SET auction_status = 'active' WHERE auction_status = 'ended'")
-            count = conn.cursor().rowcount
-            if count > 0:
-                debug_log(f"Reset {count} ended auctions back to active status")
-            conn.commit()
-    except Exception as e:
-        debug_log(f"Error ensuring auctions are active: {str(e)}")
+def add_verification_request(user_id, username):
+    """File a verification request: 'requested', or 'verified' / 'pending' if there was nothing to file"""
+    def add(conn):
+        if conn.execute('SELECT 1 FROM verified_users WHERE user_id=?', (user_id,)).fetchone():
+            return 'verified'
+        if conn.execute('SELECT 1 FROM verification_requests WHERE user_id=?', (user_id,)).fetchone():
+            return 'pending'
+        conn.execute('INSERT INTO verification_requests (user_id, username) VALUES (?, ?)', (user_id, username))
+        return 'requested'
+    return DB_WRITER.write(add, 'verified_users.db')
+
+def verify_user_row(user_id, username, verified_by):
+    """Mark a user verified and drop any pending request of theirs; False if they already were"""
+    def verify(conn):
+        if conn.execute('SELECT 1 FROM verified_users WHERE user_id=?', (user_id,)).fetchone():
+            return False
+        conn.execute('DELETE FROM verification_requests WHERE user_id=?', (user_id,))
+        conn.execute('INSERT INTO verified_users (user_id, username, verified_by) VALUES (?, ?, ?)',
+                     (user_id, username, verified_by))
+        return True
+    return DB_WRITER.write(verify, 'verified_users.db')
+
+def resolve_verification_request(user_id, admin_id, approve):
+    """Approve or reject a pending verification request in one write.
+
+    Returns (outcome, username): outcome is 'verified' or 'rejected', or
+    'already_verified' / 'missing' when there was no request to act on.
+    """
+    def resolve(conn):
+        if conn.execute('SELECT 1 FROM verified_users WHERE user_id=?', (user_id,)).fetchone():
+            return 'already_verified', None
+        request = conn.execute('SELECT username FROM verification_requests WHERE user_id=?', (user_id,)).fetchone()
+        if not request:
+            return 'missing', None
+        if approve:
+            conn.execute('INSERT INTO verified_users (user_id, username, verified_by) VALUES (?, ?, ?)',
+                         (user_id, request['username'], admin_id))
+        conn.execute('DELETE FROM verification_requests WHERE user_id=?', (user_id,))
+        return ('verified' if approve else 'rejected'), request['username']
+    return DB_WRITER.write(resolve, 'verified_users.db')
+
+def get_verification_request_username(user_id):
+    with db_connection('verified_users.db') as conn:
+        row = conn.execute('SELECT username FROM verification_requests WHERE user_id=?', (user_id,)).fetchone()
+        return row['username'] if row else None
+
+def remove_verified_user(user_id):
+    """Unverify a user; returns the username they were verified under, or None if they weren't"""
+    def remove(conn):
+        row = conn.execute('SELECT username FROM verified_users WHERE user_id=?', (user_id,)).fetchone()
+        if not row:
+            return None
+        conn.execute("DELETE FROM verified_users WHERE user_id=?", (user_id,))
+        conn.execute("DELETE FROM verification_requests WHERE user_id=?", (user_id,))
+        return row['username'] or f"User_{user_id}"
+    return DB_WRITER.write(remove, 'verified_users.db')
+
+def count_verified_users():
+    with db_connection('verified_users.db') as conn:
+        return conn.execute('SELECT COUNT(*) FROM verified_users').fetchone()[0]
+
+def get_verified_users_page(page, per_page=20):
+    with db_connection('verified_users.db') as conn:
+        return conn.execute('''SELECT user_id, username, verified_at
+                               FROM verified_users
+                               ORDER BY verified_at DESC
+                               LIMIT ? OFFSET ?''', (per_page, (page - 1) * per_page)).fetchall()
+
+def get_verified_users():
+    with db_connection('verified_users.db') as conn:
+        return conn.execute('SELECT user_id FROM verified_users').fetchall()
 
 @admin_only
-def verify_user(update: Update, context: CallbackContext):
+async def verify_user(update: Update, context: CallbackContext):
     if not update.message.reply_to_message:
-        update.message.reply_text("❌ Please reply to a user's message with /verify")
+        await update.message.reply_text("❌ Please reply to a user's message with /verify")
         return
 
     target_user = update.message.reply_to_message.from_user
     admin_id = update.effective_user.id
 
     try:
-        with db_connection('verified_users.db') as conn:
-            c = conn.cursor()
-
-            c.execute('SELECT 1 FROM verified_users WHERE user_id=?', (target_user.id,))
-            if c.fetchone():
-                update.message.reply_text("⚠️ User is already verified")
-                return
-
-            # Remove from verification requests if exists
-            c.execute('DELETE FROM verification_requests WHERE user_id=?', (target_user.id,))
-            
-            c.execute('''INSERT INTO verified_users
-                        (user_id, username, verified_by)
-                        VALUES (?, ?, ?)''',
-                    (target_user.id,
-                     target_user.username or target_user.first_name,
-                     admin_id))
-
-            conn.commit()
+        if not await run_db(verify_user_row, target_user.id, target_user.username or target_user.first_name,
+                            admin_id):
+            await update.message.reply_text("⚠️ User is already verified")
+            return
 
-            # Update all admin messages if this was a pending request
-            update_all_admin_verification_messages(context, target_user.id, 'verified', admin_id)
+        # Update all admin messages if this was a pending request
+        await update_all_admin_verification_messages(context, target_user.id, 'verified', admin_id)
 
-            try:
-                context.bot.send_message(
-                    target_user.id,
-                    "✅ Verification Approved!\n\n"
-                    "You can now access all bot features.\n"
-                    "Please /start the bot again to refresh your status."
-                )
-            except telegram.error.BadRequest as e:
-                if "chat not found" in str(e).lower():
-                    debug_log(f"User {target_user.id} has not started the bot or blocked it")
-                else:
-                    debug_log(f"Failed to send verification message to user {target_user.id}: {str(e)}")
-            except Exception as e:
-                debug_log(f"Error sending verification message: {str(e)}")
+        try:
+            await context.bot.send_message(
+                target_user.id,
+                "✅ Verification Approved!\n\n"
+                "You can now access all bot features.\n"
+                "Please /start the bot again to refresh your status."
+            )
+        except telegram.error.BadRequest as e:
+            if "chat not found" in str(e).lower():
+                debug_log(f"User {target_user.id} has not started the bot or blocked it")
+            else:
+                debug_log(f"Failed to send verification message to user {target_user.id}: {str(e)}")
+        except Exception as e:
+            debug_log(f"Error sending verification message: {str(e)}")
 
-            update.message.reply_text(f"✅ Verified @{target_user.username or target_user.id}")
+        await update.message.reply_text(f"✅ Verified @{target_user.username or target_user.id}")
 
     except Exception as e:
         debug_log(f"Verification error: {str(e)}")
-        update.message.reply_text("❌ Failed to verify user")
+        await update.message.reply_text("❌ Failed to verify user")
 
-def request_verification(update: Update, context: CallbackContext):
+async def request_verification(update: Update, context: CallbackContext):
     """Command-based verification request"""
     user = update.effective_user
 
     try:
-        with db_connection('verified_users.db') as conn:
-            c = conn.cursor()
-
-            c.execute('SELECT 1 FROM verified_users WHERE user_id=?', (user.id,))
-            if c.fetchone():
-                update.message.reply_text("✅ You're already verified!")
-                return
-
-            c.execute('SELECT 1 FROM verification_requests WHERE user_id=?', (user.id,))
-            if c.fetchone():
-                update.message.reply_text("⏳ Your verification request is pending. Please wait for admin approval.")
-                return
-
-            c.execute('''INSERT INTO verification_requests
-                        (user_id, username)
-                        VALUES (?, ?)''',
-                    (user.id, user.username or user.first_name))
-            conn.commit()
+        outcome = await run_db(add_verification_request, user.id, user.username or user.first_name)
+        if outcome == 'verified':
+            await update.message.reply_text("✅ You're already verified!")
+            return
+        if outcome == 'pending':
+            await update.message.reply_text("⏳ Your verification request is pending. Please wait for admin approval.")
+            return
 
         # Store verification request data for all admins
         request_data = {
@@ -1720,26 +3456,27 @@ def request_verification(update: Update, context: CallbackContext):
 
         # Send verification request to all admins with buttons
         admin_messages = {}
-        for admin_id in ADMINS:
-            try:
-                message = context.bot.send_message(
-                    chat_id=admin_id,
-                    text=f"🆕 Verification Request\n\n"
-                         f"👤 User: @{user.username or user.first_name}\n"
-                         f"🆔 User ID: <code>{user.id}</code>\n"
-                         f"📅 Requested: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                         f"Choose an action:",
-                    parse_mode='HTML',
-                    reply_markup=InlineKeyboardMarkup([
-                        [
-                            InlineKeyboardButton("✅ Verify", callback_data=f"admin_verify_{user.id}"),
-                            InlineKeyboardButton("❌ Reject", callback_data=f"admin_reject_{user.id}")
-                        ]
-                    ])
-                )
-                admin_messages[admin_id] = message.message_id
-            except Exception as e:
-                debug_log(f"Failed to notify admin {admin_id}: {str(e)}")
+        with api_priority(PRIORITY_NOTIFY):
+            for admin_id in ADMINS:
+                try:
+                    message = await context.bot.send_message(
+                        chat_id=admin_id,
+                        text=f"🆕 Verification Request\n\n"
+                             f"👤 User: @{user.username or user.first_name}\n"
+                             f"🆔 User ID: <code>{user.id}</code>\n"
+                             f"📅 Requested: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+                             f"Choose an action:",
+                        parse_mode='HTML',
+                        reply_markup=InlineKeyboardMarkup([
+                            [
+                                InlineKeyboardButton("✅ Verify", callback_data=f"admin_verify_{user.id}"),
+                                InlineKeyboardButton("❌ Reject", callback_data=f"admin_reject_{user.id}")
+                            ]
+                        ])
+                    )
+                    admin_messages[admin_id] = message.message_id
+                except Exception as e:
+                    debug_log(f"Failed to notify admin {admin_id}: {str(e)}")
 
         # Store admin messages for later updates
         context.bot_data[f'verification_request_{user.id}'] = {
@@ -1747,18 +3484,18 @@ def request_verification(update: Update, context: CallbackContext):
             'request_data': request_data
         }
 
-        update.message.reply_text(
+        await update.message.reply_text(
             "✅ Verification request sent to admins!\n"
             "You'll be notified once approved."
         )
 
     except Exception as e:
         debug_log(f"Verification request error: {str(e)}")
-        update.message.reply_text("❌ Failed to process verification request")
+        await update.message.reply_text("❌ Failed to process verification request")
 
-def handle_admin_verification(update: Update, context: CallbackContext):
+async def handle_admin_verification(update: Update, context: CallbackContext):
     query = update.callback_query
-    query.answer()
+    await query.answer()
     
     data = query.data
     admin_id = query.from_user.id
@@ -1772,82 +3509,59 @@ def handle_admin_verification(update: Update, context: CallbackContext):
     else:
         return
     
-    # Check if user is still pending verification
+    # Check if user is still pending verification, and act on the request in the same write
     try:
-        with db_connection('verified_users.db') as conn:
-            c = conn.cursor()
-            
-            # Check if already verified
-            c.execute('SELECT 1 FROM verified_users WHERE user_id=?', (user_id,))
-            if c.fetchone():
-                query.edit_message_text("⚠️ User is already verified!")
-                return
-            
-            # Check if request still exists
-            c.execute('SELECT username FROM verification_requests WHERE user_id=?', (user_id,))
-            request_data = c.fetchone()
-            
-            if not request_data:
-                query.edit_message_text("❌ Verification request not found or already processed!")
-                return
-            
-            username = request_data['username']
-            
-            if action == 'verify':
-                # Verify the user (existing code)
-                c.execute('''INSERT INTO verified_users
-                            (user_id, username, verified_by)
-                            VALUES (?, ?, ?)''',
-                         (user_id, username, admin_id))
-                
-                # Remove from verification requests
-                c.execute('DELETE FROM verification_requests WHERE user_id=?', (user_id,))
-                conn.commit()
-                
-                # Update all admin messages
-                update_all_admin_verification_messages(context, user_id, 'verified', admin_id)
-                
-                # Notify the user
-                try:
-                    context.bot.send_message(
-                        user_id,
-                        "✅ Verification Approved!\n\n"
-                        "You can now access all bot features.\n"
-                        "Please /start the bot again to refresh your status."
-                    )
-                except Exception as e:
-                    debug_log(f"Failed to send verification message to user {user_id}: {str(e)}")
-                
-                query.edit_message_text(f"✅ Verified @{username}")
-                
-            else:  # reject - SIMPLIFIED: No reason required
-                # Remove from verification requests
-                c.execute('DELETE FROM verification_requests WHERE user_id=?', (user_id,))
-                conn.commit()
-                
-                # Update all admin messages
-                update_all_admin_verification_messages(context, user_id, 'rejected', admin_id)
-                
-                # Notify the user (simple message, no reason)
-                try:
-                    context.bot.send_message(
-                        user_id,
-                        "❌ Your verification request has been rejected.\n\n"
-                        "You can submit a new verification request using /verify_me"
-                    )
-                except Exception as e:
-                    debug_log(f"Failed to send rejection message to user {user_id}: {str(e)}")
-                
-                query.edit_message_text(f"❌ Rejected @{username}")
-                
+        outcome, username = await run_db(resolve_verification_request, user_id, admin_id, action == 'verify')
+
+        if outcome == 'already_verified':
+            await query.edit_message_text("⚠️ User is already verified!")
+            return
+
+        if outcome == 'missing':
+            await query.edit_message_text("❌ Verification request not found or already processed!")
+            return
+
+        if outcome == 'verified':
+            # Update all admin messages
+            await update_all_admin_verification_messages(context, user_id, 'verified', admin_id)
+
+            # Notify the user
+            try:
+                await context.bot.send_message(
+                    user_id,
+                    "✅ Verification Approved!\n\n"
+                    "You can now access all bot features.\n"
+                    "Please /start the bot again to refresh your status."
+                )
+            except Exception as e:
+                debug_log(f"Failed to send verification message to user {user_id}: {str(e)}")
+
+            await query.edit_message_text(f"✅ Verified @{username}")
+
+        else:  # reject - SIMPLIFIED: No reason required
+            # Update all admin messages
+            await update_all_admin_verification_messages(context, user_id, 'rejected', admin_id)
+
+            # Notify the user (simple message, no reason)
+            try:
+                await context.bot.send_message(
+                    user_id,
+                    "❌ Your verification request has been rejected.\n\n"
+                    "You can submit a new verification request using /verify_me"
+                )
+            except Exception as e:
+                debug_log(f"Failed to send rejection message to user {user_id}: {str(e)}")
+
+            await query.edit_message_text(f"❌ Rejected @{username}")
+
     except Exception as e:
         debug_log(f"Error in admin verification: {str(e)}")
-        query.edit_message_text("❌ Error processing verification request")
+        await query.edit_message_text("❌ Error processing verification request")
 
 
-def handle_cancel_rejection(update: Update, context: CallbackContext):
+async def handle_cancel_rejection(update: Update, context: CallbackContext):
     query = update.callback_query
-    query.answer()
+    await query.answer()
     
     user_id = int(query.data.split('_')[2])
     
@@ -1857,39 +3571,34 @@ def handle_cancel_rejection(update: Update, context: CallbackContext):
     
     # Restore original message
     try:
-        with db_connection('verified_users.db') as conn:
-            c = conn.cursor()
-            c.execute('SELECT username FROM verification_requests WHERE user_id=?', (user_id,))
-            request_data = c.fetchone()
-            
-            if request_data:
-                username = request_data['username']
-                
-                query.edit_message_text(
-                    f"🆕 Verification Request\n\n"
-                    f"👤 User: @{username}\n"
-                    f"🆔 User ID: <code>{user_id}</code>\n"
-                    f"📅 Requested: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                    f"Choose an action:",
-                    parse_mode='HTML',
-                    reply_markup=InlineKeyboardMarkup([
-                        [
-                            InlineKeyboardButton("✅ Verify", callback_data=f"admin_verify_{user_id}"),
-                            InlineKeyboardButton("❌ Reject", callback_data=f"admin_reject_{user_id}")
-                        ]
-                    ])
-                )
-            else:
-                query.edit_message_text("❌ Verification request no longer exists!")
-                
+        username = await run_db(get_verification_request_username, user_id)
+
+        if username:
+            await query.edit_message_text(
+                f"🆕 Verification Request\n\n"
+                f"👤 User: @{username}\n"
+                f"🆔 User ID: <code>{user_id}</code>\n"
+                f"📅 Requested: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+                f"Choose an action:",
+                parse_mode='HTML',
+                reply_markup=InlineKeyboardMarkup([
+                    [
+                        InlineKeyboardButton("✅ Verify", callback_data=f"admin_verify_{user_id}"),
+                        InlineKeyboardButton("❌ Reject", callback_data=f"admin_reject_{user_id}")
+                    ]
+                ])
+            )
+        else:
+            await query.edit_message_text("❌ Verification request no longer exists!")
+
     except Exception as e:
         debug_log(f"Error canceling rejection: {str(e)}")
-        query.edit_message_text("❌ Error canceling rejection")
+        await query.edit_message_text("❌ Error canceling rejection")
 
 
 
 
-def handle_submission_rejection_reason(update: Update, context: CallbackContext):
+async def handle_submission_rejection_reason(update: Update, context: CallbackContext):
     """Handle admin's submission rejection reason - SIMPLIFIED"""
     debug_log(f"🎯 Rejection reason from admin {update.effective_user.id}")
     
@@ -1902,7 +3611,7 @@ def handle_submission_rejection_reason(update: Update, context: CallbackContext)
     # Check if this admin has an active rejection
     if 'active_rejection' not in context.user_data:
         debug_log(f"❌ No active rejection found for admin {current_admin_id}")
-        update.message.reply_text("❌ No active rejection session found. Please click the reject button again.")
+        await update.message.reply_text("❌ No active rejection session found. Please click the reject button again.")
         return
     
     active_rejection = context.user_data['active_rejection']
@@ -1910,7 +3619,7 @@ def handle_submission_rejection_reason(update: Update, context: CallbackContext)
     # Verify this rejection belongs to the current admin
     if active_rejection['admin_id'] != current_admin_id:
         debug_log(f"❌ Rejection context mismatch: expected admin {active_rejection['admin_id']}, got {current_admin_id}")
-        update.message.reply_text("❌ This rejection session doesn't belong to you. Please start your own rejection.")
+        await update.message.reply_text("❌ This rejection session doesn't belong to you. Please start your own rejection.")
         return
     
     submission_id = active_rejection['submission_id']
@@ -1919,7 +3628,7 @@ def handle_submission_rejection_reason(update: Update, context: CallbackContext)
     rejection_reason = update.message.text.strip()
     
     if not rejection_reason:
-        update.message.reply_text("❌ Please provide a rejection reason.")
+        await update.message.reply_text("❌ Please provide a rejection reason.")
         return
     
     if rejection_reason.startswith('/'):
@@ -1927,20 +3636,16 @@ def handle_submission_rejection_reason(update: Update, context: CallbackContext)
     
     # Process the rejection
     try:
-        submission = get_submission(submission_id)
-        if not submission or submission['status'] != 'pending':
-            update.message.reply_text("❌ Submission not found or already processed!")
+        submission = await run_db(get_submission, submission_id)
+        # mark submission as rejected unless another admin approved or rejected it meanwhile
+        if not submission or not await run_db(transition_submission, submission_id, 'pending', 'rejected'):
+            await update.message.reply_text("❌ Submission not found or already processed!")
             # Clean up
             context.user_data.pop('active_rejection', None)
             return
         
-        # Update database - mark submission as rejected
-        with db_connection() as conn:
-            conn.execute("UPDATE submissions SET status='rejected' WHERE submission_id=?", (submission_id,))
-            conn.commit()
-        
         # Update user stats
-        update_submission_stats(submission['user_id'], 'rejected')
+        await run_db(update_submission_stats, submission['user_id'], 'rejected')
         
         # Completion message
         completion_message = (
@@ -1954,7 +3659,7 @@ def handle_submission_rejection_reason(update: Update, context: CallbackContext)
         
         # Update original message
         try:
-            context.bot.edit_message_text(
+            await context.bot.edit_message_text(
                 chat_id=active_rejection['original_chat_id'],
                 message_id=active_rejection['original_message_id'],
                 text=completion_message,
@@ -1965,7 +3670,7 @@ def handle_submission_rejection_reason(update: Update, context: CallbackContext)
         except Exception as e:
             debug_log(f"⚠️ Could not edit original message: {e}")
             # Send as new message to current admin
-            context.bot.send_message(
+            await context.bot.send_message(
                 chat_id=update.effective_chat.id,
                 text=completion_message,
                 parse_mode='HTML'
@@ -1981,7 +3686,7 @@ def handle_submission_rejection_reason(update: Update, context: CallbackContext)
                 f"<i>You can submit a new item with /add</i>"
             )
             
-            context.bot.send_message(
+            await context.bot.send_message(
                 chat_id=active_rejection['user_id'],
                 text=user_notification,
                 parse_mode='HTML'
@@ -1997,7 +3702,7 @@ def handle_submission_rejection_reason(update: Update, context: CallbackContext)
         # Delete the reason message
         debug_log("🗑️ Deleting reason message...")
         try:
-            context.bot.delete_message(
+            await context.bot.delete_message(
                 chat_id=update.message.chat.id,
                 message_id=update.message.message_id
             )
@@ -2014,7 +3719,7 @@ def handle_submission_rejection_reason(update: Update, context: CallbackContext)
         
         # Send error message
         try:
-            update.message.reply_text("❌ Error processing rejection. Check logs.")
+            await update.message.reply_text("❌ Error processing rejection. Check logs.")
         except:
             pass
         
@@ -2031,17 +3736,17 @@ def cleanup_rejection_context(submission_id):
     except Exception as e:
         debug_log(f"❌ Error cleaning up rejection context: {e}")
 
-def handle_cancel_submission_rejection(update: Update, context: CallbackContext):
+async def handle_cancel_submission_rejection(update: Update, context: CallbackContext):
     """Cancel submission rejection - SIMPLIFIED"""
     query = update.callback_query
-    query.answer()
+    await query.answer()
     
     try:
         submission_id = int(query.data.split('_')[3])
         
         # Check if there's an active rejection
         if 'active_rejection' not in context.user_data:
-            query.edit_message_text("❌ No active rejection to cancel!")
+            await query.edit_message_text("❌ No active rejection to cancel!")
             return
         
         # Clean up
@@ -2049,9 +3754,9 @@ def handle_cancel_submission_rejection(update: Update, context: CallbackContext)
         debug_log(f"✅ Rejection cancelled for submission #{submission_id}")
         
         # Restore original submission message
-        submission = get_submission(submission_id)
+        submission = await run_db(get_submission, submission_id)
         if not submission:
-            query.edit_message_text("❌ Submission not found!")
+            await query.edit_message_text("❌ Submission not found!")
             return
         
         submission_data = submission['data']
@@ -2064,7 +3769,7 @@ def handle_cancel_submission_rejection(update: Update, context: CallbackContext)
             item_text = format_pokemon_auction_item(submission_data)
         
         # Restore the original verification message
-        query.edit_message_text(
+        await query.edit_message_text(
             text=item_text,
             parse_mode='HTML',
             reply_markup=InlineKeyboardMarkup([
@@ -2077,7 +3782,7 @@ def handle_cancel_submission_rejection(update: Update, context: CallbackContext)
         
     except Exception as e:
         debug_log(f"❌ Error cancelling rejection: {str(e)}")
-        query.edit_message_text("❌ Error cancelling rejection")
+        await query.edit_message_text("❌ Error cancelling rejection")
 
 def cleanup_rejection_from_db(submission_id):
     """Clean up rejection from database"""
@@ -2089,21 +3794,31 @@ def cleanup_rejection_from_db(submission_id):
     except Exception as e:
         debug_log(f"❌ Error cleaning up rejection: {e}")
 
+def delete_stale_rows(table, column, max_age_seconds, chunk=SESSION_REAPER_CHUNK):
+    """Delete rows whose DATETIME column is older than max_age_seconds, one chunk per writer transaction"""
+    cutoff = f"-{int(max_age_seconds)} seconds"
+    sql = f'''DELETE FROM {table} WHERE rowid IN
+               (SELECT rowid FROM {table} WHERE {column} < datetime('now', ?) LIMIT ?)'''
+    total = 0
+    while True:
+        deleted = DB_WRITER.execute(sql, (cutoff, chunk))
+        total += deleted
+        if deleted < chunk:
+            return total
+
 def cleanup_old_rejections():
-    """Clean up rejections older than 1 hour"""
+    """Clean up rejections older than REJECTION_TTL_SECONDS"""
     try:
-        with db_connection() as conn:
-            conn.execute('''DELETE FROM active_rejections 
-                           WHERE created_at < datetime('now', '-1 hour')''')
-            count = conn.cursor().rowcount
-            if count > 0:
-                debug_log(f"✅ Cleaned up {count} old rejections from database")
-            conn.commit()
+        count = delete_stale_rows('active_rejections', 'created_at', REJECTION_TTL_SECONDS)
+        if count > 0:
+            debug_log(f"✅ Cleaned up {count} old rejections from database")
+        return count
     except Exception as e:
         debug_log(f"❌ Error cleaning old rejections: {e}")
+        return 0
 
 
-def update_all_admin_verification_messages(context, user_id, status, action_admin_id):
+async def update_all_admin_verification_messages(context, user_id, status, action_admin_id):
     """Update verification request messages for all admins"""
     try:
         request_key = f'verification_request_{user_id}'
@@ -2115,14 +3830,14 @@ def update_all_admin_verification_messages(context, user_id, status, action_admi
         admin_messages = request_data['admin_messages']
         user_data = request_data['request_data']
         
-        action_admin = context.bot.get_chat(action_admin_id)
+        action_admin = await context.bot.get_chat(action_admin_id)
         admin_name = f"@{action_admin.username}" if action_admin.username else action_admin.first_name
         
         status_text = "✅ VERIFIED" if status == 'verified' else "❌ REJECTED"
         
         for admin_id, message_id in admin_messages.items():
             try:
-                edit_message_with_retry(
+                await edit_message_with_retry(
                     context.bot,
                     chat_id=admin_id,
                     message_id=message_id,
@@ -2145,86 +3860,80 @@ def update_all_admin_verification_messages(context, user_id, status, action_admi
         debug_log(f"Error updating admin messages: {str(e)}")
 
 @admin_only
-def list_verified_users(update: Update, context: CallbackContext):
+async def list_verified_users(update: Update, context: CallbackContext):
     try:
-        with db_connection('verified_users.db') as conn:
-            total_users = conn.execute('SELECT COUNT(*) FROM verified_users').fetchone()[0]
-            
-            if total_users == 0:
-                update.message.reply_text("No verified users found.")
-                return
+        total_users = await run_db(count_verified_users)
+
+        if total_users == 0:
+            await update.message.reply_text("No verified users found.")
+            return
+
+        total_pages = (total_users + 19) // 20
+
+        context.user_data['verified_users_pagination'] = {
+            'total_pages': total_pages,
+            'current_page': 1,
+            'total_users': total_users
+        }
+
+        await display_verified_users_page(update, context, page=1)
 
-            total_pages = (total_users + 19) // 20  
-            
-            context.user_data['verified_users_pagination'] = {
-                'total_pages': total_pages,
-                'current_page': 1,
-                'total_users': total_users
-            }
-            
-            display_verified_users_page(update, context, page=1)
-            
     except Exception as e:
         debug_log(f"Error listing users: {str(e)}")
-        update.message.reply_text("❌ Error fetching user list")
+        await update.message.reply_text("❌ Error fetching user list")
 
-def display_verified_users_page(update, context, page):
+async def display_verified_users_page(update, context, page):
     try:
-        with db_connection('verified_users.db') as conn:
-            offset = (page - 1) * 20
-            
-            users = conn.execute('''SELECT user_id, username, verified_at 
-                                   FROM verified_users 
-                                   ORDER BY verified_at DESC 
-                                   LIMIT 20 OFFSET ?''', (offset,)).fetchall()
+        offset = (page - 1) * 20
+        users = await run_db(get_verified_users_page, page)
 
-            if not users:
-                if update.callback_query:
-                    update.callback_query.edit_message_text("❌ No users found for this page.")
-                else:
-                    update.message.reply_text("❌ No users found for this page.")
-                return
+        if not users:
+            if update.callback_query:
+                await update.callback_query.edit_message_text("❌ No users found for this page.")
+            else:
+                await update.message.reply_text("❌ No users found for this page.")
+            return
 
-            response_lines = [f"✅ <b>Verified Users - Page {page}/{context.user_data['verified_users_pagination']['total_pages']}</b>\n"]
-            response_lines.append(f"📊 Total Users: {context.user_data['verified_users_pagination']['total_users']}\n")
+        response_lines = [f"✅ <b>Verified Users - Page {page}/{context.user_data['verified_users_pagination']['total_pages']}</b>\n"]
+        response_lines.append(f"📊 Total Users: {context.user_data['verified_users_pagination']['total_users']}\n")
 
-            for i, user in enumerate(users, offset + 1):
-                user_id, username, verified_at = user
-                username = username or f"User_{user_id}"
-                
-                response_lines.extend([
-                    f"\n{i}. 👤 @{username}",
-                    f"   🆔 ID: <code>{user_id}</code>",
-                    f"   📅 Verified: {verified_at}"
-                ])
+        for i, user in enumerate(users, offset + 1):
+            user_id, username, verified_at = user
+            username = username or f"User_{user_id}"
 
-            message_text = "\n".join(response_lines)
-            
-            keyboard = create_pagination_buttons(page, context.user_data['verified_users_pagination']['total_pages'])
-            
-            if update.callback_query:
-                update.callback_query.edit_message_text(
-                    text=message_text,
-                    parse_mode='HTML',
-                    reply_markup=InlineKeyboardMarkup(keyboard)
-                )
-            else:
-                update.message.reply_text(
-                    text=message_text,
-                    parse_mode='HTML',
-                    reply_markup=InlineKeyboardMarkup(keyboard)
-                )
+            response_lines.extend([
+                f"\n{i}. 👤 @{username}",
+                f"   🆔 ID: <code>{user_id}</code>",
+                f"   📅 Verified: {verified_at}"
+            ])
+
+        message_text = "\n".join(response_lines)
+
+        keyboard = create_pagination_buttons(page, context.user_data['verified_users_pagination']['total_pages'])
+
+        if update.callback_query:
+            await update.callback_query.edit_message_text(
+                text=message_text,
+                parse_mode='HTML',
+                reply_markup=InlineKeyboardMarkup(keyboard)
+            )
+        else:
+            await update.message.reply_text(
+                text=message_text,
+                parse_mode='HTML',
+                reply_markup=InlineKeyboardMarkup(keyboard)
+            )
 
     except Exception as e:
         debug_log(f"Error displaying user page: {str(e)}")
         error_msg = "❌ Error displaying users"
         if update.callback_query:
             try:
-                update.callback_query.edit_message_text(error_msg)
+                await update.callback_query.edit_message_text(error_msg)
             except:
                 pass
         else:
-            update.message.reply_text(error_msg)
+            await update.message.reply_text(error_msg)
 
 def create_pagination_buttons(current_page, total_pages):
     keyboard = []
@@ -2245,14 +3954,14 @@ def create_pagination_buttons(current_page, total_pages):
     
     return keyboard
 
-def handle_verified_pagination(update: Update, context: CallbackContext):
+async def handle_verified_pagination(update: Update, context: CallbackContext):
     query = update.callback_query
-    query.answer()
+    await query.answer()
     
     data = query.data
     
     if data == "verified_close":
-        query.delete_message()
+        await query.delete_message()
         return
     
     try:
@@ -2265,32 +3974,31 @@ def handle_verified_pagination(update: Update, context: CallbackContext):
         
         if 'verified_users_pagination' not in context.user_data:
             try:
-                with db_connection('verified_users.db') as conn:
-                    total_users = conn.execute('SELECT COUNT(*) FROM verified_users').fetchone()[0]
-                    total_pages = (total_users + 19) // 20
-                    context.user_data['verified_users_pagination'] = {
-                        'total_pages': total_pages,
-                        'current_page': page,
-                        'total_users': total_users
-                    }
+                total_users = await run_db(count_verified_users)
+                total_pages = (total_users + 19) // 20
+                context.user_data['verified_users_pagination'] = {
+                    'total_pages': total_pages,
+                    'current_page': page,
+                    'total_users': total_users
+                }
             except Exception as e:
                 debug_log(f"Error recreating pagination data: {str(e)}")
-                query.edit_message_text("❌ Session expired. Use /listverified again.")
+                await query.edit_message_text("❌ Session expired. Use /listverified again.")
                 return
         else:
             context.user_data['verified_users_pagination']['current_page'] = page
         
-        display_verified_users_page(update, context, page)
+        await display_verified_users_page(update, context, page)
         
     except Exception as e:
         debug_log(f"Error handling pagination: {str(e)}")
         try:
-            query.edit_message_text("❌ Error navigating pages. Use /listverified again.")
+            await query.edit_message_text("❌ Error navigating pages. Use /listverified again.")
         except:
             pass
 
 @admin_only
-def remove_verification(update: Update, context: CallbackContext):
+async def remove_verification(update: Update, context: CallbackContext):
     if update.message.reply_to_message:
         target_user = update.message.reply_to_message.from_user
         user_id = target_user.id
@@ -2300,10 +4008,10 @@ def remove_verification(update: Update, context: CallbackContext):
             user_id = int(context.args[0])
             username = f"User_{user_id}"  
         except ValueError:
-            update.message.reply_text("❌ Invalid user ID. Please provide a numeric user ID.")
+            await update.message.reply_text("❌ Invalid user ID. Please provide a numeric user ID.")
             return
     else:
-        update.message.reply_text(
+        await update.message.reply_text(
             "❌ Usage: \n"
             "• /unverify <user_id>\n"
             "• Or reply to a user's message with /unverify"
@@ -2311,26 +4019,15 @@ def remove_verification(update: Update, context: CallbackContext):
         return
 
     try:
-        with db_connection('verified_users.db') as conn:
-            c = conn.cursor()
-            c.execute('SELECT username FROM verified_users WHERE user_id=?', (user_id,))
-            user_data = c.fetchone()
-
-            if not user_data:
-                update.message.reply_text(f"❌ User {user_id} is not verified!")
-                return
-
-            db_username = user_data['username'] if user_data else f"User_{user_id}"
-
-            conn.execute("DELETE FROM verified_users WHERE user_id=?", (user_id,))
-
-            conn.execute("DELETE FROM verification_requests WHERE user_id=?", (user_id,))
-            conn.commit()
+        db_username = await run_db(remove_verified_user, user_id)
+        if not db_username:
+            await update.message.reply_text(f"❌ User {user_id} is not verified!")
+            return
 
-        update.message.reply_text(f"✅ Verification removed for user: {db_username} (ID: {user_id})")
+        await update.message.reply_text(f"✅ Verification removed for user: {db_username} (ID: {user_id})")
 
         try:
-            context.bot.send_message(
+            await context.bot.send_message(
                 user_id,
                 "⚠️ Your verification status has been removed by admin.\n\n"
                 "You'll need to get verified again to use bot features.\n"
@@ -2345,7 +4042,7 @@ def remove_verification(update: Update, context: CallbackContext):
 
     except Exception as e:
         debug_log(f"Error removing verification: {str(e)}")
-        update.message.reply_text("❌ Failed to remove verification. Check logs for details.")
+        await update.message.reply_text("❌ Failed to remove verification. Check logs for details.")
 
 def check_verification_status(user_id):
     try:
@@ -2356,80 +4053,84 @@ def check_verification_status(user_id):
         debug_log(f"Verification check error: {str(e)}")
         return False
 
+def touch_verified_user(user):
+    """Return whether the user is verified, refreshing their last_active/username if so"""
+    with db_connection('verified_users.db') as conn:
+        c = conn.cursor()
+
+        c.execute('''SELECT user_id FROM verified_users
+                    WHERE user_id=?''',
+                 (user.id,))
+        if not c.fetchone():
+            return False
+
+    try:
+        DB_WRITER.execute('''UPDATE verified_users SET
+                             last_active=CURRENT_TIMESTAMP,
+                             username=?
+                             WHERE user_id=?''',
+                          (user.username or user.first_name, user.id), db_name='verified_users.db')
+    except sqlite3.OperationalError as e:
+        debug_log(f"Optional columns not available: {str(e)}")
+    return True
+
 def verified_only(func):
-    def wrapper(update: Update, context: CallbackContext):
+    async def wrapper(update: Update, context: CallbackContext):
         user = update.effective_user
 
         if user.id in ADMINS:
-            return func(update, context)
+            return await func(update, context)
 
         try:
-            with db_connection('verified_users.db') as conn:
-                c = conn.cursor()
-
-                c.execute('''SELECT user_id FROM verified_users
-                            WHERE user_id=?''',
-                         (user.id,))
-                is_verified = c.fetchone()
-
-                if not is_verified:
-                    # Show verification request with button and GIF
-                    keyboard = [
-                        [InlineKeyboardButton("🔐 Request Verification", callback_data="request_verification")]
-                    ]
-                    
-                    gif_url = "https://i.ibb.co/vxZLvHLJ/New-Project-19.gif"
-                    
-                    response = [
-                        "🔒 <b>Verification Required</b>",
-                        "",
-                        "<code>To use this bot, you need to be verified first.</code>",
-                        "Click the button below to request verification:"
-                    ]
-                    
-                    # Check if this is a callback query or regular message
-                    if update.callback_query:
-                        try:
-                            update.callback_query.answer()
-                            update.callback_query.edit_message_text(
-                                "\n".join(response),
-                                parse_mode='HTML',
-                                reply_markup=InlineKeyboardMarkup(keyboard)
-                            )
-                        except Exception as e:
-                            debug_log(f"Error editing callback message: {str(e)}")
-                    elif update.message:
-                        try:
-                            # Try to send GIF with caption
-                            update.message.reply_animation(
-                                animation=gif_url,
-                                caption="\n".join(response),
-                                parse_mode='HTML',
-                                reply_markup=InlineKeyboardMarkup(keyboard)
-                            )
-                        except Exception as gif_error:
-                            debug_log(f"Error sending GIF, falling back to text: {str(gif_error)}")
-                            # Fallback to text if GIF fails
-                            update.message.reply_text(
-                                "\n".join(response),
-                                parse_mode='HTML',
-                                reply_markup=InlineKeyboardMarkup(keyboard)
-                            )
-                    
-                    return ConversationHandler.END if hasattr(update, 'message') else None
+            is_verified = await run_db(touch_verified_user, user)
 
-                try:
-                    c.execute('''UPDATE verified_users SET
-                                last_active=CURRENT_TIMESTAMP,
-                                username=?
-                                WHERE user_id=?''',
-                             (user.username or user.first_name, user.id))
-                    conn.commit()
-                except sqlite3.OperationalError as e:
-                    debug_log(f"Optional columns not available: {str(e)}")
-                    conn.rollback()
-
-                return func(update, context)
+            if not is_verified:
+                # Show verification request with button and GIF
+                keyboard = [
+                    [InlineKeyboardButton("🔐 Request Verification", callback_data="request_verification")]
+                ]
+                
+                gif_url = "https://i.ibb.co/vxZLvHLJ/New-Project-19.gif"
+                
+                response = [
+                    "🔒 <b>Verification Required</b>",
+                    "",
+                    "<code>To use this bot, you need to be verified first.</code>",
+                    "Click the button below to request verification:"
+                ]
+                
+                # Check if this is a callback query or regular message
+                if update.callback_query:
+                    try:
+                        await update.callback_query.answer()
+                        await update.callback_query.edit_message_text(
+                            "\n".join(response),
+                            parse_mode='HTML',
+                            reply_markup=InlineKeyboardMarkup(keyboard)
+                        )
+                    except Exception as e:
+                        debug_log(f"Error editing callback message: {str(e)}")
+                elif update.message:
+                    try:
+                        # Try to send GIF with caption
+                        await update.message.reply_animation(
+                            animation=gif_url,
+                            caption="\n".join(response),
+                            parse_mode='HTML',
+                            reply_markup=InlineKeyboardMarkup(keyboard)
+                        )
+                    except Exception as gif_error:
+                        debug_log(f"Error sending GIF, falling back to text: {str(gif_error)}")
+                        # Fallback to text if GIF fails
+                        await update.message.reply_text(
+                            "\n".join(response),
+                            parse_mode='HTML',
+                            reply_markup=InlineKeyboardMarkup(keyboard)
+                        )
+                
+                return ConversationHandler.END if hasattr(update, 'message') else None
+
+            return await func(update, context)
 
         except Exception as e:
             debug_log(f"Verification check failed: {str(e)}")
@@ -2448,7 +4149,7 @@ def verified_only(func):
             if update.message:
                 try:
                     # Try to send GIF with error message
-                    update.message.reply_animation(
+                    await update.message.reply_animation(
                         animation=gif_url,
                         caption="\n".join(error_response),
                         parse_mode='HTML',
@@ -2457,7 +4158,7 @@ def verified_only(func):
                 except Exception as gif_error:
                     debug_log(f"Error sending GIF, falling back to text: {str(gif_error)}")
                     # Fallback to text if GIF fails
-                    update.message.reply_text(
+                    await update.message.reply_text(
                         "\n".join(error_response),
                         parse_mode='HTML',
                         reply_markup=InlineKeyboardMarkup(keyboard)
@@ -2477,26 +4178,25 @@ def cleanup_verification_requests():
 
 def check_system_status(status_type):
     def decorator(func):
-        def wrapper(update: Update, context: CallbackContext):
-            with db_connection() as conn:
-                status = conn.execute(f"SELECT {status_type} FROM system_status WHERE id=1").fetchone()[0]
-
-                if not status:
-                    if status_type == "submissions_open":
-                        update.message.reply_text("❌ Item submissions are currently closed.")
-                    elif status_type == "auctions_open":
-                        update.message.reply_text("❌ Auctions are currently closed.")
-                    else:
-                        update.message.reply_text("❌ This feature is currently disabled.")
-                    return
-                return func(update, context)
+        async def wrapper(update: Update, context: CallbackContext):
+            status = await run_db(is_system_open, status_type)
+
+            if not status:
+                if status_type == "submissions_open":
+                    await update.message.reply_text("❌ Item submissions are currently closed.")
+                elif status_type == "auctions_open":
+                    await update.message.reply_text("❌ Auctions are currently closed.")
+                else:
+                    await update.message.reply_text("❌ This feature is currently disabled.")
+                return
+            return await func(update, context)
         return wrapper
     return decorator
 
 @admin_only
-def broadcast_message(update: Update, context: CallbackContext):
+async def broadcast_message(update: Update, context: CallbackContext):
     if not update.message.reply_to_message:
-        update.message.reply_text("❌ Please reply to a message with /broad to broadcast it")
+        await update.message.reply_text("❌ Please reply to a message with /broad to broadcast it")
         return
 
     message_to_broadcast = update.message.reply_to_message
@@ -2504,29 +4204,27 @@ def broadcast_message(update: Update, context: CallbackContext):
     total_sent = 0
     total_failed = 0
 
-    update.message.reply_text("📤 Starting broadcast...")
+    await update.message.reply_text("📤 Starting broadcast...")
 
     try:
-        with db_connection('verified_users.db') as conn:
-            users = conn.execute('SELECT user_id FROM verified_users').fetchall()
-        
+        users = await run_db(get_verified_users)
+
         total_users = len(users)
 
-        send_broadcast_start_log(context, admin, message_to_broadcast, total_users)
+        await send_broadcast_start_log(context, admin, message_to_broadcast, total_users)
 
         for user in users:
             user_id = user['user_id']
             try:
-                context.bot.copy_message(
-                    chat_id=user_id,
-                    from_chat_id=message_to_broadcast.chat.id,
-                    message_id=message_to_broadcast.message_id
-                )
+                with api_priority(PRIORITY_BULK):
+                    await context.bot.copy_message(
+                        chat_id=user_id,
+                        from_chat_id=message_to_broadcast.chat.id,
+                        message_id=message_to_broadcast.message_id
+                    )
 
                 total_sent += 1
 
-                time.sleep(0.1)
-
             except telegram.error.BadRequest as e:
                 error_msg = str(e).lower()
                 if "chat not found" in error_msg:
@@ -2540,9 +4238,9 @@ def broadcast_message(update: Update, context: CallbackContext):
                 debug_log(f"Error sending to user {user_id}: {str(e)}")
                 total_failed += 1
 
-        send_broadcast_completion_log(context, admin, total_sent, total_failed, total_users)
+        await send_broadcast_completion_log(context, admin, total_sent, total_failed, total_users)
 
-        update.message.reply_text(
+        await update.message.reply_text(
             f"📊 Broadcast Complete!\n\n"
             f"✅ Successfully sent to: {total_sent} users\n"
             f"❌ Failed to send to: {total_failed} users\n"
@@ -2552,7 +4250,7 @@ def broadcast_message(update: Update, context: CallbackContext):
 
     except Exception as e:
         debug_log(f"Broadcast error: {str(e)}")
-        update.message.reply_text("❌ Error during broadcast. Check logs.")
+        await update.message.reply_text("❌ Error during broadcast. Check logs.")
 
 def detect_all_formatting(message):
     text = message.text or message.caption or ""
@@ -2603,7 +4301,8 @@ def get_detailed_content_preview(message, max_length=200):
     else:
         return content
 
-def send_broadcast_start_log(context, admin, message, total_users):
+@with_api_priority(PRIORITY_LOG)
+async def send_broadcast_start_log(context, admin, message, total_users):
     try:
         if not LOGS_CHANNEL_ID:
             return
@@ -2654,7 +4353,7 @@ def send_broadcast_start_log(context, admin, message, total_users):
             f"<i>🚀 Broadcast in progress...</i>"
         )
         
-        context.bot.send_message(
+        await context.bot.send_message(
             chat_id=LOGS_CHANNEL_ID,
             text=log_message,
             parse_mode='HTML'
@@ -2663,7 +4362,8 @@ def send_broadcast_start_log(context, admin, message, total_users):
     except Exception as e:
         debug_log(f"Error sending broadcast start log: {str(e)}")
 
-def send_broadcast_completion_log(context, admin, sent, failed, total_users):
+@with_api_priority(PRIORITY_LOG)
+async def send_broadcast_completion_log(context, admin, sent, failed, total_users):
     try:
         if not LOGS_CHANNEL_ID:
             return
@@ -2681,7 +4381,7 @@ def send_broadcast_completion_log(context, admin, sent, failed, total_users):
             f"<i>🎯 Broadcast finished</i>"
         )
         
-        context.bot.send_message(
+        await context.bot.send_message(
             chat_id=LOGS_CHANNEL_ID,
             text=log_message,
             parse_mode='HTML'
@@ -2794,9 +4494,9 @@ def get_submission_progress(context, for_tm=False):
 
 @verified_only
 @check_system_status("submissions_open")
-def start_add(update: Update, context: CallbackContext):
+async def start_add(update: Update, context: CallbackContext):
     if update.message.chat.type != "private":
-        update.message.reply_text("❌ Please DM me to add items!")
+        await update.message.reply_text("❌ Please DM me to add items!")
         return ConversationHandler.END
 
     context.user_data.clear()
@@ -2818,16 +4518,16 @@ def start_add(update: Update, context: CallbackContext):
         "Choose the category for your item:"
     )
     
-    update.message.reply_text(
+    await update.message.reply_text(
         message,
         reply_markup=InlineKeyboardMarkup(keyboard),
         parse_mode='HTML'
     )
     return SELECT_CATEGORY
 
-def handle_category(update: Update, context: CallbackContext):
+async def handle_category(update: Update, context: CallbackContext):
     query = update.callback_query
-    query.answer()
+    await query.answer()
     category = query.data.split("_")[1]
     context.user_data['category'] = category
 
@@ -2842,7 +4542,7 @@ def handle_category(update: Update, context: CallbackContext):
             "(This should include all TM information)"
         )
         
-        query.edit_message_text(
+        await query.edit_message_text(
             message,
             parse_mode='HTML'
         )
@@ -2857,7 +4557,7 @@ def handle_category(update: Update, context: CallbackContext):
             "🔤 Please enter the Pokémon's name:"
         )
         
-        query.edit_message_text(
+        await query.edit_message_text(
             message,
             parse_mode='HTML'
         )
@@ -2869,7 +4569,7 @@ def is_tm_message(message: Message) -> bool:
     text = message.text or message.caption or ""
     return any(indicator in text for indicator in ['💿', 'TM:', 'Technical Machine'])
 
-def handle_tm_details(update: Update, context: CallbackContext):
+async def handle_tm_details(update: Update, context: CallbackContext):
     try:
         if not update.message or not update.message.forward_from:
             progress_bar, completed, total = get_submission_progress(context, for_tm=True)
@@ -2881,7 +4581,7 @@ def handle_tm_details(update: Update, context: CallbackContext):
                 "❌ Please forward the original message from @HexaMonBot"
             )
             
-            update.message.reply_text(message, parse_mode='HTML')
+            await update.message.reply_text(message, parse_mode='HTML')
             return GET_TM_DETAILS
 
         if update.message.forward_from.username.lower() != "hexamonbot":
@@ -2894,7 +4594,7 @@ def handle_tm_details(update: Update, context: CallbackContext):
                 "❌ Please forward directly from @HexaMonBot"
             )
             
-            update.message.reply_text(message, parse_mode='HTML')
+            await update.message.reply_text(message, parse_mode='HTML')
             return GET_TM_DETAILS
 
         tm_text = update.message.text or update.message.caption or ""
@@ -2908,7 +4608,7 @@ def handle_tm_details(update: Update, context: CallbackContext):
                 "❌ No TM details found in the message"
             )
             
-            update.message.reply_text(message, parse_mode='HTML')
+            await update.message.reply_text(message, parse_mode='HTML')
             return GET_TM_DETAILS
 
         context.user_data['tm_details'] = {'text': tm_text}
@@ -2922,15 +4622,15 @@ def handle_tm_details(update: Update, context: CallbackContext):
             "💰 Please enter the base price for this TM"
         )
         
-        update.message.reply_text(message, parse_mode='HTML')
+        await update.message.reply_text(message, parse_mode='HTML')
         return GET_BASE_PRICE
 
     except Exception as e:
         debug_log(f"Error in handle_tm_details: {str(e)}")
-        update.message.reply_text("❌ Failed to process TM details. Please try /add again.")
+        await update.message.reply_text("❌ Failed to process TM details. Please try /add again.")
         return ConversationHandler.END
 
-def handle_pokemon_name(update: Update, context: CallbackContext):
+async def handle_pokemon_name(update: Update, context: CallbackContext):
     pokemon_name = update.message.text.strip()
     if not pokemon_name or len(pokemon_name) > 30:
         progress_bar, completed, total = get_submission_progress(context)
@@ -2942,12 +4642,12 @@ def handle_pokemon_name(update: Update, context: CallbackContext):
             "❌ Invalid name! Please enter a valid Pokémon name (max 30 chars)"
         )
         
-        update.message.reply_text(message, parse_mode='HTML')
+        await update.message.reply_text(message, parse_mode='HTML')
         return GET_POKEMON_NAME
 
     context.user_data['pokemon_name'] = pokemon_name
     context.user_data['seller_id'] = update.effective_user.id
-    save_temp_data(update.effective_user.id, context.user_data)
+    await run_db(save_temp_data, update.effective_user.id, context.user_data)
     
     progress_bar, completed, total = get_submission_progress(context)
     
@@ -2958,10 +4658,10 @@ def handle_pokemon_name(update: Update, context: CallbackContext):
         f"🌿 Now forward {pokemon_name}'s Nature page from @HexaMonBot"
     )
     
-    update.message.reply_text(message, parse_mode='HTML')
+    await update.message.reply_text(message, parse_mode='HTML')
     return GET_NATURE
 
-def handle_nature(update: Update, context: CallbackContext):
+async def handle_nature(update: Update, context: CallbackContext):
     if not is_forwarded_from_hexamon(update):
         progress_bar, completed, total = get_submission_progress(context)
         
@@ -2972,7 +4672,7 @@ def handle_nature(update: Update, context: CallbackContext):
             "❌ Please forward directly from @HexaMonBot!"
         )
         
-        update.message.reply_text(message, parse_mode='HTML')
+        await update.message.reply_text(message, parse_mode='HTML')
         return GET_NATURE
 
     try:
@@ -2980,7 +4680,7 @@ def handle_nature(update: Update, context: CallbackContext):
             'photo': update.message.photo[-1].file_id,
             'text': update.message.caption or "Nature details not available"
         }
-        save_temp_data(update.effective_user.id, context.user_data)
+        await run_db(save_temp_data, update.effective_user.id, context.user_data)
         
         progress_bar, completed, total = get_submission_progress(context)
         
@@ -2991,14 +4691,14 @@ def handle_nature(update: Update, context: CallbackContext):
             "📊 Now forward IVs/EVs page from @HexaMonBot"
         )
         
-        update.message.reply_text(message, parse_mode='HTML')
+        await update.message.reply_text(message, parse_mode='HTML')
         return GET_IVS
     except Exception as e:
         debug_log(f"Nature handling failed: {str(e)}")
-        update.message.reply_text("❌ Error saving nature data. Please restart with /add")
+        await update.message.reply_text("❌ Error saving nature data. Please restart with /add")
         return ConversationHandler.END
     
-def handle_ivs(update: Update, context: CallbackContext):
+async def handle_ivs(update: Update, context: CallbackContext):
     if not is_forwarded_from_hexamon(update):
         progress_bar, completed, total = get_submission_progress(context)
         
@@ -3010,7 +4710,7 @@ def handle_ivs(update: Update, context: CallbackContext):
             "Please forward the original message directly from @HexaMonBot"
         )
         
-        update.message.reply_text(message, parse_mode='HTML')
+        await update.message.reply_text(message, parse_mode='HTML')
         return GET_IVS
 
     if not update.message.photo:
@@ -3023,14 +4723,14 @@ def handle_ivs(update: Update, context: CallbackContext):
             "❌ No IV/EV photo detected!"
         )
         
-        update.message.reply_text(message, parse_mode='HTML')
+        await update.message.reply_text(message, parse_mode='HTML')
         return GET_IVS
 
     context.user_data['ivs'] = {
         'photo': update.message.photo[-1].file_id,
         'text': update.message.caption or "No IV/EV details provided"
     }
-    save_temp_data(update.effective_user.id, context.user_data)
+    await run_db(save_temp_data, update.effective_user.id, context.user_data)
     
     progress_bar, completed, total = get_submission_progress(context)
     
@@ -3041,10 +4741,10 @@ def handle_ivs(update: Update, context: CallbackContext):
         "⚔️ Now forward the Moveset page from @HexaMonBot"
     )
     
-    update.message.reply_text(message, parse_mode='HTML')
+    await update.message.reply_text(message, parse_mode='HTML')
     return GET_MOVESET
 
-def handle_moveset(update: Update, context: CallbackContext):
+async def handle_moveset(update: Update, context: CallbackContext):
     if not is_forwarded_from_hexamon(update):
         progress_bar, completed, total = get_submission_progress(context)
         
@@ -3058,7 +4758,7 @@ def handle_moveset(update: Update, context: CallbackContext):
             "3. Forward it here"
         )
         
-        update.message.reply_text(message, parse_mode='HTML')
+        await update.message.reply_text(message, parse_mode='HTML')
         return GET_MOVESET
 
     if not update.message.photo:
@@ -3071,14 +4771,14 @@ def handle_moveset(update: Update, context: CallbackContext):
             "❌ Where's the moveset photo?"
         )
         
-        update.message.reply_text(message, parse_mode='HTML')
+        await update.message.reply_text(message, parse_mode='HTML')
         return GET_MOVESET
 
     context.user_data['moveset'] = {
         'photo': update.message.photo[-1].file_id,
         'text': update.message.caption or "No moveset details provided"
     }
-    save_temp_data(update.effective_user.id, context.user_data)
+    await run_db(save_temp_data, update.effective_user.id, context.user_data)
     
     progress_bar, completed, total = get_submission_progress(context)
     
@@ -3089,26 +4789,26 @@ def handle_moveset(update: Update, context: CallbackContext):
         "Is the Pokemon Boosted? If yes then specify."
     )
     
-    update.message.reply_text(message, parse_mode='HTML')
+    await update.message.reply_text(message, parse_mode='HTML')
     return GET_BOOST_INFO
 
-def handle_boosted(update: Update, context: CallbackContext):
+async def handle_boosted(update: Update, context: CallbackContext):
     query = update.callback_query
-    query.answer()
+    await query.answer()
     boosted_status = query.data.split("_")[1]
     context.user_data['boosted'] = boosted_status
-    save_temp_data(query.from_user.id, context.user_data)
+    await run_db(save_temp_data, query.from_user.id, context.user_data)
 
     if boosted_status == 'yes':
-        query.edit_message_text("🔮 Please specify the boosted stat(s)")
+        await query.edit_message_text("🔮 Please specify the boosted stat(s)")
         return GET_BOOST_DETAILS
     else:
         context.user_data['boost_details'] = 'Unboosted'
-        save_temp_data(query.from_user.id, context.user_data)
-        query.edit_message_text("💰 Now enter the base price:")
+        await run_db(save_temp_data, query.from_user.id, context.user_data)
+        await query.edit_message_text("💰 Now enter the base price:")
         return GET_BASE_PRICE
 
-def handle_boost_info(update: Update, context: CallbackContext):
+async def handle_boost_info(update: Update, context: CallbackContext):
     boost_info = update.message.text.strip()
 
     if not boost_info or len(boost_info) > 100:
@@ -3121,11 +4821,11 @@ def handle_boost_info(update: Update, context: CallbackContext):
             "❌ Please provide valid boost information (max 100 characters)"
         )
         
-        update.message.reply_text(message, parse_mode='HTML')
+        await update.message.reply_text(message, parse_mode='HTML')
         return GET_BOOST_INFO
 
     context.user_data['boost_info'] = boost_info
-    save_temp_data(update.effective_user.id, context.user_data)
+    await run_db(save_temp_data, update.effective_user.id, context.user_data)
     
     progress_bar, completed, total = get_submission_progress(context)
     
@@ -3136,23 +4836,23 @@ def handle_boost_info(update: Update, context: CallbackContext):
         "💰 Now enter the base price:"
     )
     
-    update.message.reply_text(message, parse_mode='HTML')
+    await update.message.reply_text(message, parse_mode='HTML')
     return GET_BASE_PRICE
 
-def handle_base_price(update: Update, context: CallbackContext):
+async def handle_base_price(update: Update, context: CallbackContext):
     if not context.user_data:
-        update.message.reply_text("❌ Session expired. Please start over with /add")
+        await update.message.reply_text("❌ Session expired. Please start over with /add")
         return ConversationHandler.END
 
     user = update.effective_user
-    update_user_profile(user.id, user.username, user.first_name)
+    await run_db(update_user_profile, user.id, user.username, user.first_name)
 
     if context.user_data.get('category') == 'tms':
-        return handle_tm_price(update, context)
+        return await handle_tm_price(update, context)
     else:
-        return handle_pokemon_price(update, context)
+        return await handle_pokemon_price(update, context)
 
-def handle_tm_price(update: Update, context: CallbackContext):
+async def handle_tm_price(update: Update, context: CallbackContext):
     try:
         base_price = extract_base_price(update.message.text)
 
@@ -3166,7 +4866,7 @@ def handle_tm_price(update: Update, context: CallbackContext):
                 "❌ Please enter a valid price (e.g., '0', '5000' or 'Base: 5k')"
             )
             
-            update.message.reply_text(message, parse_mode='HTML')
+            await update.message.reply_text(message, parse_mode='HTML')
             return GET_BASE_PRICE
         
         progress_bar = "☑--☑--☑"  # All TM steps completed
@@ -3174,15 +4874,14 @@ def handle_tm_price(update: Update, context: CallbackContext):
         gif_url = "https://cdn.dribbble.com/userupload/21186314/file/original-b7b2a05537ad7bc140eae28e73aecdfd.gif"
 
         # Send initial GIF with first star
-        gif_message = update.message.reply_animation(
+        gif_message = await update.message.reply_animation(
             animation=gif_url,
             caption="★ Finalizing your submission..."
         )
 
-        import time
-        time.sleep(1)
+        await asyncio.sleep(1)
         try:
-            context.bot.edit_message_caption(
+            await context.bot.edit_message_caption(
                 chat_id=update.message.chat_id,
                 message_id=gif_message.message_id,
                 caption="★★ Finalizing your submission..."
@@ -3190,10 +4889,9 @@ def handle_tm_price(update: Update, context: CallbackContext):
         except:
             pass
 
-        import time
-        time.sleep(1)
+        await asyncio.sleep(1)
         try:
-            context.bot.edit_message_caption(
+            await context.bot.edit_message_caption(
                 chat_id=update.message.chat_id,
                 message_id=gif_message.message_id,
                 caption="★★★ Finalizing your submission..."
@@ -3201,10 +4899,9 @@ def handle_tm_price(update: Update, context: CallbackContext):
         except:
             pass
 
-        import time
-        time.sleep(1)
+        await asyncio.sleep(1)
         try:
-            context.bot.edit_message_caption(
+            await context.bot.edit_message_caption(
                 chat_id=update.message.chat_id,
                 message_id=gif_message.message_id,
                 caption="☆ ☆ ☆ Submission Complete!"
@@ -3213,10 +4910,10 @@ def handle_tm_price(update: Update, context: CallbackContext):
             pass
 
         # Wait for 2 seconds on final state
-        time.sleep(2)
+        await asyncio.sleep(2)
         
         # Delete the GIF message and show completion
-        context.bot.delete_message(
+        await context.bot.delete_message(
             chat_id=update.message.chat_id,
             message_id=gif_message.message_id
         )
@@ -3228,7 +4925,7 @@ def handle_tm_price(update: Update, context: CallbackContext):
             "✅ All steps completed!\n\n"
         )
         
-        update.message.reply_text(completion_message, parse_mode='HTML')
+        await update.message.reply_text(completion_message, parse_mode='HTML')
 
 
         seller_username = update.effective_user.username
@@ -3247,43 +4944,45 @@ def handle_tm_price(update: Update, context: CallbackContext):
             'seller_id': seller_id
         })
 
+        context.user_data['parsed'] = CAPTION_PARSER.parse(context.user_data)
         caption = format_tm_auction_item(context.user_data)
 
-        submission_id = save_submission(update.effective_user.id, context.user_data)
+        submission_id = await run_db(save_submission, update.effective_user.id, context.user_data)
 
-        update_submission_stats(update.effective_user.id, 'pending', is_new_submission=True)
+        await run_db(update_submission_stats, update.effective_user.id, 'pending', is_new_submission=True)
 
-        for admin_id in ADMINS:
-            try:
-                context.bot.send_message(
-                    chat_id=admin_id,
-                    text=caption,
-                    parse_mode='HTML'
-                )
+        with api_priority(PRIORITY_NOTIFY):
+            for admin_id in ADMINS:
+                try:
+                    await context.bot.send_message(
+                        chat_id=admin_id,
+                        text=caption,
+                        parse_mode='HTML'
+                    )
 
-                context.bot.send_message(
-                    chat_id=admin_id,
-                    text="Verify this TM?",
-                    reply_markup=InlineKeyboardMarkup([
-                        [
-                            InlineKeyboardButton("✅ Approve", callback_data=f"verify_{submission_id}"),
-                            InlineKeyboardButton("❌ Reject", callback_data=f"reject_{submission_id}")
-                        ]
-                    ])
-                )
-            except Exception as e:
-                debug_log(f"Failed to alert admin {admin_id}: {str(e)}")
+                    await context.bot.send_message(
+                        chat_id=admin_id,
+                        text="Verify this TM?",
+                        reply_markup=InlineKeyboardMarkup([
+                            [
+                                InlineKeyboardButton("✅ Approve", callback_data=f"verify_{submission_id}"),
+                                InlineKeyboardButton("❌ Reject", callback_data=f"reject_{submission_id}")
+                            ]
+                        ])
+                    )
+                except Exception as e:
+                    debug_log(f"Failed to alert admin {admin_id}: {str(e)}")
 
-        update.message.reply_text("✅ TM submitted for approval!")
-        cleanup_temp_data(update.effective_user.id)
+        await update.message.reply_text("✅ TM submitted for approval!")
+        await run_db(cleanup_temp_data, update.effective_user.id)
         return ConversationHandler.END
 
     except Exception as e:
         debug_log(f"TM submission failed: {str(e)}")
-        update.message.reply_text("❌ Submission error. Please try /add again.")
+        await update.message.reply_text("❌ Submission error. Please try /add again.")
         return ConversationHandler.END
 
-def handle_pokemon_price(update: Update, context: CallbackContext):
+async def handle_pokemon_price(update: Update, context: CallbackContext):
     try:
         base_price = extract_base_price(update.message.text)
 
@@ -3297,7 +4996,7 @@ def handle_pokemon_price(update: Update, context: CallbackContext):
                 "❌ Please enter a valid price (e.g., '0', '5000' or 'Base: 5k')"
             )
             
-            update.message.reply_text(message, parse_mode='HTML')
+            await update.message.reply_text(message, parse_mode='HTML')
             return GET_BASE_PRICE
         
 
@@ -3307,17 +5006,16 @@ def handle_pokemon_price(update: Update, context: CallbackContext):
         # Show completion progress
         progress_bar = "☑--☑--☑--☑--☑--☑--☑"  # All steps completed
         
-        gif_message = update.message.reply_animation(
+        gif_message = await update.message.reply_animation(
             animation=gif_url,
             caption="Finalizing your submission..."
         )
         
         # Wait for 5 seconds
-        import time
-        time.sleep(5)
+        await asyncio.sleep(5)
         
         # Delete the GIF message and show completion
-        context.bot.delete_message(
+        await context.bot.delete_message(
             chat_id=update.message.chat_id,
             message_id=gif_message.message_id
         )
@@ -3329,11 +5027,11 @@ def handle_pokemon_price(update: Update, context: CallbackContext):
             "✅ All steps completed!\n\n"
         )
         
-        update.message.reply_text(completion_message, parse_mode='HTML')
+        await update.message.reply_text(completion_message, parse_mode='HTML')
 
         user_data = context.user_data
         if not user_data:
-            update.message.reply_text("❌ Session expired. Please start over with /add")
+            await update.message.reply_text("❌ Session expired. Please start over with /add")
             return ConversationHandler.END
 
         required_fields = {
@@ -3346,7 +5044,7 @@ def handle_pokemon_price(update: Update, context: CallbackContext):
 
         missing = [name for field, name in required_fields.items() if field not in user_data]
         if missing:
-            update.message.reply_text(
+            await update.message.reply_text(
                 f"❌ Missing data: {', '.join(missing)}\n"
                 "Please restart with /add"
             )
@@ -3356,49 +5054,30 @@ def handle_pokemon_price(update: Update, context: CallbackContext):
         user_data['seller_username'] = update.effective_user.username
         user_data['seller_first_name'] = update.effective_user.first_name
 
+        user_data['parsed'] = CAPTION_PARSER.parse(user_data)
         caption = format_pokemon_auction_item(user_data)
 
-        submission_id = save_submission(
+        submission_id = await run_db(
+            save_submission,
             update.effective_user.id,
             user_data
         )
 
-        update_submission_stats(update.effective_user.id, 'pending', is_new_submission=True)
+        await run_db(update_submission_stats, update.effective_user.id, 'pending', is_new_submission=True)
 
         admin_notification_sent = False
 
-        for admin_id in ADMINS:
-            try:
-                context.bot.send_photo(
-                    chat_id=admin_id,
-                    photo=user_data['nature']['photo'],
-                    caption=caption,
-                    parse_mode='HTML'
-                )
-
-                context.bot.send_message(
-                    chat_id=admin_id,
-                    text="Verify this submission?",
-                    reply_markup=InlineKeyboardMarkup([
-                        [
-                            InlineKeyboardButton("✅ Approve", callback_data=f"verify_{submission_id}"),
-                            InlineKeyboardButton("❌ Reject", callback_data=f"reject_{submission_id}")
-                        ]
-                    ])
-                )
-
-                admin_notification_sent = True
-                debug_log(f"Successfully sent submission {submission_id} to admin {admin_id}")
-
-            except Exception as e:
-                debug_log(f"Failed to send to admin {admin_id}: {str(e)}")
+        with api_priority(PRIORITY_NOTIFY):
+            for admin_id in ADMINS:
                 try:
-                    context.bot.send_message(
+                    await context.bot.send_photo(
                         chat_id=admin_id,
-                        text=caption,
+                        photo=user_data['nature']['photo'],
+                        caption=caption,
                         parse_mode='HTML'
                     )
-                    context.bot.send_message(
+
+                    await context.bot.send_message(
                         chat_id=admin_id,
                         text="Verify this submission?",
                         reply_markup=InlineKeyboardMarkup([
@@ -3408,41 +5087,67 @@ def handle_pokemon_price(update: Update, context: CallbackContext):
                             ]
                         ])
                     )
+
                     admin_notification_sent = True
-                    debug_log(f"Sent text-only submission {submission_id} to admin {admin_id}")
-                except Exception as inner_e:
-                    debug_log(f"Failed to send text-only to admin {admin_id}: {str(inner_e)}")
+                    debug_log(f"Successfully sent submission {submission_id} to admin {admin_id}")
+
+                except Exception as e:
+                    debug_log(f"Failed to send to admin {admin_id}: {str(e)}")
+                    try:
+                        await context.bot.send_message(
+                            chat_id=admin_id,
+                            text=caption,
+                            parse_mode='HTML'
+                        )
+                        await context.bot.send_message(
+                            chat_id=admin_id,
+                            text="Verify this submission?",
+                            reply_markup=InlineKeyboardMarkup([
+                                [
+                                    InlineKeyboardButton("✅ Approve", callback_data=f"verify_{submission_id}"),
+                                    InlineKeyboardButton("❌ Reject", callback_data=f"reject_{submission_id}")
+                                ]
+                            ])
+                        )
+                        admin_notification_sent = True
+                        debug_log(f"Sent text-only submission {submission_id} to admin {admin_id}")
+                    except Exception as inner_e:
+                        debug_log(f"Failed to send text-only to admin {admin_id}: {str(inner_e)}")
 
         if not admin_notification_sent:
             debug_log(f"WARNING: Submission {submission_id} was not sent to any admin!")
-            update.message.reply_text("❌ Could not send submission to admins. Please try again.")
+            await update.message.reply_text("❌ Could not send submission to admins. Please try again.")
             return ConversationHandler.END
 
-        update.message.reply_text("✅ Submission sent to admins for verification!")
-        cleanup_temp_data(update.effective_user.id)
+        await update.message.reply_text("✅ Submission sent to admins for verification!")
+        await run_db(cleanup_temp_data, update.effective_user.id)
         return ConversationHandler.END
 
     except Exception as e:
         debug_log(f"Error in handle_pokemon_price: {str(e)}")
-        update.message.reply_text("❌ An error occurred. Please try again.")
+        await update.message.reply_text("❌ An error occurred. Please try again.")
         return ConversationHandler.END
 
-def handle_verification(update: Update, context: CallbackContext):
+async def handle_verification(update: Update, context: CallbackContext):
     query = update.callback_query
-    query.answer()
+    await query.answer()
     action, submission_id = query.data.split('_')
     submission_id = int(submission_id)
 
     admin_id = query.from_user.id
     admin_name = query.from_user.username or query.from_user.first_name
 
-    submission = get_submission(submission_id)
+    submission = await run_db(get_submission, submission_id)
     if not submission:
-        query.edit_message_text("❌ Submission not found in database!")
+        await query.edit_message_text("❌ Submission not found in database!")
         return
 
-    if submission['status'] != 'pending':
-        query.edit_message_text(f"⚠️ This submission was already {submission['status']}!")
+    if submission['status'] == 'failed':
+        # an approval that failed (Telegram or the database erred mid-way) can be retried or rejected;
+        # whichever admin's claim below wins takes it from here
+        await run_db(transition_submission, submission_id, 'failed', 'pending')
+    elif submission['status'] != 'pending':
+        await query.edit_message_text(f"⚠️ This submission was already {submission['status']}!")
         return
 
     # Handle rejection - SIMPLIFIED APPROACH
@@ -3461,7 +5166,8 @@ def handle_verification(update: Update, context: CallbackContext):
             'user_id': submission['user_id'],
             'item_name': item_name,
             'original_chat_id': query.message.chat.id,
-            'original_message_id': query.message.message_id
+            'original_message_id': query.message.message_id,
+            'created_at': time.time()
         }
         
         debug_log(f"✅ Rejection context stored for submission #{submission_id} by admin {admin_id}")
@@ -3475,7 +5181,7 @@ def handle_verification(update: Update, context: CallbackContext):
             f"<i>Type your reason now...</i>"
         )
         
-        query.edit_message_text(
+        await query.edit_message_text(
             rejection_prompt,
             parse_mode='HTML',
             reply_markup=InlineKeyboardMarkup([
@@ -3484,121 +5190,130 @@ def handle_verification(update: Update, context: CallbackContext):
         )
         return
 
-    # Handle approval (existing code)
+    # Handle approval: claim the submission first, so a second admin clicking at
+    # the same moment stops here instead of creating and posting a second auction
+    if not await run_db(transition_submission, submission_id, 'pending', 'processing'):
+        current = await run_db(get_submission, submission_id)
+        status = current['status'] if current else 'removed'
+        await query.edit_message_text(f"⚠️ This submission was already {status}!")
+        return
+
     try:
         submission_data = submission['data']
         if isinstance(submission_data, str):
             submission_data = json.loads(submission_data)
 
-        with db_connection() as conn:
-            status = 'processing' if action == 'verify' else 'rejected'
-            conn.execute("UPDATE submissions SET status=? WHERE submission_id=?",
-                        (status, submission_id))
-            conn.commit()
+        try:
+            if submission_data.get('category') != 'tms':
+                seller_username = submission_data.get('seller_username', 'Unknown')
+                seller_first_name = submission_data.get('seller_first_name', 'User')
+
+                if seller_username and seller_username != 'Unknown':
+                    submission_data['seller_username'] = seller_username.replace('\\', '')
+                if seller_first_name:
+                    submission_data['seller_first_name'] = seller_first_name.replace('\\', '')
+
+            temp_item_text = "Item #PLACEHOLDER - Creating auction..."
+            item_name, item_category = get_item_summary(submission_data)
+
+            if submission_data.get('category') == 'tms':
+                new_auction_id = await run_db(
+                    save_auction,
+                    item_text=temp_item_text,
+                    photo_id=None,
+                    base_price=submission_data['base_price'],
+                    seller_id=submission['user_id'],
+                    seller_name=submission_data.get('seller_username', submission_data.get('seller_first_name', 'Unknown')),
+                    item_name=item_name,
+                    category=item_category,
+                    submission_id=submission_id
+                )
+            else:
+                new_auction_id = await run_db(
+                    save_auction,
+                    item_text=temp_item_text,
+                    photo_id=submission_data['nature']['photo'],
+                    base_price=submission_data['base_price'],
+                    seller_id=submission['user_id'],
+                    seller_name=submission_data.get('seller_username', submission_data.get('seller_first_name', 'Unknown')),
+                    item_name=item_name,
+                    category=item_category,
+                    submission_id=submission_id
+                )
 
-        if action == 'verify':
-            update_submission_stats(submission['user_id'], 'approved')
-        else:
-            update_submission_stats(submission['user_id'], 'rejected')
+            if not new_auction_id:
+                raise Exception("Failed to save auction")
 
-        if action == 'verify':
-            try:
-                if submission_data.get('category') != 'tms':
-                    seller_username = submission_data.get('seller_username', 'Unknown')
-                    seller_first_name = submission_data.get('seller_first_name', 'User')
-
-                    if seller_username and seller_username != 'Unknown':
-                        submission_data['seller_username'] = seller_username.replace('\\', '')
-                    if seller_first_name:
-                        submission_data['seller_first_name'] = seller_first_name.replace('\\', '')
-
-                temp_item_text = "Item #PLACEHOLDER - Creating auction..."
-
-                if submission_data.get('category') == 'tms':
-                    new_auction_id = save_auction(
-                        item_text=temp_item_text,
-                        photo_id=None,
-                        base_price=submission_data['base_price'],
-                        seller_id=submission['user_id'],
-                        seller_name=submission_data.get('seller_username', submission_data.get('seller_first_name', 'Unknown'))
-                    )
-                else:
-                    new_auction_id = save_auction(
-                        item_text=temp_item_text,
-                        photo_id=submission_data['nature']['photo'],
-                        base_price=submission_data['base_price'],
-                        seller_id=submission['user_id'],
-                        seller_name=submission_data.get('seller_username', submission_data.get('seller_first_name', 'Unknown'))
-                    )
+            if submission_data.get('category') == 'tms':
+                item_text = format_tm_auction_item(submission_data, new_auction_id)
+            else:
+                item_text = format_pokemon_auction_item(submission_data, new_auction_id)
 
-                if not new_auction_id:
-                    raise Exception("Failed to save auction")
+            await run_db(DB_WRITER.execute,
+                         '''UPDATE auctions SET item_text=?, state_version=state_version + 1 WHERE auction_id=?''',
+                         (item_text, new_auction_id))
 
-                if submission_data.get('category') == 'tms':
-                    item_text = format_tm_auction_item(submission_data, new_auction_id)
-                else:
-                    item_text = format_pokemon_auction_item(submission_data, new_auction_id)
+            bot_username = context.bot.username
+            deep_link = f"https://t.me/{bot_username}?start=bid_{new_auction_id}"
 
-                with db_connection() as conn:
-                    conn.execute('''UPDATE auctions SET item_text=? WHERE auction_id=?''',
-                               (item_text, new_auction_id))
-                    conn.commit()
+            keyboard = [
+                [
+                    InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_{new_auction_id}"),
+                    InlineKeyboardButton("💰 Place Bid", url=deep_link)
+                ]
+            ]
 
-                bot_username = context.bot.username
-                deep_link = f"https://t.me/{bot_username}?start=bid_{new_auction_id}"
+            if submission_data.get('category') == 'tms':
+                message = await context.bot.send_message(
+                    chat_id=CHANNEL_ID,
+                    text=item_text,
+                    reply_markup=InlineKeyboardMarkup(keyboard),
+                    parse_mode='HTML'
+                )
+            else:
+                message = await context.bot.send_photo(
+                    chat_id=CHANNEL_ID,
+                    photo=submission_data['nature']['photo'],
+                    caption=item_text,
+                    reply_markup=InlineKeyboardMarkup(keyboard),
+                    parse_mode='HTML'
+                )
+            await run_db(record_submission_post, submission_id, message.message_id)
 
-                keyboard = [
-                    [
-                        InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_{new_auction_id}"),
-                        InlineKeyboardButton("💰 Place Bid", url=deep_link)
-                    ]
-                ]
+            ends_at = None
+            if AUCTION_DURATION_MINUTES > 0:
+                ends_at = await run_db(next_close_slot, time.time() + AUCTION_DURATION_MINUTES * 60)
 
-                if submission_data.get('category') == 'tms':
-                    message = context.bot.send_message(
-                        chat_id=CHANNEL_ID,
-                        text=item_text,
-                        reply_markup=InlineKeyboardMarkup(keyboard),
-                        parse_mode='HTML'
-                    )
-                else:
-                    message = context.bot.send_photo(
-                        chat_id=CHANNEL_ID,
-                        photo=submission_data['nature']['photo'],
-                        caption=item_text,
-                        reply_markup=InlineKeyboardMarkup(keyboard),
-                        parse_mode='HTML'
-                    )
+            if not await run_db(complete_approval, submission_id, new_auction_id, message.message_id, ends_at):
+                # our claim expired while the post went out and the submission was taken again;
+                # the other approval owns it now, so don't mark it failed either
+                try:
+                    await context.bot.delete_message(chat_id=CHANNEL_ID, message_id=message.message_id)
+                except Exception as e:
+                    debug_log(f"Could not delete orphaned post for auction {new_auction_id}: {str(e)}")
+                await query.edit_message_text("⚠️ This approval took too long and was handed to another admin.")
+                return
 
-                with db_connection() as conn:
-                    conn.execute('''UPDATE submissions SET
-                                  status='approved',
-                                  channel_message_id=?
-                                  WHERE submission_id=?''',
-                               (message.message_id, submission_id))
-                    conn.execute('''UPDATE auctions SET
-                                   channel_message_id=?
-                                   WHERE auction_id=?''',
-                                (message.message_id, new_auction_id))
-                    conn.commit()
-
-                context.bot.send_message(
-                    chat_id=submission['user_id'],
-                    text=f"🎉 Your item has been approved and listed! Item ID: #{new_auction_id}"
-                )
+            if ends_at:
+                schedule_auction_close(context.job_queue, new_auction_id, ends_at)
+            await run_db(update_submission_stats, submission['user_id'], 'approved')
 
-            except Exception as e:
-                debug_log(f"Error during auction creation: {str(e)}")
-                with db_connection() as conn:
-                    conn.execute("UPDATE submissions SET status='failed' WHERE submission_id=?",
-                               (submission_id,))
-                    conn.commit()
-                raise
+            await context.bot.send_message(
+                chat_id=submission['user_id'],
+                text=f"🎉 Your item has been approved and listed! Item ID: #{new_auction_id}"
+            )
 
-        result_text = f"{'✅ APPROVED' if action == 'verify' else '❌ REJECTED'} by @{admin_name}"
+        except Exception as e:
+            debug_log(f"Error during auction creation: {str(e)}")
+            orphan = await run_db(fail_approval, submission_id)
+            if orphan:
+                await delete_orphaned_posts(context.bot, [orphan])
+            raise
+
+        result_text = f"✅ APPROVED by @{admin_name}"
 
         try:
-            query.edit_message_text(
+            await query.edit_message_text(
                 text=result_text,
                 reply_markup=None  
             )
@@ -3606,13 +5321,12 @@ def handle_verification(update: Update, context: CallbackContext):
             debug_log(f"Could not update the clicked message: {str(e)}")
 
         # Notify other admins about the action
-        action_result = "approved" if action == "verify" else "rejected"
         for other_admin_id in ADMINS:
             if other_admin_id != admin_id:  
                 try:
-                    context.bot.send_message(
+                    await context.bot.send_message(
                         chat_id=other_admin_id,
-                        text=f"Submission #{submission_id} was {action_result} by @{admin_name}"
+                        text=f"Submission #{submission_id} was approved by @{admin_name}"
                     )
                 except Exception as e:
                     debug_log(f"Could not notify admin {other_admin_id}: {str(e)}")
@@ -3620,23 +5334,403 @@ def handle_verification(update: Update, context: CallbackContext):
     except Exception as e:
         debug_log(f"Verification failed: {str(e)}")
         try:
-            query.edit_message_text("❌ Processing failed. Check logs.")
+            await query.edit_message_text(
+                "❌ Processing failed. Check logs.",
+                reply_markup=InlineKeyboardMarkup([[
+                    InlineKeyboardButton("🔁 Retry Approval", callback_data=f"verify_{submission_id}"),
+                    InlineKeyboardButton("❌ Reject", callback_data=f"reject_{submission_id}")
+                ]])
+            )
         except:
             try:
-                context.bot.send_message(
+                await context.bot.send_message(
                     chat_id=admin_id,
                     text="❌ Processing failed. Check logs."
                 )
             except:
                 pass
 
-def handle_bid_amount(update: Update, context: CallbackContext):
+# Background sends started by publish_bid that haven't finished yet
+PENDING_PUBLISHES = set()
+# auction_id -> True once another bid landed while that auction's channel edit was in flight
+CHANNEL_EDITS_PENDING = {}
+PENDING_BID_LOGS = 0
+
+def spawn_publish_task(context, coroutine):
+    task = context.application.create_task(coroutine)
+    PENDING_PUBLISHES.add(task)
+    task.add_done_callback(PENDING_PUBLISHES.discard)
+    return task
+
+def publish_bid(context, outcome, bidder_id, bidder_name, amount):
+    """Fan an accepted bid out in the background: bid log, channel post and the outbid notification.
+
+    The channel and the logs channel share Telegram's 20 messages/minute group
+    budget, so none of this is awaited: the handler answers the bidder first,
+    calls this and returns, and never holds a worker while those buckets drain.
+    """
+    global PENDING_BID_LOGS
+    prev_bidder = outcome['prev_bidder']
+    updated_auction = outcome['auction']
+    auction_id = updated_auction['auction_id']
+    # a proxy bid may have answered this one in the same write; the price and leader it left are what counts
+    final_amount = outcome.get('final_amount', amount)
+
+    if PENDING_BID_LOGS < BID_LOG_MAX_BACKLOG:
+        PENDING_BID_LOGS += 1
+        spawn_publish_task(context, send_bid_logs(context, outcome, bidder_id, bidder_name, amount))
+    else:
+        debug_log(f"Bid log backlog full, not logging bid on #{auction_id}")
+
+    spawn_publish_task(context, refresh_channel_post(context, auction_id))
+
+    # one DM for whoever led before this bid, unless they are still (or again) on top
+    if prev_bidder and prev_bidder[0] not in (bidder_id, updated_auction.get('current_bidder_id')):
+        spawn_publish_task(context, send_outbid_notification(
+            context,
+            prev_bidder,
+            updated_auction['item_text'],
+            final_amount,
+            auction_id,
+            updated_auction.get('current_bidder')
+        ))
+
+async def send_bid_logs(context, outcome, bidder_id, bidder_name, amount):
+    """The bid log entry for an accepted bid, plus one for the proxy bid that answered it"""
+    global PENDING_BID_LOGS
+    prev_bidder = outcome['prev_bidder']
+    updated_auction = outcome['auction']
+    auction_id = updated_auction['auction_id']
+
+    try:
+        await send_bid_log(context, auction_id, bidder_id, bidder_name, amount, prev_bidder)
+        final_amount = outcome.get('final_amount', amount)
+        leader_id = updated_auction.get('current_bidder_id')
+        if outcome.get('proxy') and (leader_id != bidder_id or final_amount != amount):
+            await send_bid_log(context, auction_id, leader_id, updated_auction.get('current_bidder'),
+                               final_amount, {'amount': amount})
+    except Exception as e:
+        debug_log(f"Failed to send bid log: {str(e)}")
+    finally:
+        PENDING_BID_LOGS -= 1
+
+@with_api_priority(PRIORITY_CHANNEL)
+async def refresh_channel_post(context, auction_id):
+    """Bring an auction's channel post up to date, one edit in flight per auction.
+
+    Bids arriving while an edit waits on the channel budget only flag it, and
+    the running task edits once more with the newest state, so a bidding war
+    costs one queued edit rather than one per bid.
+    """
+    if auction_id in CHANNEL_EDITS_PENDING:
+        CHANNEL_EDITS_PENDING[auction_id] = True
+        return
+    CHANNEL_EDITS_PENDING[auction_id] = False
+    try:
+        while True:
+            auction = await run_db(get_auction, auction_id)
+            # a closed or removed auction's post is not ours to redraw any more
+            if (auction and auction.get('auction_status') == 'active'
+                    and CHANNEL_VERSIONS.get(auction_id) != (auction.get('state_version') or 0)):
+                await edit_channel_post(context, auction)
+            if not CHANNEL_EDITS_PENDING[auction_id]:
+                return
+            CHANNEL_EDITS_PENDING[auction_id] = False
+    finally:
+        CHANNEL_EDITS_PENDING.pop(auction_id, None)
+
+async def edit_channel_post(context, updated_auction):
+    """Redraw an auction's channel post from its current row; returns whether the edit went through"""
+    caption, plain_caption = render_auction(updated_auction)
+
+    bot_username = context.bot.username
+    deep_link = f"https://t.me/{bot_username}?start=bid_{updated_auction['auction_id']}"
+
+    keyboard = [[
+        InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_{updated_auction['auction_id']}"),
+        InlineKeyboardButton("💰 Place Bid", url=deep_link)
+    ]]
+
+    try:
+        if updated_auction.get('photo_id'):
+            await context.bot.edit_message_caption(
+                chat_id=CHANNEL_ID,
+                message_id=updated_auction['channel_message_id'],
+                caption=caption,
+                reply_markup=InlineKeyboardMarkup(keyboard),
+                parse_mode='HTML'
+            )
+        else:
+            await context.bot.edit_message_text(
+                chat_id=CHANNEL_ID,
+                message_id=updated_auction['channel_message_id'],
+                text=caption,
+                reply_markup=InlineKeyboardMarkup(keyboard),
+                parse_mode='HTML'
+            )
+        CHANNEL_VERSIONS[updated_auction['auction_id']] = updated_auction.get('state_version') or 0
+        return True
+    except Exception as e:
+        debug_log(f"Channel update failed: {str(e)}")
+        try:
+            if updated_auction.get('photo_id'):
+                await context.bot.edit_message_caption(
+                    chat_id=CHANNEL_ID,
+                    message_id=updated_auction['channel_message_id'],
+                    caption=plain_caption,
+                    reply_markup=InlineKeyboardMarkup(keyboard)
+                )
+            else:
+                await context.bot.edit_message_text(
+                    chat_id=CHANNEL_ID,
+                    message_id=updated_auction['channel_message_id'],
+                    text=plain_caption,
+                    reply_markup=InlineKeyboardMarkup(keyboard)
+                )
+            CHANNEL_VERSIONS[updated_auction['auction_id']] = updated_auction.get('state_version') or 0
+            return True
+        except Exception as fallback_error:
+            debug_log(f"Fallback update failed: {str(fallback_error)}")
+            return False
+
+def bid_result_text(amount, outcome):
+    """Reply for an accepted bid, calling out proxy overtakes and soft-close extensions"""
+    if outcome.get('outbid_by_proxy'):
+        text = (f"⚠️ Your bid of {format_bid_amount(amount)} was placed but was immediately outbid "
+                f"by a proxy bid. Current bid: {format_bid_amount(outcome['final_amount'])}")
+    else:
+        text = f"✅ Your bid of {format_bid_amount(amount)} has been placed!"
+    if outcome.get('extended_to'):
+        text += f"\n⏰ Late bid - this item now ends at {format_end_time(outcome['extended_to'])}"
+    return text
+
+def quick_bid_keyboard(auction):
+    """+min / +2×min buttons for an auction; each carries the price it was rendered for"""
+    current_amount = auction.get('current_bid') or auction.get('base_price', 0)
+    increment = get_min_increment(current_amount)
+    expected = int(current_amount)
+    return InlineKeyboardMarkup([[
+        InlineKeyboardButton(f"➕ {format_bid_amount(current_amount + increment)}",
+                             callback_data=f"qbid_{auction['auction_id']}_{expected}_1"),
+        InlineKeyboardButton(f"⏫ {format_bid_amount(current_amount + 2 * increment)}",
+                             callback_data=f"qbid_{auction['auction_id']}_{expected}_2")
+    ]])
+
+async def handle_quick_bid(update: Update, context: CallbackContext):
+    """Place a +min / +2×min bid straight from the button and answer with a toast"""
+    query = update.callback_query
+    user = update.effective_user
+
+    try:
+        _, auction_id, expected, steps = query.data.split('_')
+        auction_id, expected, steps = int(auction_id), int(expected), int(steps)
+    except ValueError:
+        debug_log(f"Invalid quick bid callback data: {query.data}")
+        await query.answer("❌ Invalid auction")
+        return
+
+    try:
+        if user.id not in ADMINS and not await run_db(check_verification_status, user.id):
+            await query.answer("🔒 You need to be verified to place bids.", show_alert=True)
+            return
+
+        if not await run_db(is_system_open, 'auctions_open'):
+            await query.answer("❌ Auctions are currently closed.", show_alert=True)
+            return
+
+        amount = expected + steps * get_min_increment(expected)
+        bidder_name = f"@{user.username}" if user.username else user.first_name
+
+        outcome = await BID_LANES.submit(auction_id, apply_bid, auction_id, user.id, bidder_name,
+                                         amount, expected, bid_idempotency_key(context, update, auction_id))
+
+        if outcome['status'] == 'duplicate':
+            await query.answer(f"✅ Your bid of {format_bid_amount(outcome['amount'])} was already placed.")
+            return
+
+        if outcome['status'] == 'missing':
+            await query.answer("❌ This auction no longer exists.", show_alert=True)
+            try:
+                await query.edit_message_reply_markup(reply_markup=None)
+            except Exception as e:
+                debug_log(f"Couldn't remove quick bid buttons: {str(e)}")
+            return
+
+        if outcome['status'] in ('stale', 'too_low'):
+            await query.answer(
+                f"⚠️ Price moved to {format_bid_amount(outcome['current_amount'])}. "
+                f"Minimum bid is now {format_bid_amount(outcome['min_bid'])}.",
+                show_alert=True
+            )
+            if outcome.get('auction'):
+                try:
+                    await query.edit_message_reply_markup(reply_markup=quick_bid_keyboard(outcome['auction']))
+                except Exception as e:
+                    debug_log(f"Couldn't refresh quick bid buttons: {str(e)}")
+            return
+
+        context.user_data.pop('bid_context', None)
+        await query.answer(bid_result_text(amount, outcome), show_alert=bool(outcome.get('outbid_by_proxy')))
+
+        if outcome['auction']:
+            try:
+                await query.edit_message_reply_markup(reply_markup=quick_bid_keyboard(outcome['auction']))
+            except Exception as e:
+                debug_log(f"Couldn't refresh quick bid buttons: {str(e)}")
+            publish_bid(context, outcome, user.id, bidder_name, amount)
+
+    except Exception as e:
+        debug_log(f"Error in handle_quick_bid: {str(e)}")
+        try:
+            await query.answer("❌ An error occurred. Please try again.")
+        except Exception:
+            pass
+
+MAX_BATCH_BIDS = 20
+
+def parse_bid_lines(text):
+    """Split a /bids message into ([(auction_id, amount)], [error lines])"""
+    bids, errors, seen = [], [], set()
+    for line in text.splitlines():
+        line = line.strip().lstrip('#')
+        if not line:
+            continue
+        parts = line.split(None, 1)
+        amount = parse_bid_amount(parts[1]) if len(parts) == 2 else None
+        if not parts[0].isdigit() or amount is None:
+            errors.append(f"❌ <code>{html.escape(line)}</code> - expected <code>ID amount</code>")
+            continue
+        auction_id = int(parts[0])
+        if auction_id in seen:
+            errors.append(f"❌ #{auction_id} - listed more than once")
+            continue
+        seen.add(auction_id)
+        bids.append((auction_id, amount))
+    return bids, errors
+
+@verified_only
+@check_system_status("auctions_open")
+async def handle_batch_bids(update: Update, context: CallbackContext):
+    """/bids: place bids on several auctions from one message, one "ID amount" per line"""
+    text = update.message.text.split(None, 1)
+    bids, errors = parse_bid_lines(text[1] if len(text) > 1 else "")
+
+    if not bids and not errors:
+        await update.message.reply_text(
+            "❌ Usage: /bids followed by one bid per line, e.g.\n\n"
+            "<code>/bids\n12 50k\n15 1.2m</code>",
+            parse_mode='HTML'
+        )
+        return
+
+    if len(bids) > MAX_BATCH_BIDS:
+        await update.message.reply_text(f"❌ At most {MAX_BATCH_BIDS} bids per message.")
+        return
+
+    user = update.effective_user
+    bidder_name = f"@{user.username}" if user.username else user.first_name
+    receipt = ["<b>🧾 Bid Receipt</b>", ""]
+
+    try:
+        results = await run_db(record_bids, user.id, bidder_name, bids, update_key_prefix(context, update)) if bids else []
+    except Exception as e:
+        debug_log(f"Error in /bids: {str(e)}")
+        await update.message.reply_text("❌ Error placing your bids. None were recorded, please try again.")
+        return
+
+    accepted = []
+    for auction_id, amount, outcome in results:
+        if outcome.get('outbid_by_proxy'):
+            receipt.append(f"⚠️ #{auction_id} - {format_bid_amount(amount)} placed, outbid by a proxy bid at "
+                           f"{format_bid_amount(outcome['final_amount'])}")
+            accepted.append((amount, outcome))
+        elif outcome['status'] == 'accepted':
+            receipt.append(f"✅ #{auction_id} - {format_bid_amount(amount)}")
+            accepted.append((amount, outcome))
+        elif outcome['status'] == 'duplicate':
+            receipt.append(f"✅ #{auction_id} - {format_bid_amount(amount)} (already placed)")
+        elif outcome['status'] == 'too_low':
+            receipt.append(f"❌ #{auction_id} - {format_bid_amount(amount)} is below the minimum "
+                           f"{format_bid_amount(outcome['min_bid'])}")
+        else:
+            receipt.append(f"❌ #{auction_id} - auction not found")
+    receipt.extend(errors)
+    placed = len(accepted) + sum(1 for _, _, outcome in results if outcome['status'] == 'duplicate')
+    receipt.extend(["", f"{placed}/{len(results) + len(errors)} bids placed"])
+
+    await update.message.reply_text("\n".join(receipt), parse_mode='HTML')
+
+    for amount, outcome in accepted:
+        if outcome.get('auction'):
+            publish_bid(context, outcome, user.id, bidder_name, amount)
+
+@verified_only
+@check_system_status("auctions_open")
+async def handle_max_bid(update: Update, context: CallbackContext):
+    """/maxbid <item_id> <amount|off>: let the bot bid for you up to a maximum"""
+    if len(context.args) != 2 or not context.args[0].lstrip('#').isdigit():
+        await update.message.reply_text(
+            "❌ Usage: /maxbid <item_id> <max amount>\n"
+            "Example: /maxbid 12 150k\n\n"
+            "The bot outbids others for you one increment at a time, up to your maximum.\n"
+            "Use /maxbid <item_id> off to cancel."
+        )
+        return
+
+    auction_id = int(context.args[0].lstrip('#'))
+    if context.args[1].lower() in ('off', 'cancel', '0'):
+        max_amount = None
+    else:
+        max_amount = parse_bid_amount(context.args[1])
+        if not max_amount:
+            await update.message.reply_text("❌ Please enter a valid maximum amount!")
+            return
+
+    user = update.effective_user
+    bidder_name = f"@{user.username}" if user.username else user.first_name
+
+    try:
+        outcome = await BID_LANES.submit(auction_id, apply_proxy_bid, auction_id, user.id, bidder_name, max_amount)
+    except Exception as e:
+        debug_log(f"Error in /maxbid: {str(e)}")
+        await update.message.reply_text("❌ Error setting your maximum bid. Please try again.")
+        return
+
+    status = outcome['status']
+    if status == 'missing':
+        await update.message.reply_text("❌ This auction no longer exists.")
+    elif status == 'proxy_cancelled':
+        await update.message.reply_text(f"🛑 Proxy bid on #{auction_id} cancelled.")
+    elif status == 'no_proxy':
+        await update.message.reply_text(f"ℹ️ You have no proxy bid on #{auction_id}.")
+    elif status == 'too_low':
+        await update.message.reply_text(
+            f"❌ Maximum must be at least {format_bid_amount(outcome['min_bid'])}\n"
+            f"Current bid: {format_bid_amount(outcome['current_amount'])}"
+        )
+    elif status == 'proxy_set':
+        await update.message.reply_text(
+            f"🤖 You're leading #{auction_id} at {format_bid_amount(outcome['current_amount'])}. "
+            f"The bot will bid for you up to {format_bid_amount(max_amount)}."
+        )
+    else:
+        if outcome.get('outbid_by_proxy'):
+            text = (f"⚠️ Another proxy bid on #{auction_id} is higher than your maximum of "
+                    f"{format_bid_amount(max_amount)}. Current bid: {format_bid_amount(outcome['final_amount'])}")
+        else:
+            text = (f"🤖 Proxy bid set on #{auction_id}: you're leading at "
+                    f"{format_bid_amount(outcome['final_amount'])}, up to {format_bid_amount(max_amount)}.")
+        await update.message.reply_text(text)
+        if outcome.get('auction'):
+            publish_bid(context, outcome, user.id, bidder_name, outcome['bid_amount'])
+
+async def handle_bid_amount(update: Update, context: CallbackContext):
     if 'bid_context' not in context.user_data:
         return
 
     user_id = update.effective_user.id
-    if user_id not in ADMINS and not check_verification_status(user_id):
-        update.message.reply_text(
+    if user_id not in ADMINS and not await run_db(check_verification_status, user_id):
+        await update.message.reply_text(
             "🔒 Verification Required\n\n"
             "Contact an admin for verification.\n"
         )
@@ -3644,11 +5738,10 @@ def handle_bid_amount(update: Update, context: CallbackContext):
         return
 
     try:
-        with db_connection() as conn:
-            auctions_open = conn.execute("SELECT auctions_open FROM system_status WHERE id=1").fetchone()[0]
-            
+        auctions_open = await run_db(is_system_open, 'auctions_open')
+
         if not auctions_open:
-            update.message.reply_text("❌ Auctions are currently closed. Bidding is not allowed.")
+            await update.message.reply_text("❌ Auctions are currently closed. Bidding is not allowed.")
             context.user_data.pop('bid_context', None)
             return
 
@@ -3656,38 +5749,47 @@ def handle_bid_amount(update: Update, context: CallbackContext):
         bid_amount = parse_bid_amount(bid_text)
 
         if bid_amount is None:
-            update.message.reply_text(
+            await update.message.reply_text(
                 "❌ Please enter a valid bid amount!"
             )
             return
 
         bid_context = context.user_data['bid_context']
+        auction_id = bid_context['auction_id']
+        bid_amount_int = int(bid_amount)
+        bidder_name = f"@{update.effective_user.username}" if update.effective_user.username else update.effective_user.first_name
 
-        auction = get_auction(bid_context['auction_id'])
-        if not auction:
-            update.message.reply_text("❌ This auction no longer exists.")
+        outcome = await BID_LANES.submit(
+            auction_id,
+            apply_bid,
+            auction_id,
+            update.effective_user.id,
+            bidder_name,
+            bid_amount_int,
+            None,
+            bid_idempotency_key(context, update, auction_id)
+        )
+
+        if outcome['status'] == 'duplicate':
             context.user_data.pop('bid_context', None)
+            await update.message.reply_text(
+                f"✅ Your bid of {format_bid_amount(outcome['amount'])} has already been placed."
+            )
             return
-            
-
-        current_amount = auction.get('current_bid') or auction.get('base_price', 0)
-        min_bid = current_amount + get_min_increment(current_amount)
 
+        if outcome['status'] == 'missing':
+            await update.message.reply_text("❌ This auction no longer exists.")
+            context.user_data.pop('bid_context', None)
+            return
 
-        bid_amount_int = int(bid_amount)
-        current_amount_int = int(current_amount)
-        min_bid_int = int(min_bid)
-
-        debug_log(f"BID DEBUG: bid_amount_int={bid_amount_int}, current_amount_int={current_amount_int}, min_bid_int={min_bid_int}")
-
-        if bid_amount_int < min_bid_int:
+        if outcome['status'] == 'too_low':
+            current_amount = outcome['current_amount']
+            min_bid = outcome['min_bid']
             current_formatted = format_bid_amount(current_amount)
             min_formatted = format_bid_amount(min_bid)
-            increment_formatted = format_bid_amount(get_min_increment(current_amount))
-
-            debug_log(f"BID REJECTED: {bid_amount_int} < {min_bid_int}")
+            increment_formatted = format_bid_amount(min_bid - current_amount)
 
-            update.message.reply_text(
+            await update.message.reply_text(
                 f"❌ Bid must be at least {min_formatted}\n"
                 f"Current bid: {current_formatted}\n"
                 f"Minimum increment: {increment_formatted}\n\n"
@@ -3695,112 +5797,45 @@ def handle_bid_amount(update: Update, context: CallbackContext):
             )
             return
 
-        bidder_name = f"@{update.effective_user.username}" if update.effective_user.username else update.effective_user.first_name
-        prev_bidder, auction_id = record_bid(
-            bid_context['auction_id'],
-            update.effective_user.id,
-            bidder_name,
-            bid_amount_int , 
-            context
-        )
-
         context.user_data.pop('bid_context', None)
 
-        updated_auction = get_auction(bid_context['auction_id'])
-        if not updated_auction:
-            update.message.reply_text("❌ Error updating auction.")
+        if not outcome['auction']:
+            await update.message.reply_text("❌ Error updating auction.")
             return
 
-        caption = format_auction(updated_auction)
+        await update.message.reply_text(bid_result_text(bid_amount_int, outcome))
 
-        bot_username = context.bot.username
-        deep_link = f"https://t.me/{bot_username}?start=bid_{updated_auction['auction_id']}"
-
-        keyboard = [[
-            InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_{updated_auction['auction_id']}"),
-            InlineKeyboardButton("💰 Place Bid", url=deep_link)
-        ]]
-
-        try:
-            if updated_auction.get('photo_id'):
-                context.bot.edit_message_caption(
-                    chat_id=CHANNEL_ID,
-                    message_id=bid_context['channel_msg_id'],
-                    caption=caption,
-                    reply_markup=InlineKeyboardMarkup(keyboard),
-                    parse_mode='HTML'
-                )
-            else:
-                context.bot.edit_message_text(
-                    chat_id=CHANNEL_ID,
-                    message_id=bid_context['channel_msg_id'],
-                    text=caption,
-                    reply_markup=InlineKeyboardMarkup(keyboard),
-                    parse_mode='HTML'
-                )
-        except Exception as e:
-            debug_log(f"Channel update failed: {str(e)}")
-            try:
-                plain_caption = caption.replace('<br>', '\n').replace('<a href="', '').replace('">', ' ').replace('</a>', '')
-                if updated_auction.get('photo_id'):
-                    context.bot.edit_message_caption(
-                        chat_id=CHANNEL_ID,
-                        message_id=bid_context['channel_msg_id'],
-                        caption=plain_caption,
-                        reply_markup=InlineKeyboardMarkup(keyboard)
-                    )
-                else:
-                    context.bot.edit_message_text(
-                        chat_id=CHANNEL_ID,
-                        message_id=bid_context['channel_msg_id'],
-                        text=plain_caption,
-                        reply_markup=InlineKeyboardMarkup(keyboard)
-                    )
-            except Exception as fallback_error:
-                debug_log(f"Fallback update failed: {str(fallback_error)}")
-
-        if prev_bidder and prev_bidder[0] != update.effective_user.id:
-            try:
-                send_outbid_notification(
-                    context,
-                    prev_bidder,
-                    bid_context['item_text'],
-                    bid_amount_int,
-                    auction_id
-                )
-            except Exception as e:
-                debug_log(f"Couldn't notify outbid user: {str(e)}")
-
-        formatted_bid = format_bid_amount(bid_amount)
-        update.message.reply_text(f"✅ Your bid of {formatted_bid} has been placed!")
+        publish_bid(context, outcome, update.effective_user.id, bidder_name, bid_amount_int)
 
     except ValueError:
-        update.message.reply_text(
+        await update.message.reply_text(
             "❌ Please enter a valid bid amount!"
         )
     except Exception as e:
         debug_log(f"Error in handle_bid_amount: {str(e)}")
-        update.message.reply_text("❌ An error occurred. Your bid was recorded but the display may not update.")
+        await update.message.reply_text("❌ An error occurred. Your bid was recorded but the display may not update.")
         context.user_data.pop('bid_context', None)
 
-def send_outbid_notification(context, prev_bidder, item_text, bid_amount, auction_id):
+@with_api_priority(PRIORITY_NOTIFY)
+async def send_outbid_notification(context, prev_bidder, item_text, bid_amount, auction_id, leader_name=None):
     if not prev_bidder or not prev_bidder[0]:
         return
 
     outbid_user_id = prev_bidder[0]
 
     try:
-        auction = get_auction(auction_id)
+        auction = await run_db(get_auction, auction_id)
         if not auction:
             return
 
         item_name = extract_item_name(item_text)
 
-        current_bidder_name = get_current_bidder_name(auction_id) or "Unknown"
+        # the leader as of the bid that outbid them, not whoever leads by the time this is sent
+        current_bidder_name = leader_name or await run_db(get_current_bidder_name, auction_id) or "Unknown"
         current_bidder_name = current_bidder_name.replace('\\', '')
 
         try:
-            channel_entity = context.bot.get_chat(CHANNEL_ID)
+            channel_entity = await context.bot.get_chat(CHANNEL_ID)
             channel_username = channel_entity.username
         except:
             channel_username = None
@@ -3831,53 +5866,20 @@ def send_outbid_notification(context, prev_bidder, item_text, bid_amount, auctio
                 f"Gonna let them get away with that 🤨, or are you still in this fight? 🥊"
             )
 
-        context.bot.send_message(
+        await context.bot.send_message(
             chat_id=outbid_user_id,
             text=message,
             parse_mode='HTML',
             disable_web_page_preview=False
         )
 
-    except telegram.error.Unauthorized:
+    except telegram.error.Forbidden:
         debug_log(f"User {outbid_user_id} blocked the bot")
     except Exception as e:
         debug_log(f"Error sending outbid notification: {str(e)}")
 
 def extract_item_name(item_text):
-    if not item_text:
-        return "Unknown Item"
-
-    tm_match = re.search(r'(TM\d+)[^\n]*', item_text)
-    if tm_match:
-        return tm_match.group(1).strip()  
-
-    pokemon_match = re.search(r'Pokémon:\s*([^\n]+)', item_text, re.IGNORECASE)
-    if pokemon_match:
-        return pokemon_match.group(1).strip()
-
-    tm_patterns = [
-        r'💿\s*([^\n]+)',  
-        r'Technical Machine[^\n]*',  
-        r'TM:\s*([^\n]+)',  
-    ]
-
-    for pattern in tm_patterns:
-        tm_match = re.search(pattern, item_text, re.IGNORECASE)
-        if tm_match:
-            if len(tm_match.groups()) > 0:
-                return tm_match.group(1).strip()
-            return tm_match.group(0).strip()
-
-    lines = item_text.split('\n')
-    for line in lines:
-        if line.strip():  
-            if re.search(r'TM\d+', line):
-                tm_match = re.search(r'(TM\d+)', line)
-                if tm_match:
-                    return tm_match.group(1)
-            return line[:30] + "..." if len(line) > 30 else line
-
-    return "Auction Item"
+    return CAPTION_PARSER.item_name(item_text)
 
 def get_current_bidder_name(auction_id):
     try:
@@ -3895,24 +5897,24 @@ def get_current_bidder_name(auction_id):
 
     return "Unknown"
 
-def handle_bid_button(update: Update, context: CallbackContext):
+async def handle_bid_button(update: Update, context: CallbackContext):
     query = update.callback_query
 
     try:
         try:
-            query.answer()
+            await query.answer()
         except Exception as e:
             debug_log(f"Couldn't answer callback query: {str(e)}")
 
         auction_id = int(query.data.split('_')[1])
 
-        auction = get_auction(auction_id)
+        auction = await run_db(get_auction, auction_id)
 
         if not auction:
             debug_log(f"Auction #{auction_id} not found - may be expired or closed")
 
             try:
-                context.bot.edit_message_reply_markup(
+                await context.bot.edit_message_reply_markup(
                     chat_id=query.message.chat.id,
                     message_id=query.message.message_id,
                     reply_markup=None  
@@ -3933,7 +5935,7 @@ def handle_bid_button(update: Update, context: CallbackContext):
             debug_log(f"Auction #{auction_id} is not active (status: {auction.get('auction_status')})")
 
             try:
-                context.bot.edit_message_reply_markup(
+                await context.bot.edit_message_reply_markup(
                     chat_id=query.message.chat.id,
                     message_id=query.message.message_id,
                     reply_markup=None
@@ -3960,13 +5962,14 @@ def handle_bid_button(update: Update, context: CallbackContext):
         context.user_data['bid_context'] = {
             'auction_id': auction['auction_id'],
             'channel_msg_id': query.message.message_id,
-            'min_bid': (auction.get('current_bid') or auction.get('base_price', 0)) + get_min_increment(auction.get('current_bid')),
+            'min_bid': get_next_valid_bid(auction),
             'current_bidder': auction.get('current_bidder'),
-            'item_text': auction['item_text']
+            'item_text': auction['item_text'],
+            'created_at': time.time()
         }
 
         try:
-            context.bot.edit_message_reply_markup(
+            await context.bot.edit_message_reply_markup(
                 chat_id=query.message.chat.id,
                 message_id=query.message.message_id,
                 reply_markup=InlineKeyboardMarkup(keyboard)
@@ -3976,7 +5979,7 @@ def handle_bid_button(update: Update, context: CallbackContext):
                 pass
             elif "Query is too old" in str(e):
                 try:
-                    context.bot.send_message(
+                    await context.bot.send_message(
                         chat_id=query.message.chat.id,
                         text=f"",
                         reply_markup=InlineKeyboardMarkup(keyboard),
@@ -3992,35 +5995,50 @@ def handle_bid_button(update: Update, context: CallbackContext):
     except ValueError:
         debug_log(f"Invalid auction ID format in callback data: {query.data}")
         try:
-            query.answer("❌ Invalid auction", show_alert=False)
+            await query.answer("❌ Invalid auction", show_alert=False)
         except:
             pass
     except Exception as e:
         debug_log(f"Error in handle_bid_button: {str(e)}")
 
-def handle_refresh_button(update: Update, context: CallbackContext):
+async def handle_refresh_button(update: Update, context: CallbackContext):
     query = update.callback_query
 
-    try:
+    async def answer(text, show_alert=False):
         try:
-            query.answer("🔄 Refreshing...")
+            await query.answer(text, show_alert=show_alert)
         except Exception as e:
             debug_log(f"Couldn't answer refresh callback: {str(e)}")
 
-        time.sleep(0.3)
-
+    try:
         auction_id = int(query.data.split('_')[1])
+        message_key = (query.message.chat.id, query.message.message_id)
+        now = time.monotonic()
+
+        if dispatch_backlog(context.application) > REFRESH_SHED_BACKLOG:
+            REFRESH_THROTTLE.count('shed')
+            await answer(cached_bid_toast(auction_id, "⏳ Bot is busy, try Refresh again in a moment"))
+            return
+
+        if REFRESH_THROTTLE.cooling_down(query.from_user.id, message_key, now):
+            REFRESH_THROTTLE.count('cooldown')
+            await answer(cached_bid_toast(auction_id, "✅ Just refreshed"))
+            return
 
-        auction = get_auction(auction_id)
+        auction = await run_db(get_auction, auction_id)
 
         if not auction or auction.get('auction_status') != 'active':
-            try:
-                query.answer("❌ Auction not available", show_alert=True)
-            except:
-                pass
+            await answer("❌ Auction not available", show_alert=True)
             return
 
-        caption = format_auction(auction)
+        get_next_valid_bid(auction)
+        version = auction.get('state_version') or 0
+        if CHANNEL_VERSIONS.get(auction_id) == version:
+            REFRESH_THROTTLE.count('unchanged')
+            await answer(cached_bid_toast(auction_id, "✅ Already up to date!"))
+            return
+
+        caption, _ = render_auction(auction)
 
         bot_username = context.bot.username
         deep_link = f"https://t.me/{bot_username}?start=bid_{auction_id}"
@@ -4038,7 +6056,7 @@ def handle_refresh_button(update: Update, context: CallbackContext):
 
         try:
             if auction.get('photo_id'):
-                context.bot.edit_message_caption(
+                await context.bot.edit_message_caption(
                     chat_id=query.message.chat.id,
                     message_id=query.message.message_id,
                     caption=caption,
@@ -4046,45 +6064,36 @@ def handle_refresh_button(update: Update, context: CallbackContext):
                     parse_mode='HTML'
                 )
             else:
-                context.bot.edit_message_text(
+                await context.bot.edit_message_text(
                     chat_id=query.message.chat.id,
                     message_id=query.message.message_id,
                     text=caption,
                     reply_markup=InlineKeyboardMarkup(keyboard),
                     parse_mode='HTML'
                 )
-
-            try:
-                query.answer("✅ Refreshed!")
-            except:
-                pass
+            CHANNEL_VERSIONS[auction_id] = version
+            REFRESH_THROTTLE.count('edited')
+            await answer(cached_bid_toast(auction_id, "✅ Refreshed!"))
 
         except telegram.error.BadRequest as e:
             if "Message is not modified" in str(e):
-                try:
-                    query.answer("✅ Already up to date!")
-                except:
-                    pass
+                CHANNEL_VERSIONS[auction_id] = version
+                REFRESH_THROTTLE.count('unchanged')
+                await answer(cached_bid_toast(auction_id, "✅ Already up to date!"))
             else:
                 debug_log(f"Couldn't refresh auction message: {str(e)}")
-                try:
-                    query.answer("❌ Refresh failed", show_alert=True)
-                except:
-                    pass
+                await answer("❌ Refresh failed", show_alert=True)
         except Exception as e:
             debug_log(f"Error refreshing auction: {str(e)}")
-            try:
-                query.answer("❌ Refresh failed", show_alert=True)
-            except:
-                pass
+            await answer("❌ Refresh failed", show_alert=True)
 
     except Exception as e:
         debug_log(f"Error in handle_refresh_button: {str(e)}")
 
 @admin_only
-def remove_item(update: Update, context: CallbackContext):
+async def remove_item(update: Update, context: CallbackContext):
     if not context.args:
-        update.message.reply_text(
+        await update.message.reply_text(
             "❌ Usage: /removeitem <item_id>\n\n"
             "To find Item IDs, use /items command or check the auction message in the channel."
         )
@@ -4093,26 +6102,19 @@ def remove_item(update: Update, context: CallbackContext):
     try:
         auction_id = int(context.args[0])
 
-        auction = get_auction(auction_id)
+        auction = await run_db(get_auction, auction_id)
         if not auction:
-            update.message.reply_text(f"❌ Item #{auction_id} not found!")
+            await update.message.reply_text(f"❌ Item #{auction_id} not found!")
             return
 
-        submission = None
-        with db_connection() as conn:
-            c = conn.cursor()
-            c.execute('''SELECT s.user_id, s.data
-                         FROM submissions s
-                         WHERE s.channel_message_id = ?''',
-                     (auction['channel_message_id'],))
-            submission = c.fetchone()
+        submission = await run_db(get_submission_by_channel_message, auction['channel_message_id'])
 
         message_deletion_status = "not_attempted"
         deletion_error = None
 
         if auction.get('channel_message_id'):
             try:
-                context.bot.delete_message(
+                await context.bot.delete_message(
                     chat_id=CHANNEL_ID,
                     message_id=auction['channel_message_id']
                 )
@@ -4133,15 +6135,21 @@ def remove_item(update: Update, context: CallbackContext):
                 deletion_error = str(e)
                 debug_log(f"Error deleting message: {str(e)}")
 
-        with db_connection() as conn:
+        def mark_removed(conn):
             c = conn.cursor()
-            c.execute('''UPDATE auctions SET is_active = 0, auction_status = 'removed'
+            c.execute('''UPDATE auctions SET is_active = 0, auction_status = 'removed',
+                         state_version = state_version + 1
                          WHERE auction_id = ?''', (auction_id,))
-            conn.commit()
+            set_auction_leader(c, auction_id, None, None)
+            c.execute("DELETE FROM proxy_bids WHERE auction_id = ?", (auction_id,))
+
+        await run_db(DB_WRITER.write, mark_removed)
+        AUCTION_STATE.pop(auction_id, None)
+        forget_channel_post(auction_id)
 
         if submission:
             seller_id = submission['user_id']
-            update_submission_stats(seller_id, 'revoked')
+            await run_db(update_submission_stats, seller_id, 'revoked')
             debug_log(f"Updated revoked count for user {seller_id}")
 
         if submission:
@@ -4161,7 +6169,7 @@ def remove_item(update: Update, context: CallbackContext):
                     "ℹ️ If you believe this was a mistake, please contact an admin."
                 )
 
-                context.bot.send_message(chat_id=seller_id, text=notification_text)
+                await context.bot.send_message(chat_id=seller_id, text=notification_text)
                 debug_log(f"Notified seller {seller_id} about removed auction {auction_id}")
 
             except Exception as e:
@@ -4181,13 +6189,13 @@ def remove_item(update: Update, context: CallbackContext):
         else:
             response_text += "ℹ️ Channel Message: No message ID found"
 
-        update.message.reply_text(response_text)
+        await update.message.reply_text(response_text)
 
     except ValueError:
-        update.message.reply_text("❌ Please enter a valid item ID number!")
+        await update.message.reply_text("❌ Please enter a valid item ID number!")
     except Exception as e:
         debug_log(f"Error in /removeitem: {str(e)}")
-        update.message.reply_text("❌ Error removing item. Please check the item ID and try again.")
+        await update.message.reply_text("❌ Error removing item. Please check the item ID and try again.")
 
 def get_active_auctions_by_category():
     try:
@@ -4227,15 +6235,15 @@ def get_active_auctions_by_category():
         return None
 
 @verified_only
-def handle_items(update: Update, context: CallbackContext):
+async def handle_items(update: Update, context: CallbackContext):
     try:
-        categorized = get_active_auctions_by_category()
+        categorized = await run_db(get_active_auctions_by_category)
         if not categorized:
-            update.message.reply_text("ℹ️ No active auctions currently.")
+            await update.message.reply_text("ℹ️ No active auctions currently.")
             return
 
         try:
-            channel_entity = context.bot.get_chat(CHANNEL_ID)
+            channel_entity = await context.bot.get_chat(CHANNEL_ID)
             channel_username = channel_entity.username
             if not channel_username:
                 channel_username = f"c/{str(CHANNEL_ID).replace('-100', '')}"
@@ -4270,27 +6278,17 @@ def handle_items(update: Update, context: CallbackContext):
             ]
         ]
 
-        try:
-            update.message.reply_text(
-                "\n".join(response),
-                parse_mode='HTML',
-                disable_web_page_preview=True,
-                reply_markup=InlineKeyboardMarkup(keyboard)
-            )
-        except telegram.error.RetryAfter as e:
-            debug_log(f"Flood control in /items, waiting {e.retry_after} seconds")
-            time.sleep(e.retry_after)
-            update.message.reply_text(
-                "\n".join(response),
-                parse_mode='HTML',
-                disable_web_page_preview=True,
-                reply_markup=InlineKeyboardMarkup(keyboard)
-            )
+        await update.message.reply_text(
+            "\n".join(response),
+            parse_mode='HTML',
+            disable_web_page_preview=True,
+            reply_markup=InlineKeyboardMarkup(keyboard)
+        )
 
     except Exception as e:
         debug_log(f"Error in /items: {str(e)}")
         try:
-            update.message.reply_text("❌ Error fetching active items. Please try again.")
+            await update.message.reply_text("❌ Error fetching active items. Please try again.")
         except:
             debug_log("Could not send error message for /items")
 
@@ -4311,16 +6309,12 @@ def format_item_for_list(auction_row, channel_username):
     except:
         submission_data = {}
 
-    if submission_data.get('category') == 'tms':
-        item_text = auction.get('item_text', '')
-        tm_match = re.search(r'TM\d+', item_text)
-        tm_name = tm_match.group(0) if tm_match else "TM"
-        display_name = f"{tm_name} 💿"
+    record = get_caption_record(submission_data)
+    if record['category'] == 'tms':
+        display_name = f"{record.get('tm_code') or 'TM'} 💿"
     else:
-        pokemon_name = submission_data.get('pokemon_name', 'Unknown Pokémon')
-        item_text = auction.get('item_text', '')
-        nature_match = re.search(r'Nature:\s*([A-Za-z]+)', item_text)
-        nature = nature_match.group(1) if nature_match else "Unknown"
+        pokemon_name = record.get('name') or 'Unknown Pokémon'
+        nature = record.get('nature') or "Unknown"
         display_name = f"{pokemon_name}-{nature}"
 
     if channel_username and auction.get('channel_message_id'):
@@ -4329,21 +6323,21 @@ def format_item_for_list(auction_row, channel_username):
     else:
         return display_name
 
-def handle_items_category_switch(update: Update, context: CallbackContext):
+async def handle_items_category_switch(update: Update, context: CallbackContext):
     query = update.callback_query
 
     try:
-        query.answer()
+        await query.answer()
     except Exception as e:
         debug_log(f"Error answering callback: {str(e)}")
 
     try:
         category = query.data.split('_')[1]  
 
-        categorized = get_active_auctions_by_category()
+        categorized = await run_db(get_active_auctions_by_category)
         if not categorized:
             try:
-                query.edit_message_text("ℹ️ No active auctions currently.")
+                await query.edit_message_text("ℹ️ No active auctions currently.")
             except Exception as e:
                 debug_log(f"Error editing message for no auctions: {str(e)}")
             return
@@ -4356,7 +6350,7 @@ def handle_items_category_switch(update: Update, context: CallbackContext):
             response.append("\nNo items in this category.")
         else:
             try:
-                channel_entity = context.bot.get_chat(CHANNEL_ID)
+                channel_entity = await context.bot.get_chat(CHANNEL_ID)
                 channel_username = channel_entity.username
                 if not channel_username:
                     channel_username = f"c/{str(CHANNEL_ID).replace('-100', '')}"
@@ -4377,7 +6371,7 @@ def handle_items_category_switch(update: Update, context: CallbackContext):
         ]
 
         try:
-            query.edit_message_text(
+            await query.edit_message_text(
                 "\n".join(response),
                 parse_mode='HTML',
                 disable_web_page_preview=True,
@@ -4389,7 +6383,7 @@ def handle_items_category_switch(update: Update, context: CallbackContext):
                 return
             elif "Message to edit not found" in str(e):
                 debug_log("Message to edit not found - sending new message")
-                context.bot.send_message(
+                await context.bot.send_message(
                     chat_id=query.message.chat_id,
                     text="\n".join(response),
                     parse_mode='HTML',
@@ -4400,8 +6394,8 @@ def handle_items_category_switch(update: Update, context: CallbackContext):
                 raise
         except telegram.error.RetryAfter as e:
             debug_log(f"Flood control, retrying after {e.retry_after} seconds")
-            time.sleep(e.retry_after)
-            query.edit_message_text(
+            await asyncio.sleep(e.retry_after)
+            await query.edit_message_text(
                 "\n".join(response),
                 parse_mode='HTML',
                 disable_web_page_preview=True,
@@ -4411,7 +6405,7 @@ def handle_items_category_switch(update: Update, context: CallbackContext):
     except Exception as e:
         debug_log(f"Error in category switch: {str(e)}")
         try:
-            context.bot.send_message(
+            await context.bot.send_message(
                 chat_id=query.message.chat_id,
                 text="❌ Error switching category. Please use /items again.",
                 reply_to_message_id=query.message.message_id
@@ -4423,7 +6417,8 @@ def get_user_approved_items(user_id):
     try:
         with db_connection() as conn:
             c = conn.cursor()
-            c.execute('''SELECT s.*, a.auction_status 
+            c.execute('''SELECT s.submission_id, s.item_name, s.category, s.channel_message_id,
+                                a.auction_status
                          FROM submissions s
                          LEFT JOIN auctions a ON s.channel_message_id = a.channel_message_id
                          WHERE s.user_id=? AND s.status='approved'
@@ -4434,17 +6429,17 @@ def get_user_approved_items(user_id):
         return []
 
 @verified_only
-def handle_myitems(update: Update, context: CallbackContext):
+async def handle_myitems(update: Update, context: CallbackContext):
     try:
         user_id = update.effective_user.id
-        items = get_user_approved_items(user_id)
+        items = await run_db(get_user_approved_items, user_id)
 
         if not items:
-            update.message.reply_text("📭 You don't have any approved items in auctions yet.")
+            await update.message.reply_text("📭 You don't have any approved items in auctions yet.")
             return
 
         try:
-            channel_entity = context.bot.get_chat(CHANNEL_ID)
+            channel_entity = await context.bot.get_chat(CHANNEL_ID)
             channel_username = channel_entity.username
             if not channel_username:
                 channel_username = f"c/{str(CHANNEL_ID).replace('-100', '')}"
@@ -4457,27 +6452,13 @@ def handle_myitems(update: Update, context: CallbackContext):
         ended_items = []
 
         for item in items:
-            try:
-                data = json.loads(item['data']) if isinstance(item['data'], str) else item['data'] or {}
-                category = data.get('category', 'unknown')
+            name = item['item_name'] or 'Unknown Pokémon'
+            category = item['category'] or 'unknown'
 
-                if category.lower() == 'tms':
-                    name = "TM"
-                else:
-                    name = data.get('pokemon_name', 'Unknown Pokémon')
-
-                if item['channel_message_id']:
-                    auction = get_auction_by_channel_id_any_status(item['channel_message_id'])
-                    if auction and auction.get('auction_status') == 'active':
-                        active_items.append((item, name, category))
-                    else:
-                        ended_items.append((item, name, category))
-                else:
-                    ended_items.append((item, name, category))
-
-            except Exception as e:
-                debug_log(f"Error formatting item: {str(e)}")
-                continue
+            if item['channel_message_id'] and item['auction_status'] == 'active':
+                active_items.append((item, name, category))
+            else:
+                ended_items.append((item, name, category))
 
         if active_items:
             response.append("\n<b>🟢 Active Items:</b>")
@@ -4498,16 +6479,16 @@ def handle_myitems(update: Update, context: CallbackContext):
         if not active_items and not ended_items:
             response.append("\nNo items found")
 
-        update.message.reply_text("\n".join(response), parse_mode='HTML', disable_web_page_preview=True)
+        await update.message.reply_text("\n".join(response), parse_mode='HTML', disable_web_page_preview=True)
 
     except Exception as e:
         debug_log(f"Error in /myitems: {str(e)}")
-        update.message.reply_text("❌ Error fetching your items. Please try again.")
+        await update.message.reply_text("❌ Error fetching your items. Please try again.")
 
-def handle_topbuyers(update: Update, context: CallbackContext):
-    buyers = get_top_buyers()
+async def handle_topbuyers(update: Update, context: CallbackContext):
+    buyers = await run_db(get_top_buyers)
     if not buyers:
-        update.message.reply_text("📭 No buyers yet!")
+        await update.message.reply_text("📭 No buyers yet!")
         return
 
     response_lines = ["🏆 Top 5 Buyers 🏆"]
@@ -4517,12 +6498,12 @@ def handle_topbuyers(update: Update, context: CallbackContext):
         username = username.replace('@', '').replace('\\', '')
         response_lines.append(f"{i}. @{username} – {wins} item{'s' if wins != 1 else ''}")
 
-    update.message.reply_text("\n".join(response_lines))
+    await update.message.reply_text("\n".join(response_lines))
 
-def handle_topsellers(update: Update, context: CallbackContext):
-    sellers = get_top_sellers()
+async def handle_topsellers(update: Update, context: CallbackContext):
+    sellers = await run_db(get_top_sellers)
     if not sellers:
-        update.message.reply_text("📭 No sellers yet!")
+        await update.message.reply_text("📭 No sellers yet!")
         return
 
     response_lines = ["💰 Top 5 Sellers 💰"]
@@ -4532,7 +6513,7 @@ def handle_topsellers(update: Update, context: CallbackContext):
         username = username.replace('@', '').replace('\\', '')
         response_lines.append(f"{i}. @{username} – {sales} item{'s' if sales != 1 else ''}")
 
-    update.message.reply_text("\n".join(response_lines))
+    await update.message.reply_text("\n".join(response_lines))
 
 def get_bid_history(auction_id):
     try:
@@ -4547,17 +6528,17 @@ def get_bid_history(auction_id):
         debug_log(f"Error getting bid history: {str(e)}")
         return []
 
-def show_bid_history(update: Update, context: CallbackContext):
+async def show_bid_history(update: Update, context: CallbackContext):
     try:
         if not context.args:
-            update.message.reply_text("❌ Usage: /history <auction_id>")
+            await update.message.reply_text("❌ Usage: /history <auction_id>")
             return
 
         auction_id = int(context.args[0])
-        history = get_bid_history(auction_id)
+        history = await run_db(get_bid_history, auction_id)
 
         if not history:
-            update.message.reply_text(f"No bid history found for Item #{auction_id}")
+            await update.message.reply_text(f"No bid history found for Item #{auction_id}")
             return
 
         response = [f"📊 Bid History for Item #{auction_id}"]
@@ -4565,146 +6546,105 @@ def show_bid_history(update: Update, context: CallbackContext):
             bid_id, bidder, amount, time = bid
             response.append(f"🏷️ Bid #{bid_id}: {bidder} - {amount:,} at {time}")
 
-        update.message.reply_text("\n".join(response))
+        await update.message.reply_text("\n".join(response))
 
     except Exception as e:
         debug_log(f"Error in show_bid_history: {str(e)}")
-        update.message.reply_text("❌ Error fetching bid history")
+        await update.message.reply_text("❌ Error fetching bid history")
 
 def remove_last_bid(auction_id):
-    try:
-        with db_connection() as conn:
-            c = conn.cursor()
+    def deactivate_last_bid(conn):
+        c = conn.cursor()
 
-            c.execute('''SELECT bid_id, bidder_id, bidder_name, amount
-                         FROM bids
-                         WHERE auction_id=? AND is_active=1
-                         ORDER BY timestamp DESC, bid_id DESC
-                         LIMIT 1''', (auction_id,))
-            last_bid = c.fetchone()
+        c.execute('''SELECT bid_id, bidder_id, bidder_name, amount
+                     FROM bids
+                     WHERE auction_id=? AND is_active=1
+                     ORDER BY timestamp DESC, bid_id DESC
+                     LIMIT 1''', (auction_id,))
+        last_bid = c.fetchone()
 
-            if not last_bid:
-                return None
+        if not last_bid:
+            return None
 
-            bid_id, last_bidder_id, last_bidder_name, amount = last_bid
+        bid_id, last_bidder_id, last_bidder_name, amount = last_bid
 
-            c.execute('''UPDATE bids SET is_active=0 WHERE bid_id=?''', (bid_id,))
+        c.execute('''UPDATE bids SET is_active=0 WHERE bid_id=?''', (bid_id,))
 
-            c.execute('''SELECT bidder_id, bidder_name, amount FROM bids
-                         WHERE auction_id=? AND is_active=1
-                         ORDER BY amount DESC
-                         LIMIT 1''', (auction_id,))
-            new_top = c.fetchone()
-
-            if new_top:
-                new_bidder_id, new_bidder_name, new_amount = new_top
-                c.execute('''UPDATE auctions SET
-                             current_bid=?,
-                             current_bidder_id=?,
-                             current_bidder=?,
-                             previous_bidder=?
-                             WHERE auction_id=?''',
-                          (new_amount, new_bidder_id, new_bidder_name, last_bidder_name, auction_id))
-                result = (new_bidder_name, new_amount)
-            else:
-                c.execute('''UPDATE auctions SET
-                             current_bid=NULL,
-                             current_bidder_id=NULL,
-                             current_bidder=NULL,
-                             previous_bidder=?
-                             WHERE auction_id=?''',
-                          (last_bidder_name, auction_id))
-                result = (None, None)
+        c.execute('''SELECT bidder_id, bidder_name, amount FROM bids
+                     WHERE auction_id=? AND is_active=1
+                     ORDER BY amount DESC
+                     LIMIT 1''', (auction_id,))
+        new_top = c.fetchone()
 
-            conn.commit()
-            return result
+        if new_top:
+            new_bidder_id, new_bidder_name, new_amount = new_top
+            c.execute('''UPDATE auctions SET
+                         current_bid=?,
+                         current_bidder_id=?,
+                         current_bidder=?,
+                         previous_bidder=?,
+                         state_version=state_version + 1
+                         WHERE auction_id=?''',
+                      (new_amount, new_bidder_id, new_bidder_name, last_bidder_name, auction_id))
+            set_auction_leader(c, auction_id, new_bidder_id, new_amount)
+            result = (new_bidder_name, new_amount)
+        else:
+            c.execute('''UPDATE auctions SET
+                         current_bid=NULL,
+                         current_bidder_id=NULL,
+                         current_bidder=NULL,
+                         previous_bidder=?,
+                         state_version=state_version + 1
+                         WHERE auction_id=?''',
+                      (last_bidder_name, auction_id))
+            set_auction_leader(c, auction_id, None, None)
+            result = (None, None)
+        return result
+
+    try:
+        result = DB_WRITER.write(deactivate_last_bid)
+        AUCTION_STATE.pop(auction_id, None)
+        return result
 
     except Exception as e:
         debug_log(f"Error in remove_last_bid: {str(e)}")
         return None
 
-def handle_remove_bid(update: Update, context: CallbackContext):
+async def handle_remove_bid(update: Update, context: CallbackContext):
     try:
         if update.effective_user.id not in ADMINS:
-            update.message.reply_text("❌ Admin only command!")
+            await update.message.reply_text("❌ Admin only command!")
             return
 
         if not context.args:
-            update.message.reply_text("❌ Usage: /removebid <auction_id>")
+            await update.message.reply_text("❌ Usage: /removebid <auction_id>")
             return
 
         auction_id = int(context.args[0])
-        auction = get_auction(auction_id)
+        auction = await run_db(get_auction, auction_id)
 
         if not auction:
-            update.message.reply_text(f"❌ Item #{auction_id} not found!")
+            await update.message.reply_text(f"❌ Item #{auction_id} not found!")
             return
 
-        result = remove_last_bid(auction_id)
+        result = await BID_LANES.submit(auction_id, remove_last_bid, auction_id)
 
         if not result:
-            update.message.reply_text(f"❌ No active bids to remove for Items #{auction_id}")
+            await update.message.reply_text(f"❌ No active bids to remove for Items #{auction_id}")
             return
 
         new_bidder, new_amount = result
 
-        updated_auction = get_auction(auction_id)
+        updated_auction = await run_db(get_auction, auction_id)
         if not updated_auction:
-            update.message.reply_text("❌ Error getting updated auction data")
+            await update.message.reply_text("❌ Error getting updated auction data")
             return
 
         new_amount = new_amount if new_amount else updated_auction['base_price']
 
-        auction_id_text = str(auction_id)
-        current_bid_str = f"{new_amount:,}" if new_amount is not None else 'None'
-
-        current_bidder_name = new_bidder if new_bidder else 'None'
-
-        current_bidder_id = updated_auction.get('current_bidder_id')
-        if current_bidder_id and current_bidder_name != 'None':
-            bidder_link = f'<a href="tg://user?id={current_bidder_id}">{current_bidder_name}</a>'
-        else:
-            bidder_link = current_bidder_name
-
-        item_text = updated_auction['item_text']
-
-        caption = (
-            f"{item_text}\n"
-            f"<blockquote>🔼 Current Bid: {current_bid_str}\n"
-            f"👤 Bidder: {bidder_link}</blockquote>"
-        )
-
-        bot_username = context.bot.username
-        deep_link = f"https://t.me/{bot_username}?start=bid_{auction_id}"
-
-        keyboard = [
-            [
-                InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_{auction_id}"),
-                InlineKeyboardButton("💰 Place Bid", url=deep_link)
-            ]
-        ]
-
-        update_success = True
-        try:
-            if updated_auction.get('photo_id'):
-                context.bot.edit_message_caption(
-                    chat_id=CHANNEL_ID,
-                    message_id=updated_auction['channel_message_id'],
-                    caption=caption,
-                    reply_markup=InlineKeyboardMarkup(keyboard),
-                    parse_mode='HTML'
-                )
-            else:
-                context.bot.edit_message_text(
-                    chat_id=CHANNEL_ID,
-                    message_id=updated_auction['channel_message_id'],
-                    text=caption,
-                    reply_markup=InlineKeyboardMarkup(keyboard),
-                    parse_mode='HTML'
-                )
-        except Exception as e:
-            debug_log(f"Channel update failed: {str(e)}")
-            update_success = False
+        # same caption and keyboard a bid would draw, and the version it shows is recorded
+        with api_priority(PRIORITY_CHANNEL):
+            update_success = await edit_channel_post(context, updated_auction)
 
         response = (
             f"✅ Last bid removed from Item #{auction_id}\n"
@@ -4714,48 +6654,41 @@ def handle_remove_bid(update: Update, context: CallbackContext):
         if not update_success:
             response += "\n⚠️ Note: Couldn't update auction message"
 
-        update.message.reply_text(response)
+        await update.message.reply_text(response)
 
     except Exception as e:
         debug_log(f"Error in handle_remove_bid: {str(e)}")
-        update.message.reply_text("❌ Error removing bid. Please check the auction ID.")
+        await update.message.reply_text("❌ Error removing bid. Please check the auction ID.")
 
 def get_user_leading_bids(user_id):
     try:
         with db_connection() as conn:
             c = conn.cursor()
 
-            c.execute('''SELECT a.auction_id, a.item_text, s.data, b.amount, a.auction_status
-                         FROM auctions a
-                         JOIN bids b ON a.auction_id = b.auction_id
-                         LEFT JOIN submissions s ON a.channel_message_id = s.channel_message_id
-                         WHERE b.bidder_id = ?
-                         AND b.is_active = 1
-                         AND a.auction_status IN ('active', 'ended') 
-                         AND b.amount = (
-                             SELECT MAX(amount)
-                             FROM bids
-                             WHERE auction_id = a.auction_id
-                             AND is_active = 1
-                         )
-                         ORDER BY b.timestamp DESC''', (user_id,))
+            c.execute('''SELECT a.auction_id, a.item_name, a.category, a.auction_status,
+                                a.channel_message_id, l.amount
+                         FROM user_leading l
+                         JOIN auctions a ON a.auction_id = l.auction_id
+                         WHERE l.user_id = ?
+                         AND a.auction_status = 'active'
+                         ORDER BY l.auction_id DESC''', (user_id,))
             return c.fetchall()
     except Exception as e:
         debug_log(f"Error getting user leading bids: {str(e)}")
         return []
 
 @verified_only
-def handle_mybids(update: Update, context: CallbackContext):
+async def handle_mybids(update: Update, context: CallbackContext):
     try:
         user_id = update.effective_user.id
-        user_bids = get_user_leading_bids(user_id)
+        user_bids = await run_db(get_user_leading_bids, user_id)
 
         if not user_bids:
-            update.message.reply_text("You're not currently the highest bidder on any item.")
+            await update.message.reply_text("You're not currently the highest bidder on any item.")
             return
 
         try:
-            channel_entity = context.bot.get_chat(CHANNEL_ID)
+            channel_entity = await context.bot.get_chat(CHANNEL_ID)
             channel_username = channel_entity.username
             if not channel_username:
                 channel_username = f"c/{str(CHANNEL_ID).replace('-100', '')}"
@@ -4764,139 +6697,116 @@ def handle_mybids(update: Update, context: CallbackContext):
 
         response = ["<b>Your Current Bids</b>"]
 
-        for i, bid_data in enumerate(user_bids, 1):
-            auction_id = bid_data[0]
-            item_text = bid_data[1]
-            submission_data = bid_data[2]
-            amount = bid_data[3]
-            auction_status = bid_data[4]  
-
-            auction = get_auction(auction_id)
-            if not auction:
-                continue
-
-            item_name = "Unknown Item"
-            if submission_data:
-                try:
-                    data = json.loads(submission_data) if isinstance(submission_data, str) else submission_data
-                    if data.get('category') == 'tms':
-                        tm_text = data.get('tm_details', {}).get('text', '')
-                        tm_match = re.search(r'(TM\d+)', tm_text)
-                        item_name = tm_match.group(1) if tm_match else "TM"
-                    else:
-                        item_name = data.get('pokemon_name', 'Unknown Pokémon')
-                except:
-                    item_name = extract_item_name(item_text)
-            else:
-                item_name = extract_item_name(item_text)
+        for i, bid in enumerate(user_bids, 1):
+            item_name = bid['item_name'] or "Unknown Item"
 
-            if channel_username and auction.get('channel_message_id'):
-                message_link = f"https://t.me/{channel_username}/{auction['channel_message_id']}"
+            if channel_username and bid['channel_message_id']:
+                message_link = f"https://t.me/{channel_username}/{bid['channel_message_id']}"
                 item_display = f'<a href="{message_link}">{item_name}</a>'
             else:
                 item_display = item_name
 
-            status_indicator = "🟢" if auction_status == 'active' else "🔴"
-            response.append(f"{i}. {item_display} - {amount:,} 💵")
+            response.append(f"{i}. {item_display} - {bid['amount']:,} 💵")
 
-        update.message.reply_text("\n".join(response), parse_mode='HTML', disable_web_page_preview=True)
+        await update.message.reply_text("\n".join(response), parse_mode='HTML', disable_web_page_preview=True)
 
     except Exception as e:
         debug_log(f"Error in /mybids: {str(e)}")
-        update.message.reply_text("❌ Error fetching your bids. Please try again.")
+        await update.message.reply_text("❌ Error fetching your bids. Please try again.")
 
 def update_user_profile(user_id, username, first_name):
-    try:
-        with profile_connection() as conn:
-            c = conn.cursor()
+    def upsert_profile(conn):
+        c = conn.cursor()
 
-            c.execute('SELECT * FROM user_profiles WHERE user_id=?', (user_id,))
-            existing = c.fetchone()
+        c.execute('SELECT * FROM user_profiles WHERE user_id=?', (user_id,))
+        existing = c.fetchone()
 
-            if existing:
-                c.execute('''UPDATE user_profiles
-                            SET username = ?, first_name = ?, updated_at = CURRENT_TIMESTAMP
-                            WHERE user_id = ?''',
-                         (username, first_name, user_id))
-                debug_log(f"Updated existing profile for user {user_id}")
-            else:
-                c.execute('''INSERT INTO user_profiles
-                            (user_id, username, first_name, total_submissions, approved_submissions,
-                             rejected_submissions, pending_submissions, revoked_submissions)
-                            VALUES (?, ?, ?, 0, 0, 0, 0, 0)''',
-                         (user_id, username, first_name))
-                debug_log(f"Created new profile for user {user_id}")
+        if existing:
+            c.execute('''UPDATE user_profiles
+                        SET username = ?, first_name = ?, updated_at = CURRENT_TIMESTAMP
+                        WHERE user_id = ?''',
+                     (username, first_name, user_id))
+            debug_log(f"Updated existing profile for user {user_id}")
+        else:
+            c.execute('''INSERT INTO user_profiles
+                        (user_id, username, first_name, total_submissions, approved_submissions,
+                         rejected_submissions, pending_submissions, revoked_submissions)
+                        VALUES (?, ?, ?, 0, 0, 0, 0, 0)''',
+                     (user_id, username, first_name))
+            debug_log(f"Created new profile for user {user_id}")
 
-            conn.commit()
+    try:
+        DB_WRITER.write(upsert_profile, db_name='user_profiles.db')
     except Exception as e:
         debug_log(f"Error updating user profile: {str(e)}")
 
 def update_submission_stats(user_id, status_change, is_new_submission=False):
-    try:
-        debug_log(f"=== START UPDATE SUBMISSION STATS ===")
-        debug_log(f"User: {user_id}, Status: {status_change}, New: {is_new_submission}")
-
-        with profile_connection() as conn:
-            c = conn.cursor()
-
-            c.execute('SELECT * FROM user_profiles WHERE user_id=?', (user_id,))
-            existing_profile = c.fetchone()
-
-            if not existing_profile:
-                debug_log(f"Creating NEW profile for user {user_id}")
-                c.execute('''INSERT INTO user_profiles
-                            (user_id, username, first_name, total_submissions, approved_submissions,
-                             rejected_submissions, pending_submissions, revoked_submissions)
-                            VALUES (?, ?, ?, 0, 0, 0, 0, 0)''',
-                         (user_id, None, None))
-                conn.commit()
-                debug_log("New profile created successfully")
-
-            c.execute('''SELECT total_submissions, pending_submissions, approved_submissions,
-                                rejected_submissions, revoked_submissions
-                         FROM user_profiles WHERE user_id=?''', (user_id,))
-            before = c.fetchone()
-            debug_log(f"BEFORE - Total: {before['total_submissions']}, Pending: {before['pending_submissions']}, Approved: {before['approved_submissions']}, Rejected: {before['rejected_submissions']}, Revoked: {before['revoked_submissions']}")
+    def apply_stats(conn):
+        c = conn.cursor()
 
-            if is_new_submission:
+        c.execute('SELECT * FROM user_profiles WHERE user_id=?', (user_id,))
+        existing_profile = c.fetchone()
+
+        if not existing_profile:
+            debug_log(f"Creating NEW profile for user {user_id}")
+            c.execute('''INSERT INTO user_profiles
+                        (user_id, username, first_name, total_submissions, approved_submissions,
+                         rejected_submissions, pending_submissions, revoked_submissions)
+                        VALUES (?, ?, ?, 0, 0, 0, 0, 0)''',
+                     (user_id, None, None))
+            debug_log("New profile created successfully")
+
+        c.execute('''SELECT total_submissions, pending_submissions, approved_submissions,
+                            rejected_submissions, revoked_submissions
+                     FROM user_profiles WHERE user_id=?''', (user_id,))
+        before = c.fetchone()
+        debug_log(f"BEFORE - Total: {before['total_submissions']}, Pending: {before['pending_submissions']}, Approved: {before['approved_submissions']}, Rejected: {before['rejected_submissions']}, Revoked: {before['revoked_submissions']}")
+
+        if is_new_submission:
+            c.execute('''UPDATE user_profiles
+                        SET total_submissions = total_submissions + 1,
+                            pending_submissions = pending_submissions + 1,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE user_id = ?''', (user_id,))
+            debug_log("ACTION: Incremented total and pending for new submission")
+        else:
+            if status_change == 'approved':
                 c.execute('''UPDATE user_profiles
-                            SET total_submissions = total_submissions + 1,
-                                pending_submissions = pending_submissions + 1,
+                            SET pending_submissions = pending_submissions - 1,
+                                approved_submissions = approved_submissions + 1,
                                 updated_at = CURRENT_TIMESTAMP
                             WHERE user_id = ?''', (user_id,))
-                debug_log("ACTION: Incremented total and pending for new submission")
-            else:
-                if status_change == 'approved':
-                    c.execute('''UPDATE user_profiles
-                                SET pending_submissions = pending_submissions - 1,
-                                    approved_submissions = approved_submissions + 1,
-                                    updated_at = CURRENT_TIMESTAMP
-                                WHERE user_id = ?''', (user_id,))
-                    debug_log("ACTION: Moved from pending to approved")
-                elif status_change == 'rejected':
-                    c.execute('''UPDATE user_profiles
-                                SET pending_submissions = pending_submissions - 1,
-                                    rejected_submissions = rejected_submissions + 1,
-                                    updated_at = CURRENT_TIMESTAMP
-                                WHERE user_id = ?''', (user_id,))
-                    debug_log("ACTION: Moved from pending to rejected")
-                elif status_change == 'revoked':
-                    c.execute('''UPDATE user_profiles
-                                SET approved_submissions = approved_submissions - 1,
-                                    revoked_submissions = revoked_submissions + 1,
-                                    updated_at = CURRENT_TIMESTAMP
-                                WHERE user_id = ?''', (user_id,))
-                    debug_log("ACTION: Moved from approved to revoked")
+                debug_log("ACTION: Moved from pending to approved")
+            elif status_change == 'rejected':
+                c.execute('''UPDATE user_profiles
+                            SET pending_submissions = pending_submissions - 1,
+                                rejected_submissions = rejected_submissions + 1,
+                                updated_at = CURRENT_TIMESTAMP
+                            WHERE user_id = ?''', (user_id,))
+                debug_log("ACTION: Moved from pending to rejected")
+            elif status_change == 'revoked':
+                c.execute('''UPDATE user_profiles
+                            SET approved_submissions = approved_submissions - 1,
+                                revoked_submissions = revoked_submissions + 1,
+                                updated_at = CURRENT_TIMESTAMP
+                            WHERE user_id = ?''', (user_id,))
+                debug_log("ACTION: Moved from approved to revoked")
 
-            c.execute('''SELECT total_submissions, pending_submissions, approved_submissions,
-                                rejected_submissions, revoked_submissions
-                         FROM user_profiles WHERE user_id=?''', (user_id,))
-            after_before_commit = c.fetchone()
-            debug_log(f"AFTER (before commit) - Total: {after_before_commit['total_submissions']}, Pending: {after_before_commit['pending_submissions']}, Approved: {after_before_commit['approved_submissions']}, Rejected: {after_before_commit['rejected_submissions']}, Revoked: {after_before_commit['revoked_submissions']}")
+        c.execute('''SELECT total_submissions, pending_submissions, approved_submissions,
+                            rejected_submissions, revoked_submissions
+                     FROM user_profiles WHERE user_id=?''', (user_id,))
+        after_before_commit = c.fetchone()
+        debug_log(f"AFTER (before commit) - Total: {after_before_commit['total_submissions']}, Pending: {after_before_commit['pending_submissions']}, Approved: {after_before_commit['approved_submissions']}, Rejected: {after_before_commit['rejected_submissions']}, Revoked: {after_before_commit['revoked_submissions']}")
 
-            conn.commit()
-            debug_log("Transaction committed successfully")
+    try:
+        debug_log(f"=== START UPDATE SUBMISSION STATS ===")
+        debug_log(f"User: {user_id}, Status: {status_change}, New: {is_new_submission}")
+
+        DB_WRITER.write(apply_stats, db_name='user_profiles.db')
+        debug_log("Transaction committed successfully")
 
+        with profile_connection() as conn:
+            c = conn.cursor()
             c.execute('''SELECT total_submissions, pending_submissions, approved_submissions,
                                 rejected_submissions, revoked_submissions
                          FROM user_profiles WHERE user_id=?''', (user_id,))
@@ -4921,19 +6831,19 @@ def get_user_profile(user_id):
         debug_log(f"Error getting user profile: {str(e)}")
         return None
 
-def handle_profile(update: Update, context: CallbackContext):
+async def handle_profile(update: Update, context: CallbackContext):
     try:
         user = update.effective_user
         user_id = user.id
 
-        profile = get_user_profile(user_id)
+        profile = await run_db(get_user_profile, user_id)
 
         if not profile:
-            profile = get_user_profile(user_id)
+            profile = await run_db(get_user_profile, user_id)
 
         profile_dict = profile or {}
 
-        is_verified = check_verification_status(user_id)
+        is_verified = await run_db(check_verification_status, user_id)
         is_admin = user_id in ADMINS
 
         username_display = f"@{user.username}" if user.username else user.first_name
@@ -4962,51 +6872,51 @@ def handle_profile(update: Update, context: CallbackContext):
         ]
 
         try:
-            profile_photos = context.bot.get_user_profile_photos(user_id, limit=1)
+            profile_photos = await context.bot.get_user_profile_photos(user_id, limit=1)
 
             if profile_photos and profile_photos.total_count > 0:
                 photo_file = profile_photos.photos[0][-1]  
 
-                context.bot.send_photo(
+                await context.bot.send_photo(
                     chat_id=update.effective_chat.id,
                     photo=photo_file.file_id,
                     caption="\n".join(profile_html),
                     parse_mode='HTML'
                 )
             else:
-                update.message.reply_text(
+                await update.message.reply_text(
                     "\n".join(profile_html),
                     parse_mode='HTML'
                 )
 
         except telegram.error.BadRequest as e:
             if "user not found" in str(e).lower() or "bot was blocked" in str(e).lower():
-                update.message.reply_text(
+                await update.message.reply_text(
                     "\n".join(profile_html),
                     parse_mode='HTML'
                 )
             else:
                 debug_log(f"Error getting profile photos: {str(e)}")
-                update.message.reply_text(
+                await update.message.reply_text(
                     "\n".join(profile_html),
                     parse_mode='HTML'
                 )
 
         except Exception as e:
             debug_log(f"Error getting profile photos: {str(e)}")
-            update.message.reply_text(
+            await update.message.reply_text(
                 "\n".join(profile_html),
                 parse_mode='HTML'
             )
 
     except Exception as e:
         debug_log(f"Error in /profile: {str(e)}")
-        update.message.reply_text("❌ Error fetching profile. Please try again.")
+        await update.message.reply_text("❌ Error fetching profile. Please try again.")
 
 @admin_only
-def handle_admin_message(update: Update, context: CallbackContext):
+async def handle_admin_message(update: Update, context: CallbackContext):
     if not context.args or len(context.args) < 2:
-        update.message.reply_text(
+        await update.message.reply_text(
             "❌ Usage: /msg <user_id|username> <message>\n\n"
             "Examples:\n"
             "/msg 1234567890 Hello there!\n"
@@ -5020,36 +6930,36 @@ def handle_admin_message(update: Update, context: CallbackContext):
 
         if target.startswith('@'):
             username = target[1:]
-            user_id = find_user_id_by_username(username)
+            user_id = await run_db(find_user_id_by_username, username)
             if not user_id:
-                update.message.reply_text(f"❌ User @{username} not found in database")
+                await update.message.reply_text(f"❌ User @{username} not found in database")
                 return
         else:
             try:
                 user_id = int(target)
             except ValueError:
-                update.message.reply_text("❌ Invalid user ID. Must be a number.")
+                await update.message.reply_text("❌ Invalid user ID. Must be a number.")
                 return
 
         try:
-            context.bot.send_message(
+            await context.bot.send_message(
                 chat_id=user_id,
                 text=f"📨 Message from admin:\n\n{message_text}"
             )
-            update.message.reply_text(f"✅ Message sent to user {user_id}")
+            await update.message.reply_text(f"✅ Message sent to user {user_id}")
 
         except telegram.error.BadRequest as e:
             if "chat not found" in str(e).lower():
-                update.message.reply_text(f"❌ User {user_id} has not started the bot or blocked it")
+                await update.message.reply_text(f"❌ User {user_id} has not started the bot or blocked it")
             else:
-                update.message.reply_text(f"❌ Failed to send message: {str(e)}")
+                await update.message.reply_text(f"❌ Failed to send message: {str(e)}")
 
         except Exception as e:
-            update.message.reply_text(f"❌ Error sending message: {str(e)}")
+            await update.message.reply_text(f"❌ Error sending message: {str(e)}")
 
     except Exception as e:
         debug_log(f"Error in /msg: {str(e)}")
-        update.message.reply_text("❌ Error processing command. Check logs.")
+        await update.message.reply_text("❌ Error processing command. Check logs.")
 
 def find_user_id_by_username(username):
     try:
@@ -5062,31 +6972,48 @@ def find_user_id_by_username(username):
         debug_log(f"Error finding user by username: {str(e)}")
         return None
 
-def handle_cleanup(update: Update, context: CallbackContext):
+async def handle_cleanup(update: Update, context: CallbackContext):
     if update.effective_user.id not in ADMINS:
         return
 
     try:
-        with db_connection() as conn:
-            conn.execute('''DELETE FROM submissions
-                           WHERE status='rejected'
-                           AND created_at < datetime('now', '-30 days')''')
-            conn.commit()
-        update.message.reply_text("✅ Database cleanup completed")
+        await run_db(DB_WRITER.execute, '''DELETE FROM submissions
+                                           WHERE status='rejected'
+                                           AND created_at < datetime('now', '-30 days')''')
+        await update.message.reply_text("✅ Database cleanup completed")
     except Exception as e:
         debug_log(f"Cleanup failed: {str(e)}")
-        update.message.reply_text("❌ Cleanup failed")
+        await update.message.reply_text("❌ Cleanup failed")
+
+SUBMISSION_KEYS = ('category', 'tm_details', 'pokemon_name', 'seller_id', 'nature', 'ivs', 'moveset', 'boosted',
+                   'boost_details', 'boost_info', 'parsed', 'base_price', 'seller_username', 'seller_first_name')
+
+async def add_conversation_timeout(update: Update, context: CallbackContext):
+    """The /add wizard went unanswered for ADD_CONVERSATION_TIMEOUT_SECONDS"""
+    for key in SUBMISSION_KEYS:
+        context.user_data.pop(key, None)
+    if update.effective_user:
+        await run_db(cleanup_temp_data, update.effective_user.id)
+    if update.effective_chat:
+        try:
+            await context.bot.send_message(
+                chat_id=update.effective_chat.id,
+                text="⌛ Your item submission timed out.\nYou can start over with /add"
+            )
+        except Exception as e:
+            debug_log(f"Couldn't send /add timeout notice: {str(e)}")
+    return ConversationHandler.END
 
-def cancel_post_item(update: Update, context: CallbackContext):
+async def cancel_post_item(update: Update, context: CallbackContext):
     context.user_data.clear()
-    update.message.reply_text(
+    await update.message.reply_text(
         "🗑 Posting cancelled.\n"
         "You can start over with /add"
     )
     return ConversationHandler.END
 
 @admin_only
-def cleanup_old_auctions(update: Update, context: CallbackContext):
+async def cleanup_old_auctions(update: Update, context: CallbackContext):
     try:
         with db_connection() as conn:
             inactive_auctions = conn.execute(
@@ -5097,7 +7024,7 @@ def cleanup_old_auctions(update: Update, context: CallbackContext):
 
         for auction in inactive_auctions:
             try:
-                context.bot.edit_message_reply_markup(
+                await context.bot.edit_message_reply_markup(
                     chat_id=CHANNEL_ID,
                     message_id=auction['channel_message_id'],
                     reply_markup=None
@@ -5113,16 +7040,16 @@ def cleanup_old_auctions(update: Update, context: CallbackContext):
                 debug_log(f"Error removing buttons from auction {auction['auction_id']}: {str(e)}")
                 failed_count += 1
 
-        update.message.reply_text(
+        await update.message.reply_text(
             f"✅ Cleaned up {removed_count} old auctions\n"
             f"❌ Failed to clean {failed_count} auctions"
         )
 
     except Exception as e:
         debug_log(f"Error in cleanup_old_auctions: {str(e)}")
-        update.message.reply_text("❌ Error cleaning up old auctions")
+        await update.message.reply_text("❌ Error cleaning up old auctions")
 
-def error_handler(update: Update, context: CallbackContext):
+async def error_handler(update: Update, context: CallbackContext):
     error = context.error
     debug_log(f"Error: {str(error)}\nUpdate: {update}\nContext: {context}")
 
@@ -5179,13 +7106,13 @@ def error_handler(update: Update, context: CallbackContext):
                 update.effective_chat.type == 'private'):
 
                 if isinstance(error, sqlite3.Error):
-                    update.effective_message.reply_text("❌ Database error. Please try again later.")
+                    await update.effective_message.reply_text("❌ Database error. Please try again later.")
                 elif isinstance(error, telegram.error.NetworkError):
                     # Already handled above, but just in case
                     pass
                 else:
                     # Only show generic error for unexpected errors, not network issues
-                    update.effective_message.reply_text("❌ An unexpected error occurred. Please try again.")
+                    await update.effective_message.reply_text("❌ An unexpected error occurred. Please try again.")
 
     except Exception as e:
         debug_log(f"Couldn't send error message: {str(e)}")
@@ -5200,46 +7127,46 @@ def error_handler(update: Update, context: CallbackContext):
 
         for admin_id in ADMINS:
             try:
-                context.bot.send_message(admin_id, error_message)
+                await context.bot.send_message(admin_id, error_message)
                 break  
             except Exception as e:
                 debug_log(f"Couldn't notify admin {admin_id}: {str(e)}")
 
 
-def send_message_with_retry(bot, chat_id, text, **kwargs):
+async def send_message_with_retry(bot, chat_id, text, **kwargs):
     """Send message with retry logic for network issues"""
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            return bot.send_message(chat_id, text, **kwargs)
+            return await bot.send_message(chat_id, text, **kwargs)
         except (telegram.error.NetworkError, telegram.error.TimedOut) as e:
             if attempt == max_retries - 1:  # Last attempt
                 raise e
             debug_log(f"Network error on attempt {attempt + 1}, retrying...")
-            time.sleep(2 ** attempt)  # Exponential backoff
+            await asyncio.sleep(2 ** attempt)  # Exponential backoff
 
-def edit_message_with_retry(bot, chat_id, message_id, text=None, caption=None, reply_markup=None, **kwargs):
+async def edit_message_with_retry(bot, chat_id, message_id, text=None, caption=None, reply_markup=None, **kwargs):
     """Edit message with retry logic for network issues"""
     max_retries = 3
     for attempt in range(max_retries):
         try:
             if caption:
-                return bot.edit_message_caption(chat_id=chat_id, message_id=message_id, caption=caption, reply_markup=reply_markup, **kwargs)
+                return await bot.edit_message_caption(chat_id=chat_id, message_id=message_id, caption=caption, reply_markup=reply_markup, **kwargs)
             else:
-                return bot.edit_message_text(chat_id=chat_id, message_id=message_id, text=text, reply_markup=reply_markup, **kwargs)
+                return await bot.edit_message_text(chat_id=chat_id, message_id=message_id, text=text, reply_markup=reply_markup, **kwargs)
         except (telegram.error.NetworkError, telegram.error.TimedOut) as e:
             if attempt == max_retries - 1:  # Last attempt
                 raise e
             debug_log(f"Network error on attempt {attempt + 1}, retrying...")
-            time.sleep(2 ** attempt)  # Exponential backoff
+            await asyncio.sleep(2 ** attempt)  # Exponential backoff
 
 
-def safe_reply(update: Update, message: str, **kwargs):
+async def safe_reply(update: Update, message: str, **kwargs):
     try:
         if (hasattr(update, 'effective_chat') and
             update.effective_chat and
             update.effective_chat.type in ['private']):
-            update.message.reply_text(message, **kwargs)
+            await update.message.reply_text(message, **kwargs)
         else:
             debug_log(f"Attempted to send message to non-private chat: {message}")
     except Exception as e:
@@ -5259,10 +7186,10 @@ def cleanup_verification_requests():
 
 
 @admin_only
-def add_admin(update: Update, context: CallbackContext):
+async def add_admin(update: Update, context: CallbackContext):
     """Add a new admin to the bot"""
     if not context.args:
-        update.message.reply_text(
+        await update.message.reply_text(
             "❌ Usage: /addadmin <user_id|@username|reply_to_user>\n\n"
             "Examples:\n"
             "/addadmin 123456789\n"
@@ -5283,7 +7210,7 @@ def add_admin(update: Update, context: CallbackContext):
         username = context.args[0][1:]  # Remove @
         try:
             # Try to find user by username (this might not always work)
-            target_user_id = find_user_id_by_username(username)
+            target_user_id = await run_db(find_user_id_by_username, username)
             if target_user_id:
                 # Create a minimal user object
                 class SimpleUser:
@@ -5293,11 +7220,11 @@ def add_admin(update: Update, context: CallbackContext):
                         self.first_name = username
                 target_user = SimpleUser(target_user_id, username)
             else:
-                update.message.reply_text(f"❌ User @{username} not found in database.")
+                await update.message.reply_text(f"❌ User @{username} not found in database.")
                 return
         except Exception as e:
             debug_log(f"Error finding user by username: {str(e)}")
-            update.message.reply_text(f"❌ Could not find user @{username}")
+            await update.message.reply_text(f"❌ Could not find user @{username}")
             return
     else:
         # If user ID provided
@@ -5311,35 +7238,24 @@ def add_admin(update: Update, context: CallbackContext):
                     self.first_name = f"User {user_id}"
             target_user = SimpleUser(user_id)
         except ValueError:
-            update.message.reply_text("❌ Invalid user ID. Must be a number.")
+            await update.message.reply_text("❌ Invalid user ID. Must be a number.")
             return
 
     if not target_user:
-        update.message.reply_text("❌ Could not identify target user.")
+        await update.message.reply_text("❌ Could not identify target user.")
         return
 
     # Check if already admin
     if target_user.id in ADMINS:
-        update.message.reply_text(f"❌ User {target_user.username or target_user.first_name} is already an admin!")
+        await update.message.reply_text(f"❌ User {target_user.username or target_user.first_name} is already an admin!")
         return
 
     try:
-        # Add to database
-        with db_connection('auctions.db') as conn:
-            c = conn.cursor()
-            
-            # Ensure table exists
-            c.execute('''CREATE TABLE IF NOT EXISTS bot_admins
-                         (user_id INTEGER PRIMARY KEY,
-                          username TEXT,
-                          added_by INTEGER,
-                          added_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-            
-            c.execute('''INSERT OR REPLACE INTO bot_admins 
-                         (user_id, username, added_by) 
-                         VALUES (?, ?, ?)''',
+        # Add to database (bot_admins is created by the auctions.db migrations)
+        await run_db(DB_WRITER.execute, '''INSERT OR REPLACE INTO bot_admins
+                                           (user_id, username, added_by)
+                                           VALUES (?, ?, ?)''',
                      (target_user.id, target_user.username, added_by))
-            conn.commit()
 
         # Update in-memory admin list
         if target_user.id not in ADMINS:
@@ -5347,13 +7263,13 @@ def add_admin(update: Update, context: CallbackContext):
         
         # Update bot commands for the new admin
         try:
-            set_admin_commands(context.bot, target_user.id)
+            await set_admin_commands(context.bot, target_user.id)
         except Exception as e:
             debug_log(f"Failed to set commands for new admin {target_user.id}: {str(e)}")
 
         # Notify the new admin
         try:
-            context.bot.send_message(
+            await context.bot.send_message(
                 chat_id=target_user.id,
                 text="🎉 You have been promoted to Admin!\n\n"
                      "You now have access to admin commands:\n"
@@ -5375,7 +7291,7 @@ def add_admin(update: Update, context: CallbackContext):
         except Exception as e:
             debug_log(f"Could not notify new admin {target_user.id}: {str(e)}")
 
-        update.message.reply_text(
+        await update.message.reply_text(
             f"✅ Successfully added {target_user.username or target_user.first_name} as admin!\n"
             f"🆔 User ID: {target_user.id}"
         )
@@ -5385,13 +7301,13 @@ def add_admin(update: Update, context: CallbackContext):
 
     except Exception as e:
         debug_log(f"Error adding admin: {str(e)}")
-        update.message.reply_text("❌ Failed to add admin. Check logs for details.")
+        await update.message.reply_text("❌ Failed to add admin. Check logs for details.")
 
 @admin_only
-def remove_admin(update: Update, context: CallbackContext):
+async def remove_admin(update: Update, context: CallbackContext):
     """Remove an admin from the bot"""
     if not context.args:
-        update.message.reply_text(
+        await update.message.reply_text(
             "❌ Usage: /removeadmin <user_id|@username>\n\n"
             "Examples:\n"
             "/removeadmin 123456789\n"
@@ -5408,43 +7324,32 @@ def remove_admin(update: Update, context: CallbackContext):
     
     if context.args[0].startswith('@'):
         username = context.args[0][1:]
-        target_user_id = find_user_id_by_username(username)
+        target_user_id = await run_db(find_user_id_by_username, username)
         target_username = username
         if not target_user_id:
-            update.message.reply_text(f"❌ User @{username} not found.")
+            await update.message.reply_text(f"❌ User @{username} not found.")
             return
     else:
         try:
             target_user_id = int(context.args[0])
             target_username = f"user_{target_user_id}"
         except ValueError:
-            update.message.reply_text("❌ Invalid user ID. Must be a number.")
+            await update.message.reply_text("❌ Invalid user ID. Must be a number.")
             return
 
     # Prevent self-removal
     if target_user_id == remover_id:
-        update.message.reply_text("❌ You cannot remove yourself as admin!")
+        await update.message.reply_text("❌ You cannot remove yourself as admin!")
         return
 
     # Check if user is actually an admin
     if target_user_id not in ADMINS:
-        update.message.reply_text(f"❌ User {target_username} is not an admin!")
+        await update.message.reply_text(f"❌ User {target_username} is not an admin!")
         return
 
     try:
         # Remove from database
-        with db_connection('auctions.db') as conn:
-            c = conn.cursor()
-            
-            # Ensure table exists
-            c.execute('''CREATE TABLE IF NOT EXISTS bot_admins
-                         (user_id INTEGER PRIMARY KEY,
-                          username TEXT,
-                          added_by INTEGER,
-                          added_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-            
-            c.execute('DELETE FROM bot_admins WHERE user_id=?', (target_user_id,))
-            conn.commit()
+        await run_db(DB_WRITER.execute, 'DELETE FROM bot_admins WHERE user_id=?', (target_user_id,))
 
         # Remove from in-memory list
         if target_user_id in ADMINS:
@@ -5459,18 +7364,20 @@ def remove_admin(update: Update, context: CallbackContext):
                 BotCommand('items', 'View auction items'),
                 BotCommand('myitems', 'View your approved items'),
                 BotCommand('mybids', 'View your active bids'),
+                BotCommand('bids', 'Bid on several items at once'),
+                BotCommand('maxbid', 'Set a maximum (proxy) bid'),
                 BotCommand('topsellers', 'View Top sellers'),
                 BotCommand('topbuyers', 'View Top buyers'),
                 BotCommand('profile', 'View your Profile'),
                 BotCommand('cancel', 'Cancel adding item'),
             ]
-            context.bot.set_my_commands(user_commands, scope=BotCommandScopeChat(target_user_id))
+            await context.bot.set_my_commands(user_commands, scope=BotCommandScopeChat(target_user_id))
         except Exception as e:
             debug_log(f"Failed to reset commands for removed admin {target_user_id}: {str(e)}")
 
         # Notify the removed admin
         try:
-            context.bot.send_message(
+            await context.bot.send_message(
                 chat_id=target_user_id,
                 text="🔓 Your admin privileges have been removed.\n\n"
                      "You no longer have access to admin commands."
@@ -5478,7 +7385,7 @@ def remove_admin(update: Update, context: CallbackContext):
         except Exception as e:
             debug_log(f"Could not notify removed admin {target_user_id}: {str(e)}")
 
-        update.message.reply_text(
+        await update.message.reply_text(
             f"✅ Successfully removed admin privileges from {target_username}!\n"
             f"🆔 User ID: {target_user_id}"
         )
@@ -5488,27 +7395,13 @@ def remove_admin(update: Update, context: CallbackContext):
 
     except Exception as e:
         debug_log(f"Error removing admin: {str(e)}")
-        update.message.reply_text("❌ Failed to remove admin. Check logs for details.")
+        await update.message.reply_text("❌ Failed to remove admin. Check logs for details.")
 
 @admin_only
-def list_admins(update: Update, context: CallbackContext):
+async def list_admins(update: Update, context: CallbackContext):
     """List all bot admins"""
     try:
-        with db_connection('auctions.db') as conn:
-            c = conn.cursor()
-            
-            # First, ensure the table exists
-            c.execute('''CREATE TABLE IF NOT EXISTS bot_admins
-                         (user_id INTEGER PRIMARY KEY,
-                          username TEXT,
-                          added_by INTEGER,
-                          added_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-            
-            # Get database admins
-            c.execute('''SELECT user_id, username, added_at, added_by 
-                         FROM bot_admins 
-                         ORDER BY added_at''')
-            db_admins = c.fetchall()
+        db_admins = await run_db(get_bot_admins)
 
         # Also include original env admins
         env_admin_ids = [int(admin_id) for admin_id in os.getenv("ADMIN_IDS", "6468620868").split(",") if admin_id]
@@ -5519,7 +7412,7 @@ def list_admins(update: Update, context: CallbackContext):
         response.append("\n<b>Original Admins (from config):</b>")
         for admin_id in env_admin_ids:
             try:
-                user = context.bot.get_chat(admin_id)
+                user = await context.bot.get_chat(admin_id)
                 username = f"@{user.username}" if user.username else user.first_name
                 response.append(f"• {username} (ID: <code>{admin_id}</code>)")
             except Exception as e:
@@ -5539,7 +7432,7 @@ def list_admins(update: Update, context: CallbackContext):
                 added_by_username = "Unknown"
                 if added_by and added_by != "Unknown":
                     try:
-                        added_by_user = context.bot.get_chat(added_by)
+                        added_by_user = await context.bot.get_chat(added_by)
                         added_by_username = f"@{added_by_user.username}" if added_by_user.username else added_by_user.first_name
                     except:
                         added_by_username = f"user_{added_by}"
@@ -5551,28 +7444,90 @@ def list_admins(update: Update, context: CallbackContext):
 
         response.append(f"\n<b>Total Admins:</b> {len(env_admin_ids) + len(db_admins)}")
 
-        update.message.reply_text("\n".join(response), parse_mode='HTML')
+        await update.message.reply_text("\n".join(response), parse_mode='HTML')
 
     except Exception as e:
         debug_log(f"Error listing admins: {str(e)}")
-        update.message.reply_text("❌ Failed to list admins. Check logs for details.")
+        await update.message.reply_text("❌ Failed to list admins. Check logs for details.")
+
+
+def format_increment_tiers():
+    lines = []
+    for i, (threshold, increment) in enumerate(zip(INCREMENT_THRESHOLDS, INCREMENT_VALUES)):
+        if i + 1 < len(INCREMENT_THRESHOLDS):
+            bid_range = f"{format_bid_amount(threshold)} - {format_bid_amount(INCREMENT_THRESHOLDS[i + 1])}"
+        else:
+            bid_range = f"{format_bid_amount(threshold)}+"
+        lines.append(f"• {bid_range}: +{format_bid_amount(increment)}")
+    return "\n".join(lines)
+
+async def show_increments(update: Update, context: CallbackContext):
+    """Show the current minimum increment ladder"""
+    await update.message.reply_text(
+        "📈 <b>Minimum Bid Increments</b>\n\n" + format_increment_tiers(),
+        parse_mode='HTML'
+    )
+
+@admin_only
+async def set_increments(update: Update, context: CallbackContext):
+    """Replace the increment ladder, e.g. /setincrements 0:1k 20k:2k 40k:3k"""
+    if not context.args:
+        await update.message.reply_text(
+            "❌ Usage: /setincrements <threshold:increment> ...\n\n"
+            "Example:\n"
+            "/setincrements 0:1k 20k:2k 40k:3k 100k:5k 1m:50k\n"
+            "/setincrements default"
+        )
+        return
+
+    try:
+        if len(context.args) == 1 and context.args[0].lower() == 'default':
+            tiers = list(DEFAULT_INCREMENT_TIERS)
+        else:
+            tiers = parse_increment_tiers(" ".join(context.args))
+        save_increment_tiers(tiers)
+    except ValueError as e:
+        await update.message.reply_text(f"❌ {str(e)}")
+        return
+    except Exception as e:
+        debug_log(f"Error saving increment tiers: {str(e)}")
+        await update.message.reply_text("❌ Failed to save increment tiers. Check logs for details.")
+        return
+
+    debug_log(f"Increment tiers updated by {update.effective_user.id}: {tiers}")
+    await update.message.reply_text(
+        "✅ <b>Increment tiers updated</b>\n\n" + format_increment_tiers(),
+        parse_mode='HTML'
+    )
+
+
+@admin_only
+async def show_bid_lanes(update: Update, context: CallbackContext):
+    """Show the queue depth of every bid lane"""
+    lines = ["🛣 <b>Bid Lanes</b>", ""]
+    for lane in BID_LANES.metrics():
+        lines.append(
+            f"Lane {lane['lane']}: queued {lane['depth']} · "
+            f"peak {lane['max_depth']} · applied {lane['processed']}"
+        )
+    await update.message.reply_text("\n".join(lines), parse_mode='HTML')
 
 
 @admin_only
-def debug_rejection(update: Update, context: CallbackContext):
+async def debug_rejection(update: Update, context: CallbackContext):
     """Debug command to test rejection flow"""
     debug_log("=== DEBUG REJECTION ===")
     debug_log(f"User data: {context.user_data}")
     
     if 'submission_rejection' in context.user_data:
         debug_log(f"Current rejection context: {context.user_data['submission_rejection']}")
-        update.message.reply_text(
+        await update.message.reply_text(
             f"✅ Active rejection context:\n"
             f"Submission ID: {context.user_data['submission_rejection'].get('submission_id')}\n"
             f"User ID: {context.user_data['submission_rejection'].get('user_id')}"
         )
     else:
-        update.message.reply_text("❌ No active rejection context")
+        await update.message.reply_text("❌ No active rejection context")
     
     # Test creating a mock rejection context
     if context.args and context.args[0] == 'test':
@@ -5582,21 +7537,935 @@ def debug_rejection(update: Update, context: CallbackContext):
             'admin_id': update.effective_user.id,
             'item_name': 'Test Item'
         }
-        update.message.reply_text("✅ Created test rejection context")
+        await update.message.reply_text("✅ Created test rejection context")
 
 @admin_only  
-def debug_clear_rejection(update: Update, context: CallbackContext):
+async def debug_clear_rejection(update: Update, context: CallbackContext):
     """Clear any stuck rejection context"""
     if 'submission_rejection' in context.user_data:
         del context.user_data['submission_rejection']
-        update.message.reply_text("✅ Cleared rejection context")
+        await update.message.reply_text("✅ Cleared rejection context")
     else:
-        update.message.reply_text("❌ No rejection context to clear")
+        await update.message.reply_text("❌ No rejection context to clear")
+
+
+
+
+
+
+def register_handlers(dp):
+    """Register every command, conversation and callback handler on the application"""
+    dp.add_error_handler(error_handler)
+
+    # Command handlers
+    dp.add_handler(CommandHandler("start", start))
+    dp.add_handler(CommandHandler("history", show_bid_history))
+    dp.add_handler(CommandHandler("removebid", handle_remove_bid))
+    dp.add_handler(CommandHandler("removeitem", remove_item))
+    dp.add_handler(CommandHandler("items", handle_items))
+    dp.add_handler(CommandHandler("myitems", handle_myitems))
+    dp.add_handler(CommandHandler("mybids", handle_mybids))
+    dp.add_handler(CommandHandler("bids", handle_batch_bids))
+    dp.add_handler(CommandHandler("maxbid", handle_max_bid))
+    dp.add_handler(CommandHandler("endsubmission", end_submission))
+    dp.add_handler(CommandHandler("startsubmission", start_submission))
+    dp.add_handler(CommandHandler("startauction", start_auction))
+    dp.add_handler(CommandHandler("endauction", end_auction))
+    dp.add_handler(CommandHandler("verify_me", request_verification))
+    dp.add_handler(CommandHandler("verify", verify_user))
+    dp.add_handler(CommandHandler("unverify", remove_verification))
+    dp.add_handler(CommandHandler("listverified", list_verified_users))
+    dp.add_handler(CommandHandler("topbuyers", handle_topbuyers))
+    dp.add_handler(CommandHandler("topsellers", handle_topsellers))
+    dp.add_handler(CommandHandler("help", show_help))
+    dp.add_handler(CommandHandler("broad", broadcast_message))
+    dp.add_handler(CommandHandler("profile", handle_profile))
+    dp.add_handler(CommandHandler("msg", handle_admin_message))
+    dp.add_handler(CommandHandler("cleanup", handle_cleanup))
+    dp.add_handler(CommandHandler("cleanup_auctions", cleanup_old_auctions))
+    dp.add_handler(CommandHandler("addadmin", add_admin))
+    dp.add_handler(CommandHandler("removeadmin", remove_admin))
+    dp.add_handler(CommandHandler("listadmins", list_admins))
+    dp.add_handler(CommandHandler("increments", show_increments))
+    dp.add_handler(CommandHandler("setincrements", set_increments))
+    dp.add_handler(CommandHandler("bidlanes", show_bid_lanes))
+    dp.add_handler(CommandHandler("setend", set_auction_end_command))
+    dp.add_handler(CommandHandler("debug_rejection", debug_rejection))
+    dp.add_handler(CommandHandler("debug_clear_rejection", debug_clear_rejection))
+
+    # Conversation handler
+    dp.add_handler(
+        ConversationHandler(
+            entry_points=[CommandHandler('add', start_add)],
+            states={
+                SELECT_CATEGORY: [CallbackQueryHandler(handle_category)],
+                GET_POKEMON_NAME: [MessageHandler(filters.TEXT & ~filters.COMMAND, handle_pokemon_name)],
+                GET_NATURE: [MessageHandler(filters.PHOTO & filters.FORWARDED, handle_nature)],
+                GET_IVS: [MessageHandler(filters.PHOTO & filters.FORWARDED, handle_ivs)],
+                GET_MOVESET: [MessageHandler(filters.PHOTO & filters.FORWARDED, handle_moveset)],
+                GET_BOOST_INFO: [MessageHandler(filters.TEXT & ~filters.COMMAND, handle_boost_info)],
+                GET_TM_DETAILS: [MessageHandler(filters.ALL & filters.FORWARDED, handle_tm_details)],
+                GET_BASE_PRICE: [
+                    MessageHandler(
+                        filters.TEXT & ~filters.COMMAND &
+                        filters.Regex(r'(?i)^(base:)?\s*(\d+k?|\d{1,3}(,\d{3})*)$'),
+                        handle_base_price
+                    )
+                ],
+                ConversationHandler.TIMEOUT: [TypeHandler(Update, add_conversation_timeout)]
+            },
+            fallbacks=[CommandHandler('cancel', cancel_post_item)],
+            allow_reentry=True,
+            conversation_timeout=ADD_CONVERSATION_TIMEOUT_SECONDS or None,
+            name='add_item',
+            persistent=True
+        )
+    )
+
+    # Callback query handlers
+    dp.add_handler(CallbackQueryHandler(handle_verification, pattern='^(verify|reject)_'))
+    dp.add_handler(CallbackQueryHandler(handle_bid_button, pattern='^bid_'))
+    dp.add_handler(CallbackQueryHandler(handle_quick_bid, pattern='^qbid_'))
+    dp.add_handler(CallbackQueryHandler(handle_items_category_switch, pattern='^items_'))
+    dp.add_handler(CallbackQueryHandler(handle_verified_pagination, pattern='^verified_'))
+    dp.add_handler(CallbackQueryHandler(handle_admin_verification, pattern='^admin_(verify|reject)_'))
+    dp.add_handler(CallbackQueryHandler(handle_verification_request_button, pattern='^request_verification$'))
+    dp.add_handler(CallbackQueryHandler(handle_cancel_rejection, pattern='^cancel_reject_'))
+    dp.add_handler(CallbackQueryHandler(handle_cancel_submission_rejection, pattern='^cancel_submission_reject_'))
+    dp.add_handler(CallbackQueryHandler(handle_refresh_button, pattern='^refresh_'))
+
+    dp.add_handler(MessageHandler(
+        filters.TEXT & filters.ChatType.PRIVATE & filters.User(ADMINS),
+        handle_submission_rejection_reason
+    ))
+    dp.add_handler(MessageHandler(
+        filters.TEXT & filters.ChatType.PRIVATE,
+        handle_bid_amount
+    ))
+
+def migrate_state_v1(c):
+    """bot_state.db v1: persisted user_data, bot_data and conversation states"""
+    c.execute('''CREATE TABLE IF NOT EXISTS user_state
+                 (user_id INTEGER PRIMARY KEY,
+                  data BLOB NOT NULL,
+                  updated_at REAL NOT NULL)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_user_state_updated
+                 ON user_state(updated_at)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS bot_state
+                 (key TEXT PRIMARY KEY,
+                  data BLOB NOT NULL,
+                  updated_at REAL NOT NULL)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS conversation_state
+                 (name TEXT NOT NULL,
+                  conversation_key TEXT NOT NULL,
+                  state BLOB NOT NULL,
+                  PRIMARY KEY (name, conversation_key))''')
+
+def migrate_state_update_ledger(c):
+    """bot_state.db v2: processed update watermark and dedupe window for UpdateLedger"""
+    c.execute('''CREATE TABLE IF NOT EXISTS update_watermark
+                 (id INTEGER PRIMARY KEY CHECK (id = 1),
+                  update_id INTEGER NOT NULL,
+                  updated_at REAL NOT NULL)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS processed_updates
+                 (dedupe_key TEXT PRIMARY KEY,
+                  update_id INTEGER NOT NULL,
+                  processed_at REAL NOT NULL)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_processed_updates_at
+                 ON processed_updates(processed_at)''')
+
+def migrate_state_update_epoch(c):
+    """bot_state.db v3: key epoch, bumped whenever Telegram may have restarted update_ids"""
+    c.execute("PRAGMA table_info(update_watermark)")
+    if 'epoch' not in [col[1] for col in c.fetchall()]:
+        c.execute("ALTER TABLE update_watermark ADD COLUMN epoch INTEGER NOT NULL DEFAULT 0")
+
+def migrate_state_conversation_age(c):
+    """bot_state.db v4: when a conversation state was last written, so the reaper can expire abandoned ones"""
+    c.execute("PRAGMA table_info(conversation_state)")
+    if 'updated_at' not in [col[1] for col in c.fetchall()]:
+        c.execute("ALTER TABLE conversation_state ADD COLUMN updated_at REAL")
+        # states from before this column start their timeout now
+        c.execute("UPDATE conversation_state SET updated_at=?", (time.time(),))
+
+STATE_MIGRATIONS = [
+    (1, migrate_state_v1),
+    (2, migrate_state_update_ledger),
+    (3, migrate_state_update_epoch),
+    (4, migrate_state_conversation_age),
+]
+
+def init_state_db(db_name=BOT_STATE_DB):
+    run_migrations(db_name, STATE_MIGRATIONS)
+
+class SqlitePersistence(BasePersistence):
+    """Keeps user_data, bot_data and conversation states in BOT_STATE_DB.
+
+    The Application hands over dirty entries every update_interval seconds;
+    entries whose pickled value hasn't changed since the last write are
+    skipped and the rest go through DB_WRITER, so one flush is one group
+    commit. Only recently active users are kept in memory: idle ones are
+    evicted by evict_idle_user_data and loaded back in refresh_user_data when
+    their next update arrives.
+    """
+
+    def __init__(self, db_name=BOT_STATE_DB, update_interval=USER_DATA_FLUSH_SECONDS,
+                 idle_seconds=USER_DATA_IDLE_SECONDS, max_resident=USER_DATA_MAX_RESIDENT,
+                 ttl_days=USER_DATA_TTL_DAYS):
+        super().__init__(store_data=PersistenceInput(chat_data=False, callback_data=False),
+                         update_interval=update_interval)
+        self.db_name = db_name
+        self.idle_seconds = idle_seconds
+        self.max_resident = max_resident
+        self.ttl_seconds = ttl_days * 86400
+        # users whose data is in memory, with when they were last seen (LRU order)
+        self.resident = {}
+        # users evict() dropped through application.drop_user_data; their rows stay
+        self.evicted = set()
+        # the Application evict() last ran for, to re-mark users who came back before the drop reached us
+        self.application = None
+        self.written_users = {}
+        self.written_bot = {}
+        self.writes = 0
+        self.skipped = 0
+        init_state_db(db_name)
+
+    def _touch(self, user_id):
+        self.resident.pop(user_id, None)
+        self.resident[user_id] = time.monotonic()
+
+    def _write(self, func):
+        self.writes += 1
+        return DB_WRITER.write(func, self.db_name)
+
+    async def get_user_data(self):
+        # only users active within idle_seconds, oldest first so the LRU order is right
+        rows = await run_db(self._query, '''SELECT user_id, data FROM user_state WHERE updated_at >= ?
+                                             ORDER BY updated_at DESC LIMIT ?''',
+                            (time.time() - self.idle_seconds, self.max_resident))
+        user_data = {}
+        for row in reversed(rows):
+            user_id, blob = row['user_id'], row['data']
+            try:
+                user_data[user_id] = pickle.loads(blob)
+            except Exception as e:
+                debug_log(f"Dropping unreadable user_data for {user_id}: {str(e)}")
+                continue
+            self.written_users[user_id] = blob
+            self._touch(user_id)
+        debug_log(f"Loaded user_data for {len(user_data)} recent users")
+        return user_data
+
+    async def get_chat_data(self):
+        return {}
+
+    def _query(self, sql, params=()):
+        with db_connection(self.db_name) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    async def get_bot_data(self):
+        rows = await run_db(self._query, "SELECT key, data FROM bot_state")
+        bot_data = {}
+        for row in rows:
+            try:
+                bot_data[row['key']] = pickle.loads(row['data'])
+                self.written_bot[row['key']] = row['data']
+            except Exception as e:
+                debug_log(f"Dropping unreadable bot_data key {row['key']}: {str(e)}")
+        return bot_data
+
+    async def get_callback_data(self):
+        return None
+
+    async def get_conversations(self, name):
+        rows = await run_db(self._query, "SELECT conversation_key, state FROM conversation_state WHERE name=?",
+                            (name,))
+        return {tuple(json.loads(row['conversation_key'])): pickle.loads(row['state']) for row in rows}
+
+    async def update_conversation(self, name, key, new_state):
+        conversation_key = json.dumps(list(key))
+        if new_state is None:
+            await run_db(self._write, lambda conn: conn.execute(
+                "DELETE FROM conversation_state WHERE name=? AND conversation_key=?", (name, conversation_key)))
+        else:
+            blob = pickle.dumps(new_state)
+            await run_db(self._write, lambda conn: conn.execute(
+                '''INSERT OR REPLACE INTO conversation_state (name, conversation_key, state, updated_at)
+                   VALUES (?, ?, ?, ?)''',
+                (name, conversation_key, blob, time.time())))
+
+    async def expire_conversations(self, name, max_age_seconds):
+        """Delete the states of conversation `name` not written for max_age_seconds; returns their keys"""
+        def expire(conn):
+            cutoff = time.time() - max_age_seconds
+            rows = conn.execute('''SELECT conversation_key FROM conversation_state
+                                   WHERE name=? AND updated_at < ?''', (name, cutoff)).fetchall()
+            conn.execute("DELETE FROM conversation_state WHERE name=? AND updated_at < ?", (name, cutoff))
+            return [tuple(json.loads(row[0])) for row in rows]
+        return await run_db(self._write, expire)
+
+    async def update_user_data(self, user_id, data):
+        if user_id not in self.resident:
+            # evicted since it was marked dirty; its data was written on the way out
+            return
+        try:
+            blob = pickle.dumps(data)
+        except Exception as e:
+            debug_log(f"Couldn't persist user_data for {user_id}: {str(e)}")
+            return
+        if self.written_users.get(user_id) == blob:
+            self.skipped += 1
+            return
+        await run_db(self._write, lambda conn: conn.execute(
+            "INSERT OR REPLACE INTO user_state (user_id, data, updated_at) VALUES (?, ?, ?)",
+            (user_id, blob, time.time())))
+        self.written_users[user_id] = blob
+
+    async def update_bot_data(self, data):
+        changed = []
+        keys = set()
+        for key, value in data.items():
+            keys.add(str(key))
+            try:
+                blob = pickle.dumps(value)
+            except Exception as e:
+                debug_log(f"Couldn't persist bot_data key {key}: {str(e)}")
+                continue
+            if self.written_bot.get(str(key)) != blob:
+                changed.append((str(key), blob))
+        removed = [key for key in self.written_bot if key not in keys]
+        if not changed and not removed:
+            self.skipped += 1
+            return
+
+        def write(conn):
+            now = time.time()
+            conn.executemany("INSERT OR REPLACE INTO bot_state (key, data, updated_at) VALUES (?, ?, ?)",
+                             [(key, blob, now) for key, blob in changed])
+            conn.executemany("DELETE FROM bot_state WHERE key=?", [(key,) for key in removed])
+
+        await run_db(self._write, write)
+        self.written_bot.update(changed)
+        for key in removed:
+            self.written_bot.pop(key, None)
+
+    async def update_chat_data(self, chat_id, data):
+        pass
+
+    async def update_callback_data(self, data):
+        pass
+
+    async def drop_chat_data(self, chat_id):
+        pass
+
+    async def drop_user_data(self, user_id):
+        if user_id in self.evicted:
+            # only moved out of memory by evict(), after its data was written
+            self.evicted.discard(user_id)
+            if user_id in self.resident and self.application is not None:
+                # back before this flush, which skipped their update in favour of the drop
+                self.application.mark_data_for_update_persistence(user_ids=[user_id])
+            return
+        self.resident.pop(user_id, None)
+        self.written_users.pop(user_id, None)
+        await run_db(self._write, lambda conn: conn.execute("DELETE FROM user_state WHERE user_id=?", (user_id,)))
+
+    async def refresh_user_data(self, user_id, user_data):
+        if user_id not in self.resident and not user_data:
+            rows = await run_db(self._query, "SELECT data FROM user_state WHERE user_id=?", (user_id,))
+            blob = rows[0]['data'] if rows else None
+            if blob is not None:
+                try:
+                    user_data.update(pickle.loads(blob))
+                    self.written_users[user_id] = blob
+                except Exception as e:
+                    debug_log(f"Dropping unreadable user_data for {user_id}: {str(e)}")
+        self._touch(user_id)
+
+    async def refresh_chat_data(self, chat_id, chat_data):
+        pass
+
+    async def refresh_bot_data(self, bot_data):
+        pass
+
+    async def flush(self):
+        # every update_* call has been committed by DB_WRITER before it returned
+        pass
+
+    def idle_users(self):
+        """Resident users to evict: idle past idle_seconds, then the least recently seen beyond max_resident"""
+        now = time.monotonic()
+        idle = [user_id for user_id, seen in self.resident.items() if now - seen >= self.idle_seconds]
+        overflow = len(self.resident) - len(idle) - self.max_resident
+        if overflow > 0:
+            # resident is kept in last-seen order; skip anyone active in the last minute
+            recent = [user_id for user_id, seen in self.resident.items()
+                      if now - seen < self.idle_seconds and now - seen >= 60]
+            idle.extend(recent[:overflow])
+        return idle
+
+    async def evict(self, application, user_ids):
+        """Write the given users' data, then drop it from memory with application.drop_user_data.
+
+        Nothing is dropped before the write has committed, and a user who
+        became active again while it ran keeps their data in memory.
+        """
+        self.application = application
+        rows = []
+        seen = {}
+        for user_id in user_ids:
+            seen[user_id] = self.resident.get(user_id)
+            data = application.user_data.get(user_id)
+            if data:
+                try:
+                    blob = pickle.dumps(data)
+                except Exception as e:
+                    debug_log(f"Couldn't persist user_data for {user_id}: {str(e)}")
+                    blob = None
+                if blob is not None and self.written_users.get(user_id) != blob:
+                    rows.append((user_id, blob, time.time()))
+
+        cutoff = time.time() - self.ttl_seconds
+
+        def write(conn):
+            conn.executemany("INSERT OR REPLACE INTO user_state (user_id, data, updated_at) VALUES (?, ?, ?)", rows)
+            return conn.execute("DELETE FROM user_state WHERE updated_at < ?", (cutoff,)).rowcount
+
+        expired = await run_db(self._write, write)
+        for user_id, blob, _ in rows:
+            self.written_users[user_id] = blob
+        for user_id in user_ids:
+            if self.resident.get(user_id) != seen[user_id]:
+                continue
+            self.resident.pop(user_id, None)
+            self.written_users.pop(user_id, None)
+            self.evicted.add(user_id)
+            application.drop_user_data(user_id)
+        return len(rows), expired
+
+    def metrics(self):
+        return {'resident': len(self.resident), 'writes': self.writes, 'skipped': self.skipped}
+
+async def evict_idle_user_data(context: CallbackContext):
+    """Job: move idle users' data out of memory and delete rows past USER_DATA_TTL_DAYS"""
+    persistence = context.application.persistence
+    if not isinstance(persistence, SqlitePersistence):
+        return
+    user_ids = persistence.idle_users()
+    written, expired = await persistence.evict(context.application, user_ids)
+    if user_ids or expired:
+        debug_log(f"Evicted user_data of {len(user_ids)} idle users ({written} written), "
+                  f"deleted {expired} expired rows")
+
+def is_stale_session(session, ttl, now):
+    return not isinstance(session, dict) or now - session.get('created_at', 0) >= ttl
+
+class UpdateLedger:
+    """Remembers which updates were fully processed, so a replay after a restart is skipped.
+
+    Polling only confirms updates with the next getUpdates call, so when the
+    bot dies mid-batch Telegram delivers the same updates again. The ledger
+    keeps a watermark (every update_id up to it has been handled) and the
+    update, callback query and message keys of the last window_seconds, both
+    persisted to BOT_STATE_DB through DB_WRITER in one write every
+    flush_seconds. Checking an update is a dict lookup; an update that was
+    still running, or not yet flushed, when the bot died runs again, which is
+    what the bid idempotency keys are for. Those keys carry the ledger's
+    epoch, which moves on whenever the watermark expires, so a bid key from
+    before Telegram restarted update_ids can't match a new update.
+    """
+
+    # Telegram keeps undelivered updates for a day, and after a week without any
+    # it may restart update_ids at random, so an older watermark is ignored
+    WATERMARK_MAX_AGE_SECONDS = 86400
+
+    def __init__(self, db_name=BOT_STATE_DB, window_seconds=UPDATE_DEDUPE_WINDOW_SECONDS,
+                 max_keys=UPDATE_DEDUPE_MAX_KEYS, flush_seconds=UPDATE_LEDGER_FLUSH_SECONDS):
+        self.db_name = db_name
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self.flush_seconds = flush_seconds
+        self.watermark = 0
+        self.watermark_at = 0.0
+        self.epoch = 0
+        self.highest = 0
+        self.in_flight = set()
+        # dedupe key -> when it was seen, oldest first
+        self.recent = {}
+        self.skipped = 0
+        self.last_prune = time.time()
+        # (dedupe_key, update_id, processed_at) rows waiting for the next flush
+        self.pending = []
+        self.flush_handle = None
+        init_state_db(db_name)
+
+    @staticmethod
+    def keys(update):
+        keys = [f"u:{update.update_id}"]
+        if update.callback_query:
+            keys.append(f"c:{update.callback_query.id}")
+        elif update.message:
+            keys.append(f"m:{update.message.chat_id}:{update.message.message_id}")
+        return keys
+
+    def load(self):
+        """Read the watermark and the current window back from the database"""
+        now = time.time()
+        with db_connection(self.db_name) as conn:
+            row = conn.execute("SELECT update_id, updated_at, epoch FROM update_watermark WHERE id=1").fetchone()
+            rows = conn.execute('''SELECT dedupe_key, processed_at FROM processed_updates
+                                   WHERE processed_at >= ? ORDER BY processed_at''',
+                                (now - self.window_seconds,)).fetchall()
+        if row:
+            self.watermark = self.highest = row['update_id']
+            self.watermark_at = row['updated_at']
+            self.epoch = row['epoch']
+        for key, processed_at in rows[-self.max_keys:]:
+            self.recent[key] = processed_at
+
+    def begin(self, update):
+        """Claim an update for processing; False if it was seen before and must be dropped"""
+        if not isinstance(update, Update):
+            return True
+
+        now = time.time()
+        if now - self.watermark_at > self.WATERMARK_MAX_AGE_SECONDS:
+            if self.watermark_at:
+                # update_ids may have restarted: neither old dedupe keys nor old bid keys may match new updates
+                self.epoch += 1
+                self.recent.clear()
+            self.watermark = self.highest = 0
+            self.watermark_at = now
+        keys = self.keys(update)
+        if update.update_id <= self.watermark or any(key in self.recent for key in keys):
+            self.skipped += 1
+            debug_log(f"Skipped replayed update {update.update_id}")
+            return False
+
+        for key in keys:
+            self.recent[key] = now
+        self.in_flight.add(update.update_id)
+        self.highest = max(self.highest, update.update_id)
+        return True
+
+    def finish(self, update):
+        """Record a processed update and move the watermark up to just below the oldest one still running"""
+        if not isinstance(update, Update):
+            return
+
+        now = time.time()
+        self.in_flight.discard(update.update_id)
+        self.watermark = max(self.watermark, min(self.in_flight) - 1 if self.in_flight else self.highest)
+        self.watermark_at = now
+        self._expire(now)
+
+        self.pending.extend((key, update.update_id, now) for key in self.keys(update))
+        if self.flush_seconds <= 0:
+            self.flush()
+        elif self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(self.flush_seconds, self.flush)
+
+    def abandon(self, update):
+        """Release an update cancelled before it finished (shutdown), so it doesn't hold the watermark down.
+
+        It is not recorded; polling confirms every fetched update when it stops,
+        so it is not delivered again either.
+        """
+        if not isinstance(update, Update):
+            return
+        self.in_flight.discard(update.update_id)
+        for key in self.keys(update):
+            self.recent.pop(key, None)
+
+    def flush(self):
+        """Write the updates finished since the last flush and the watermark in one DB_WRITER write"""
+        self.flush_handle = None
+        rows, self.pending = self.pending, []
+        now = time.time()
+        watermark, epoch = self.watermark, self.epoch
+        prune_before = None
+        if now - self.last_prune >= min(self.window_seconds, 60):
+            prune_before = now - self.window_seconds
+            self.last_prune = now
+
+        def record(conn):
+            conn.executemany('''INSERT OR REPLACE INTO processed_updates (dedupe_key, update_id, processed_at)
+                                VALUES (?, ?, ?)''', rows)
+            conn.execute('''INSERT OR REPLACE INTO update_watermark (id, update_id, updated_at, epoch)
+                            VALUES (1, ?, ?, ?)''', (watermark, now, epoch))
+            if prune_before is not None:
+                conn.execute("DELETE FROM processed_updates WHERE processed_at < ?", (prune_before,))
+
+        future = DB_WRITER.submit(record, self.db_name)
+        future.add_done_callback(self._log_write_error)
+        return future
+
+    async def close(self):
+        """Flush what is still pending; called when the update processor shuts down"""
+        if self.flush_handle:
+            self.flush_handle.cancel()
+        if self.pending or self.flush_handle:
+            await asyncio.wrap_future(self.flush())
+        self.flush_handle = None
+
+    def _expire(self, now):
+        cutoff = now - self.window_seconds
+        while self.recent:
+            key = next(iter(self.recent))
+            if self.recent[key] >= cutoff and len(self.recent) <= self.max_keys:
+                break
+            del self.recent[key]
+
+    @staticmethod
+    def _log_write_error(future):
+        if future.exception():
+            debug_log(f"Failed to record processed update: {future.exception()}")
+
+def end_conversations(application, name, keys):
+    """End the given conversations of the ConversationHandler called `name`.
+
+    PTB has no public way to do this from outside a handler. Its state dict
+    tracks deletions, so the next update_persistence removes the stored
+    states too.
+    """
+    for handlers in application.handlers.values():
+        for handler in handlers:
+            if isinstance(handler, ConversationHandler) and handler.name == name:
+                for key in keys:
+                    handler._conversations.pop(key, None)
+
+async def expire_add_conversations(application):
+    """End /add wizards idle past ADD_CONVERSATION_TIMEOUT_SECONDS and drop their half-filled submission.
+
+    The conversation_timeout job only exists for wizards started since the
+    last restart: PTB doesn't re-arm timeouts for states loaded from
+    persistence, so those would otherwise be kept forever. Returns the users
+    whose user_data changed.
+    """
+    persistence = application.persistence
+    if not ADD_CONVERSATION_TIMEOUT_SECONDS or not isinstance(persistence, SqlitePersistence):
+        return []
+    expired = await persistence.expire_conversations('add_item', ADD_CONVERSATION_TIMEOUT_SECONDS)
+    if not expired:
+        return []
+    end_conversations(application, 'add_item', expired)
+    touched = []
+    for key in expired:
+        # keys are (chat_id, user_id)
+        user_data = application.user_data.get(key[-1])
+        if user_data and any(field in user_data for field in SUBMISSION_KEYS):
+            for field in SUBMISSION_KEYS:
+                user_data.pop(field, None)
+            touched.append(key[-1])
+    debug_log(f"Session reaper: ended {len(expired)} abandoned /add wizards")
+    return touched
+
+async def reap_stale_sessions(context: CallbackContext):
+    """Job: end abandoned /add wizards, drop stale bid contexts, rejection sessions and /add temp_data rows"""
+    application = context.application
+    now = time.time()
+    touched = await expire_add_conversations(application)
+    for index, (user_id, user_data) in enumerate(list(application.user_data.items())):
+        changed = False
+        if 'bid_context' in user_data and is_stale_session(user_data['bid_context'], BID_CONTEXT_TTL_SECONDS, now):
+            user_data.pop('bid_context', None)
+            changed = True
+        if 'active_rejection' in user_data and is_stale_session(user_data['active_rejection'],
+                                                                REJECTION_TTL_SECONDS, now):
+            user_data.pop('active_rejection', None)
+            changed = True
+        if changed:
+            touched.append(user_id)
+        if index % SESSION_REAPER_CHUNK == SESSION_REAPER_CHUNK - 1:
+            # let updates run between chunks
+            await asyncio.sleep(0)
+    if touched:
+        application.mark_data_for_update_persistence(user_ids=touched)
+
+    temp_rows = await run_db(delete_stale_rows, 'temp_data', 'timestamp', ADD_CONVERSATION_TIMEOUT_SECONDS or 86400)
+    rejections = await run_db(cleanup_old_rejections)
+    if touched or temp_rows or rejections:
+        debug_log(f"Session reaper: {len(touched)} users' stale sessions, {temp_rows} temp_data rows, "
+                  f"{rejections} rejections removed")
+
+class BackupRestarted(Exception):
+    """Raised from the backup progress callback once writes keep restarting a paged copy"""
+
+# a write from another connection restarts a paged copy from the first page
+BACKUP_MAX_RESTARTS = 3
+
+def backup_database(source_path, target_path, pages=BACKUP_PAGES_PER_STEP, pause=BACKUP_STEP_PAUSE_SECONDS):
+    """Copy a database that may be in use into target_path with the online backup API.
+
+    Each step copies `pages` pages under a short read lock, then the copy
+    sleeps `pause` seconds, so the writer is never held up for long. If bids
+    keep restarting the copy, the rest is copied in a single step after
+    BACKUP_MAX_RESTARTS. In WAL mode that step only holds a read snapshot and
+    doesn't block the writer either. Returns the number of pages copied.
+    """
+    state = {'remaining': None, 'restarts': 0}
+
+    def progress(status, remaining, total):
+        if state['remaining'] is not None and remaining >= state['remaining']:
+            state['restarts'] += 1
+            if state['restarts'] > BACKUP_MAX_RESTARTS:
+                raise BackupRestarted()
+        state['remaining'] = remaining
+        time.sleep(pause)
+
+    source = sqlite3.connect(source_path, timeout=30)
+    target = sqlite3.connect(target_path)
+    try:
+        try:
+            source.backup(target, pages=pages, progress=progress)
+        except BackupRestarted:
+            debug_log(f"Backup of {source_path} restarted {state['restarts']} times, copying the rest in one step")
+            source.backup(target)
+        return target.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        target.close()
+        source.close()
+
+def describe_database(path):
+    """Page count, schema version, integrity check result and SHA-256 of a database file at rest"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    # immutable: the file is a snapshot, so skip locking and never create -wal/-shm files beside it
+    conn = sqlite3.connect(f"file:{path}?immutable=1", uri=True)
+    try:
+        return {
+            'pages': conn.execute("PRAGMA page_count").fetchone()[0],
+            'user_version': conn.execute("PRAGMA user_version").fetchone()[0],
+            'integrity': conn.execute("PRAGMA integrity_check").fetchone()[0],
+            'sha256': digest.hexdigest(),
+        }
+    finally:
+        conn.close()
+
+def create_snapshot(databases=None, backup_dir=BACKUP_DIR, label=None):
+    """Back up the databases into a new <backup_dir>/<UTC timestamp> directory and return its path.
+
+    Each file is copied to a .partial name, switched to a rollback journal so
+    the snapshot is one self-contained file, then renamed. manifest.json
+    (source path plus describe_database per file) is written last, so a
+    directory without one is an interrupted snapshot.
+    """
+    name = time.strftime("%Y%m%d-%H%M%S", time.gmtime()) + (f"-{label}" if label else "")
+    path = os.path.join(backup_dir, name)
+    os.makedirs(path)
+
+    manifest = {'created_at': time.time(), 'databases': {}}
+    for db_name in databases or BACKUP_DATABASES:
+        if not os.path.exists(db_name):
+            debug_log(f"Backup: {db_name} does not exist, skipped")
+            continue
+        started = time.monotonic()
+        target = os.path.join(path, os.path.basename(db_name))
+        backup_database(db_name, target + '.partial')
+        conn = sqlite3.connect(target + '.partial')
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+        os.replace(target + '.partial', target)
+        manifest['databases'][os.path.basename(db_name)] = dict(describe_database(target), source=db_name)
+        debug_log(f"Backup: {db_name} -> {target} in {time.monotonic() - started:.2f}s")
+
+    with open(os.path.join(path, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+def list_snapshots(backup_dir=BACKUP_DIR):
+    """Paths of the complete snapshots in backup_dir, oldest first"""
+    if not os.path.isdir(backup_dir):
+        return []
+    return [os.path.join(backup_dir, name) for name in sorted(os.listdir(backup_dir))
+            if os.path.exists(os.path.join(backup_dir, name, 'manifest.json'))]
 
+def rotate_snapshots(backup_dir=BACKUP_DIR, keep=BACKUP_KEEP):
+    """Delete all but the newest `keep` snapshots, and any interrupted ones; returns how many went"""
+    if not os.path.isdir(backup_dir):
+        return 0
+    complete = list_snapshots(backup_dir)
+    doomed = complete[:-keep] if keep > 0 else complete
+    doomed += [os.path.join(backup_dir, name) for name in os.listdir(backup_dir)
+               if os.path.isdir(os.path.join(backup_dir, name)) and os.path.join(backup_dir, name) not in complete]
+    for path in doomed:
+        shutil.rmtree(path, ignore_errors=True)
+    return len(doomed)
+
+def take_backup():
+    """Snapshot BACKUP_DATABASES and rotate old snapshots; returns (snapshot path, snapshots removed)"""
+    path = create_snapshot()
+    return path, rotate_snapshots()
+
+def load_manifest(snapshot):
+    with open(os.path.join(snapshot, 'manifest.json')) as f:
+        return json.load(f)
+
+def verify_snapshot(snapshot):
+    """Check every file of a snapshot against its manifest; returns a list of problems (empty if sound)"""
+    try:
+        manifest = load_manifest(snapshot)
+    except (OSError, ValueError) as e:
+        return [f"manifest unreadable: {e}"]
+
+    problems = []
+    for name, expected in manifest['databases'].items():
+        path = os.path.join(snapshot, name)
+        if not os.path.exists(path):
+            problems.append(f"{name}: missing")
+            continue
+        try:
+            actual = describe_database(path)
+        except sqlite3.DatabaseError as e:
+            problems.append(f"{name}: {e}")
+            continue
+        if actual['sha256'] != expected['sha256']:
+            problems.append(f"{name}: checksum mismatch")
+        if actual['integrity'] != 'ok':
+            problems.append(f"{name}: integrity check failed ({actual['integrity']})")
+    return problems
+
+def running_bot_pid():
+    """PID in ensure_single_instance's lock file if that process is alive, else None"""
+    import tempfile
+
+    if os.name == 'nt':
+        # os.kill(pid, 0) terminates the process on Windows
+        return None
+    lock_file = os.path.join(tempfile.gettempdir(), "legendauc_bot.lock")
+    try:
+        with open(lock_file) as f:
+            pid = int(f.read().strip())
+        os.kill(pid, 0)
+    except (OSError, ValueError):
+        return None
+    return pid
+
+def restore_snapshot(snapshot, databases=None, force=False):
+    """Copy a verified snapshot back over the live databases; returns the names restored.
 
+    Refuses while the bot is running unless force is set, since the running
+    bot would keep serving from caches of the old data. The current files are
+    snapshotted first (label "pre-restore"), so a restore can be undone.
+    """
+    problems = verify_snapshot(snapshot)
+    if problems:
+        raise ValueError(f"Snapshot {snapshot} failed verification: {'; '.join(problems)}")
+    pid = running_bot_pid()
+    if pid and not force:
+        raise RuntimeError(f"The bot is running (PID {pid}); stop it first or pass --force")
+
+    entries = load_manifest(snapshot)['databases']
+    if databases:
+        unknown = set(databases) - set(entries)
+        if unknown:
+            raise ValueError(f"Not in snapshot {snapshot}: {', '.join(sorted(unknown))}")
+        entries = {name: entry for name, entry in entries.items() if name in databases}
+
+    create_snapshot([entry['source'] for entry in entries.values()], backup_dir=os.path.dirname(snapshot) or '.',
+                    label='pre-restore')
+    for name, entry in entries.items():
+        backup_database(os.path.join(snapshot, name), entry['source'])
+        debug_log(f"Restored {entry['source']} from {snapshot}")
+    return list(entries)
+
+async def backup_databases_job(context: CallbackContext):
+    """Job: snapshot the databases and prune old snapshots"""
+    try:
+        # a thread of its own rather than DB_EXECUTOR, so a long copy never holds a worker bids are waiting for
+        path, removed = await asyncio.to_thread(take_backup)
+        debug_log(f"Backup written to {path}, {removed} old snapshots removed")
+    except Exception as e:
+        debug_log(f"Backup failed: {str(e)}")
+
+def resolve_snapshot(name, backup_dir=BACKUP_DIR):
+    """A snapshot given as a path, a directory name under backup_dir, or 'latest'"""
+    if name == 'latest':
+        snapshots = list_snapshots(backup_dir)
+        if not snapshots:
+            raise ValueError(f"No snapshots in {backup_dir}")
+        return snapshots[-1]
+    return name if os.path.isdir(name) else os.path.join(backup_dir, name)
+
+def backup_cli(argv):
+    """python bot.py backup | snapshots | verify <snapshot> | restore <snapshot> [--db NAME] [--force]"""
+    parser = argparse.ArgumentParser(prog="bot.py", description="Database snapshots")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('backup', help="take a snapshot now and rotate old ones")
+    commands.add_parser('snapshots', help="list complete snapshots, oldest first")
+    verify = commands.add_parser('verify', help="check a snapshot's files against its manifest")
+    verify.add_argument('snapshot', help='path, directory name under BACKUP_DIR, or "latest"')
+    restore = commands.add_parser('restore', help="copy a snapshot back over the live databases")
+    restore.add_argument('snapshot', help='path, directory name under BACKUP_DIR, or "latest"')
+    restore.add_argument('--db', action='append', help="restore only this file (repeatable), e.g. auctions.db")
+    restore.add_argument('--force', action='store_true', help="restore even though the bot is running")
+    args = parser.parse_args(argv)
 
+    try:
+        if args.command == 'backup':
+            path, removed = take_backup()
+            print(f"Snapshot written to {path} ({removed} old snapshots removed)")
+        elif args.command == 'snapshots':
+            for path in list_snapshots():
+                databases = load_manifest(path)['databases']
+                print(f"{os.path.basename(path)}  " + ", ".join(
+                    f"{name} ({entry['pages']} pages, v{entry['user_version']})" for name, entry in databases.items()))
+        elif args.command == 'verify':
+            snapshot = resolve_snapshot(args.snapshot)
+            problems = verify_snapshot(snapshot)
+            for problem in problems:
+                print(f"❌ {problem}")
+            if problems:
+                return 1
+            print(f"✅ {snapshot} is intact")
+        else:
+            snapshot = resolve_snapshot(args.snapshot)
+            restored = restore_snapshot(snapshot, args.db, args.force)
+            print(f"✅ Restored {', '.join(restored)} from {snapshot}")
+    except (OSError, ValueError, RuntimeError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+async def post_init(application):
+    await set_bot_commands(application)
+    await schedule_pending_closes(application)
+    orphans = await run_db(release_stale_submission_claims, SUBMISSION_CLAIM_TIMEOUT_MINUTES * 60)
+    await delete_orphaned_posts(application.bot, orphans)
 
+    try:
+        chat = await application.bot.get_chat(CHANNEL_ID)
+        debug_log(f"Bot connected to channel: {chat.title}")
+    except Exception as e:
+        debug_log(f"FATAL: Channel access failed - {str(e)}")
+        raise RuntimeError(f"Could not access channel {CHANNEL_ID}. Verify bot is admin.")
+
+def build_update_processor(workers):
+    return PriorityUpdateProcessor(workers, quotas={
+        UPDATE_DEFAULT: max(1, int(workers * DEFAULT_UPDATE_SHARE)),
+        UPDATE_BROWSE: max(1, int(workers * BROWSE_UPDATE_SHARE)),
+    }, ledger=UpdateLedger())
+
+def build_application(token=None, base_url=None, concurrent_updates=None):
+    """Build the asyncio Application: pooled HTTP client, prioritised concurrent updates and all handlers"""
+    builder = (
+        ApplicationBuilder()
+        .token(token or TOKEN)
+        .request(HTTPXRequest(connection_pool_size=HTTP_POOL_SIZE, pool_timeout=10.0))
+        .get_updates_request(HTTPXRequest())
+        .concurrent_updates(build_update_processor(concurrent_updates or CONCURRENT_UPDATES))
+        .rate_limiter(API_GATEWAY)
+        .persistence(SqlitePersistence())
+        .post_init(post_init)
+    )
+    if base_url or BOT_API_BASE_URL:
+        builder = builder.base_url(base_url or BOT_API_BASE_URL)
 
+    application = builder.build()
+    register_handlers(application)
+    return application
 
 def main():
     if not ensure_single_instance():
@@ -5607,107 +8476,18 @@ def main():
         init_verified_users_db()
         init_leaderboard_db()
         init_profiles_db()
-        ensure_all_auctions_active()
-
-        updater = Updater(token=TOKEN, use_context=True)
-        dp = updater.dispatcher
-
-        set_bot_commands(updater)
-
-        try:
-            bot = updater.bot
-            chat = bot.get_chat(CHANNEL_ID)
-            debug_log(f"Bot connected to channel: {chat.title}")
-        except Exception as e:
-            debug_log(f"FATAL: Channel access failed - {str(e)}")
-            raise RuntimeError(f"Could not access channel {CHANNEL_ID}. Verify bot is admin.")
-
-
-        job_queue = updater.job_queue
-        job_queue.run_repeating(lambda context: cleanup_old_rejections(), interval=3600, first=10)
-
-
-        dp.add_error_handler(error_handler)
-
-        # Command handlers
-        dp.add_handler(CommandHandler("start", start))
-        dp.add_handler(CommandHandler("history", show_bid_history))
-        dp.add_handler(CommandHandler("removebid", handle_remove_bid))
-        dp.add_handler(CommandHandler("removeitem", remove_item))
-        dp.add_handler(CommandHandler("items", handle_items))
-        dp.add_handler(CommandHandler("myitems", handle_myitems))
-        dp.add_handler(CommandHandler("mybids", handle_mybids))
-        dp.add_handler(CommandHandler("endsubmission", end_submission))
-        dp.add_handler(CommandHandler("startsubmission", start_submission))
-        dp.add_handler(CommandHandler("startauction", start_auction))
-        dp.add_handler(CommandHandler("endauction", end_auction))
-        dp.add_handler(CommandHandler("verify_me", request_verification))
-        dp.add_handler(CommandHandler("verify", verify_user))
-        dp.add_handler(CommandHandler("unverify", remove_verification))
-        dp.add_handler(CommandHandler("listverified", list_verified_users))
-        dp.add_handler(CommandHandler("topbuyers", handle_topbuyers))
-        dp.add_handler(CommandHandler("topsellers", handle_topsellers))
-        dp.add_handler(CommandHandler("help", show_help))
-        dp.add_handler(CommandHandler("broad", broadcast_message))
-        dp.add_handler(CommandHandler("profile", handle_profile))
-        dp.add_handler(CommandHandler("msg", handle_admin_message))
-        dp.add_handler(CommandHandler("cleanup", handle_cleanup))
-        dp.add_handler(CommandHandler("cleanup_auctions", cleanup_old_auctions))
-        dp.add_handler(CommandHandler("addadmin", add_admin))
-        dp.add_handler(CommandHandler("removeadmin", remove_admin))
-        dp.add_handler(CommandHandler("listadmins", list_admins))
-        dp.add_handler(CommandHandler("debug_rejection", debug_rejection))
-        dp.add_handler(CommandHandler("debug_clear_rejection", debug_clear_rejection))
-
-        # Conversation handler
-        dp.add_handler(
-            ConversationHandler(
-                entry_points=[CommandHandler('add', start_add)],
-                states={
-                    SELECT_CATEGORY: [CallbackQueryHandler(handle_category)],
-                    GET_POKEMON_NAME: [MessageHandler(Filters.text & ~Filters.command, handle_pokemon_name)],
-                    GET_NATURE: [MessageHandler(Filters.photo & Filters.forwarded, handle_nature)],
-                    GET_IVS: [MessageHandler(Filters.photo & Filters.forwarded, handle_ivs)],
-                    GET_MOVESET: [MessageHandler(Filters.photo & Filters.forwarded, handle_moveset)],
-                    GET_BOOST_INFO: [MessageHandler(Filters.text & ~Filters.command, handle_boost_info)],
-                    GET_TM_DETAILS: [MessageHandler(Filters.all & Filters.forwarded, handle_tm_details)],
-                    GET_BASE_PRICE: [
-                        MessageHandler(
-                            Filters.text & ~Filters.command &
-                            Filters.regex(r'(?i)^(base:)?\s*(\d+k?|\d{1,3}(,\d{3})*)$'),
-                            handle_base_price
-                        )
-                    ]
-                },
-                fallbacks=[CommandHandler('cancel', cancel_post_item)],
-                allow_reentry=True
-            )
-        )
+        load_increment_tiers()
 
-        # Callback query handlers
-        dp.add_handler(CallbackQueryHandler(handle_verification, pattern='^(verify|reject)_'))
-        dp.add_handler(CallbackQueryHandler(handle_bid_button, pattern='^bid_'))
-        dp.add_handler(CallbackQueryHandler(handle_items_category_switch, pattern='^items_'))
-        dp.add_handler(CallbackQueryHandler(handle_verified_pagination, pattern='^verified_'))
-        dp.add_handler(CallbackQueryHandler(handle_admin_verification, pattern='^admin_(verify|reject)_'))
-        dp.add_handler(CallbackQueryHandler(handle_verification_request_button, pattern='^request_verification$'))
-        dp.add_handler(CallbackQueryHandler(handle_cancel_rejection, pattern='^cancel_reject_'))
-        dp.add_handler(CallbackQueryHandler(handle_cancel_submission_rejection, pattern='^cancel_submission_reject_'))
-        dp.add_handler(CallbackQueryHandler(handle_refresh_button, pattern='^refresh_'))
-
-        dp.add_handler(MessageHandler(
-            Filters.text & Filters.chat_type.private & Filters.user(ADMINS),
-            handle_submission_rejection_reason
-        ))
-        dp.add_handler(MessageHandler(
-            Filters.text & Filters.chat_type.private, 
-            handle_bid_amount
-        ))
-    
+        application = build_application()
+        application.job_queue.run_repeating(reap_stale_sessions, interval=SESSION_REAPER_INTERVAL_SECONDS, first=10)
+        application.job_queue.run_repeating(evict_idle_user_data, interval=300, first=300)
+        if BACKUP_TIME:
+            application.job_queue.run_daily(backup_databases_job,
+                                            time=datetime.strptime(BACKUP_TIME, "%H:%M").time())
 
         debug_log("Bot starting with all features...")
-        updater.start_polling()
-        updater.idle()
+        application.run_polling()
+        DB_WRITER.close()
 
     except Conflict:
         print("Error: Another instance is already polling updates")
@@ -5717,5 +8497,7 @@ def main():
         sys.exit(1)
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        sys.exit(backup_cli(sys.argv[1:]))
     main()
 
@@ -0,0 +1,69 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+ADMIN_ID = 1000
+BIDDERS = (2001, 2002, 2003)
+SELLER_ID = 3001
+
+
+def active_bids(bot, auction_id):
+    """(bidder_id, amount) of an auction's active bids, oldest first"""
+    with bot.db_connection() as conn:
+        return [tuple(row) for row in conn.execute(
+            "SELECT bidder_id, amount FROM bids WHERE auction_id=? AND is_active=1 ORDER BY bid_id", (auction_id,))]
+
+
+@pytest.fixture(scope='session')
+def bot_module(tmp_path_factory):
+    # bot.py reads auc.env and loads admins from auctions.db in the working
+    # directory at import time; keep both away from the real files
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('BOT_TOKEN', '1:test')
+        mp.setenv('ADMIN_IDS', str(ADMIN_ID))
+        mp.chdir(tmp_path_factory.mktemp('import'))
+        with contextlib.redirect_stdout(io.StringIO()):
+            import bot
+    return bot
+
+
+@pytest.fixture
+def workdir(bot_module, tmp_path, monkeypatch):
+    """An empty working directory with a DB writer of its own"""
+    monkeypatch.chdir(tmp_path)
+    writer = bot_module.DBWriter()
+    monkeypatch.setattr(bot_module, 'DB_WRITER', writer)
+    monkeypatch.setattr(bot_module, 'AUCTION_STATE', {})
+    monkeypatch.setattr(bot_module, 'ADMINS', [ADMIN_ID])
+    yield tmp_path
+    writer.close()
+
+
+@pytest.fixture
+def bot(bot_module, workdir):
+    """bot with migrated databases and verified bidders in the working directory"""
+    bot_module.init_db()
+    bot_module.init_verified_users_db()
+    with bot_module.db_connection('verified_users.db') as conn:
+        conn.executemany("INSERT INTO verified_users (user_id, username, verified_by) VALUES (?, ?, ?)",
+                         [(user_id, f"bidder{user_id}", ADMIN_ID) for user_id in BIDDERS])
+        conn.commit()
+    return bot_module
+
+
+@pytest.fixture
+def make_auction(bot):
+    def make(base_price=10000, ends_in=None):
+        auction_id = bot.save_auction(f"Item {base_price}", None, base_price, SELLER_ID, "seller")
+        if ends_in is not None:
+            bot.DB_WRITER.execute("UPDATE auctions SET ends_at=? WHERE auction_id=?",
+                                  (time.time() + ends_in, auction_id))
+        return auction_id
+    return make
@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+from conftest import BIDDERS, active_bids
+
+ALICE, BOB = BIDDERS[:2]
+
+
+@pytest.mark.parametrize('ends_in, extended', [(30, True), (3600, False)])
+def test_late_bid_extends_the_close(bot, make_auction, monkeypatch, ends_in, extended):
+    monkeypatch.setattr(bot, 'ANTI_SNIPE_WINDOW_SECONDS', 120)
+    monkeypatch.setattr(bot, 'ANTI_SNIPE_EXTENSION_SECONDS', 300)
+    auction_id = make_auction(10000, ends_in=ends_in)
+    before = time.time()
+
+    outcome = bot.apply_bid(auction_id, ALICE, "Alice", 11000)
+
+    assert outcome['status'] == 'accepted'
+    ends_at = outcome['auction']['ends_at']
+    if extended:
+        assert outcome['extended_to'] == ends_at
+        assert before + 300 <= ends_at <= time.time() + 300
+    else:
+        assert 'extended_to' not in outcome
+        assert ends_at < before + ends_in + 1
+
+
+def test_bid_after_the_close_is_refused(bot, make_auction):
+    auction_id = make_auction(10000, ends_in=-1)
+
+    assert bot.apply_bid(auction_id, ALICE, "Alice", 11000)['status'] == 'missing'
+    assert active_bids(bot, auction_id) == []
+
+
+def test_closes_are_staggered_except_against_the_item_itself(bot, make_auction, monkeypatch):
+    monkeypatch.setattr(bot, 'AUCTION_CLOSE_STAGGER_SECONDS', 15)
+    auction_id = make_auction(10000, ends_in=3600)
+    ends_at = bot.get_auction(auction_id)['ends_at']
+
+    assert bot.next_close_slot(ends_at + 5) == ends_at + 15
+    assert bot.next_close_slot(ends_at + 5, auction_id) == ends_at + 5
@@ -0,0 +1,87 @@
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+from conftest import REPO_ROOT
+
+# the database files checked into the repo predate PRAGMA user_version (version 0)
+SHIPPED_DATABASES = [
+    ('auctions.db', 'AUCTIONS_MIGRATIONS'),
+    ('verified_users.db', 'VERIFIED_USERS_MIGRATIONS'),
+    ('leaderboard.db', 'LEADERBOARD_MIGRATIONS'),
+    ('user_profiles.db', 'PROFILES_MIGRATIONS'),
+]
+
+
+def user_version(db_name):
+    with sqlite3.connect(db_name) as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def row_counts(db_name):
+    with sqlite3.connect(db_name) as conn:
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")]
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+
+
+def columns(db_name, table):
+    with sqlite3.connect(db_name) as conn:
+        return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+@pytest.mark.parametrize('db_name, migrations_name', SHIPPED_DATABASES)
+def test_version_0_file_is_brought_up_to_date(bot_module, workdir, db_name, migrations_name):
+    migrations = getattr(bot_module, migrations_name)
+    shutil.copy(os.path.join(REPO_ROOT, db_name), db_name)
+    assert user_version(db_name) == 0
+    before = row_counts(db_name)
+
+    assert bot_module.run_migrations(db_name, migrations) == len(migrations)
+
+    assert user_version(db_name) == migrations[-1][0]
+    after = row_counts(db_name)
+    assert {table: after[table] for table in before} == before
+    assert bot_module.run_migrations(db_name, migrations) == 0
+
+
+def test_version_0_auctions_file_gets_every_later_column(bot_module, workdir):
+    shutil.copy(os.path.join(REPO_ROOT, 'auctions.db'), 'auctions.db')
+
+    bot_module.init_db()
+
+    assert {'state_version', 'item_name', 'category', 'ends_at'} <= columns('auctions.db', 'auctions')
+    assert 'idempotency_key' in columns('auctions.db', 'bids')
+    assert {'item_name', 'category', 'status_changed_at', 'auction_id'} <= columns('auctions.db', 'submissions')
+    assert {'proxy_bids', 'user_leading', 'increment_tiers'} <= set(row_counts('auctions.db'))
+    with sqlite3.connect('auctions.db') as conn:
+        assert {row[0] for row in conn.execute("SELECT status FROM submissions")} == {'rejected'}
+
+
+def test_state_db_migrates_from_an_intermediate_version(bot_module, workdir):
+    bot_module.run_migrations('bot_state.db', bot_module.STATE_MIGRATIONS[:2])
+    with sqlite3.connect('bot_state.db') as conn:
+        conn.execute("INSERT INTO update_watermark (id, update_id, updated_at) VALUES (1, 41, 0)")
+    assert user_version('bot_state.db') == 2
+
+    bot_module.init_state_db('bot_state.db')
+
+    assert user_version('bot_state.db') == bot_module.STATE_MIGRATIONS[-1][0]
+    with sqlite3.connect('bot_state.db') as conn:
+        assert conn.execute("SELECT update_id, epoch FROM update_watermark").fetchall() == [(41, 0)]
+
+
+def test_failed_migration_leaves_the_file_untouched(bot_module, workdir):
+    def create_table(c):
+        c.execute("CREATE TABLE first (id INTEGER)")
+
+    def fail(c):
+        raise sqlite3.OperationalError("boom")
+
+    with pytest.raises(sqlite3.OperationalError):
+        bot_module.run_migrations('scratch.db', [(1, create_table), (2, fail)])
+
+    assert user_version('scratch.db') == 0
+    assert row_counts('scratch.db') == {}
@@ -0,0 +1,49 @@
+import asyncio
+import pickle
+import sqlite3
+
+from telegram import User
+from telegram.ext import ApplicationBuilder
+
+from conftest import BIDDERS
+
+ALICE = BIDDERS[0]
+
+
+def stored_user_data(user_id):
+    with sqlite3.connect('bot_state.db') as conn:
+        row = conn.execute("SELECT data FROM user_state WHERE user_id=?", (user_id,)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+
+def test_user_back_before_the_flush_keeps_new_data(bot, monkeypatch):
+    async def get_me(self, *args, **kwargs):
+        self._bot_user = User(1, 'bot', True, username='auction_bot')
+        return self._bot_user
+
+    async def scenario():
+        persistence = bot.SqlitePersistence()
+        application = ApplicationBuilder().token('1:test').persistence(persistence).build()
+        monkeypatch.setattr(type(application.bot), 'get_me', get_me)
+        await application.initialize()
+        try:
+            await persistence.refresh_user_data(ALICE, application.user_data[ALICE])
+            application.user_data[ALICE]['bids_seen'] = 1
+            application.mark_data_for_update_persistence(user_ids=ALICE)
+            await application.update_persistence()
+
+            await persistence.evict(application, [ALICE])
+            assert ALICE not in application.user_data
+
+            # Alice's next update arrives before the flush that hands the drop to persistence
+            await persistence.refresh_user_data(ALICE, application.user_data[ALICE])
+            application.user_data[ALICE]['bids_seen'] = 2
+            application.mark_data_for_update_persistence(user_ids=ALICE)
+            await application.update_persistence()
+            await application.update_persistence()
+        finally:
+            await application.shutdown()
+
+    asyncio.run(scenario())
+
+    assert stored_user_data(ALICE) == {'bids_seen': 2}
@@ -0,0 +1,43 @@
+from conftest import BIDDERS, active_bids
+
+ALICE, BOB = BIDDERS[:2]
+
+
+def test_proxy_answers_a_plain_bid_one_increment_higher(bot, make_auction):
+    auction_id = make_auction(10000)
+    opening = bot.apply_proxy_bid(auction_id, ALICE, "Alice", 15000)
+    assert opening['status'] == 'accepted' and opening['final_amount'] == 11000
+
+    outcome = bot.apply_bid(auction_id, BOB, "Bob", 12000)
+
+    assert outcome['status'] == 'accepted'
+    assert outcome['final_amount'] == 13000
+    assert outcome['outbid_by_proxy']
+    assert outcome['auction']['current_bidder_id'] == ALICE
+    assert outcome['auction']['current_bid'] == 13000
+    assert active_bids(bot, auction_id) == [(ALICE, 11000), (BOB, 12000), (ALICE, 13000)]
+
+
+def test_highest_proxy_wins_capped_at_its_maximum(bot, make_auction):
+    auction_id = make_auction(10000)
+    bot.apply_proxy_bid(auction_id, ALICE, "Alice", 14500)
+
+    outcome = bot.apply_proxy_bid(auction_id, BOB, "Bob", 14000)
+
+    # one increment over Bob's 14000 would be 15000, but Alice only authorised 14500
+    assert outcome['final_amount'] == 14500
+    assert outcome['proxy'] == {'bidder_id': ALICE, 'amount': 14500, 'displaced': BOB}
+    assert active_bids(bot, auction_id) == [(ALICE, 11000), (BOB, 12000), (ALICE, 14500)]
+    with bot.db_connection() as conn:
+        assert [row[0] for row in conn.execute("SELECT user_id FROM proxy_bids WHERE auction_id=?",
+                                               (auction_id,))] == [ALICE]
+
+
+def test_leading_proxy_keeps_a_tie(bot, make_auction):
+    auction_id = make_auction(10000)
+    bot.apply_proxy_bid(auction_id, ALICE, "Alice", 14000)
+
+    outcome = bot.apply_proxy_bid(auction_id, BOB, "Bob", 14000)
+
+    assert outcome['final_amount'] == 14000
+    assert outcome['auction']['current_bidder_id'] == ALICE
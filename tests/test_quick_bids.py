@@ -0,0 +1,13 @@
+from conftest import BIDDERS, active_bids
+
+ALICE, BOB = BIDDERS[:2]
+
+
+def test_quick_bid_on_a_moved_price_is_stale(bot, make_auction):
+    auction_id = make_auction(10000)
+    bot.apply_bid(auction_id, ALICE, "Alice", 11000)
+
+    outcome = bot.apply_bid(auction_id, BOB, "Bob", 12000, expected_current=10000)
+
+    assert outcome['status'] == 'stale'
+    assert active_bids(bot, auction_id) == [(ALICE, 11000)]
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import pickle
+import sqlite3
+import time
+
+import pytest
+from telegram import User
+
+from conftest import BIDDERS
+
+ALICE, BOB = BIDDERS[:2]
+
+
+def store_wizard(user_id, state, age_seconds):
+    with sqlite3.connect('bot_state.db') as conn:
+        conn.execute('''INSERT INTO conversation_state (name, conversation_key, state, updated_at)
+                        VALUES ('add_item', ?, ?, ?)''',
+                     (json.dumps([user_id, user_id]), pickle.dumps(state), time.time() - age_seconds))
+        conn.execute("INSERT INTO user_state (user_id, data, updated_at) VALUES (?, ?, ?)",
+                     (user_id, pickle.dumps({'category': 'legendary', 'pokemon_name': 'Garchomp', 'bids_seen': 3}),
+                      time.time()))
+
+
+def stored_wizards():
+    with sqlite3.connect('bot_state.db') as conn:
+        return sorted(tuple(json.loads(row[0])) for row in conn.execute(
+            "SELECT conversation_key FROM conversation_state WHERE name='add_item'"))
+
+
+# the /add wizard's CallbackQueryHandler steps make PTB warn about per_message at build time
+@pytest.mark.filterwarnings('ignore:If \'per_message=False\'')
+def test_wizard_restored_at_startup_is_expired_by_the_reaper(bot, monkeypatch):
+    bot.init_state_db()
+    store_wizard(ALICE, bot.GET_NATURE, age_seconds=bot.ADD_CONVERSATION_TIMEOUT_SECONDS + 60)
+    store_wizard(BOB, bot.GET_NATURE, age_seconds=10)
+
+    async def get_me(self, *args, **kwargs):
+        self._bot_user = User(1, 'bot', True, username='auction_bot')
+        return self._bot_user
+
+    async def scenario():
+        application = bot.build_application(token='1:test')
+        monkeypatch.setattr(type(application.bot), 'get_me', get_me)
+        await application.initialize()
+        try:
+            conversation = next(handler for handler in application.handlers[0]
+                                if isinstance(handler, bot.ConversationHandler) and handler.name == 'add_item')
+            # PTB loads both states but arms no timeout for either
+            assert dict(conversation._conversations) == {(ALICE, ALICE): bot.GET_NATURE, (BOB, BOB): bot.GET_NATURE}
+
+            assert await bot.expire_add_conversations(application) == [ALICE]
+
+            assert dict(conversation._conversations) == {(BOB, BOB): bot.GET_NATURE}
+            assert application.user_data[ALICE] == {'bids_seen': 3}
+            assert 'category' in application.user_data[BOB]
+            await application.update_persistence()
+        finally:
+            await application.shutdown()
+
+    asyncio.run(scenario())
+
+    assert stored_wizards() == [(BOB, BOB)]
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+DATABASES = ['auctions.db', 'verified_users.db']
+
+
+@pytest.fixture
+def snapshot(bot, make_auction, monkeypatch):
+    monkeypatch.setattr(bot, 'running_bot_pid', lambda: None)
+    make_auction(10000)
+    return bot.create_snapshot(DATABASES, backup_dir='backups')
+
+
+def auction_count(bot):
+    with bot.db_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM auctions").fetchone()[0]
+
+
+def test_snapshot_verifies_against_its_manifest(bot, snapshot):
+    assert bot.verify_snapshot(snapshot) == []
+    assert bot.list_snapshots('backups') == [snapshot]
+    manifest = bot.load_manifest(snapshot)['databases']
+    assert set(manifest) == set(DATABASES)
+    assert manifest['auctions.db']['user_version'] == bot.AUCTIONS_MIGRATIONS[-1][0]
+    assert not os.path.exists(os.path.join(snapshot, 'auctions.db-wal'))
+
+
+def test_restore_brings_back_the_snapshot_and_keeps_the_replaced_data(bot, snapshot, make_auction):
+    make_auction(20000)
+    assert auction_count(bot) == 2
+
+    assert bot.restore_snapshot(snapshot, databases=['auctions.db']) == ['auctions.db']
+
+    assert auction_count(bot) == 1
+    snapshots = bot.list_snapshots('backups')
+    assert len(snapshots) == 2
+    pre_restore = next(path for path in snapshots if path.endswith('-pre-restore'))
+    assert bot.verify_snapshot(pre_restore) == []
+    assert list(bot.load_manifest(pre_restore)['databases']) == ['auctions.db']
+
+
+def test_damaged_snapshot_is_not_restored(bot, snapshot):
+    path = os.path.join(snapshot, 'auctions.db')
+    with open(path, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+    assert bot.verify_snapshot(snapshot) == ['auctions.db: checksum mismatch']
+    with pytest.raises(ValueError):
+        bot.restore_snapshot(snapshot)
+    assert auction_count(bot) == 1
+
+
+def test_restore_refuses_while_the_bot_is_running(bot, snapshot, monkeypatch):
+    monkeypatch.setattr(bot, 'running_bot_pid', lambda: 4242)
+
+    with pytest.raises(RuntimeError):
+        bot.restore_snapshot(snapshot)
+    assert bot.restore_snapshot(snapshot, force=True) == DATABASES
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+
+import pytest
+
+from conftest import BIDDERS, SELLER_ID
+
+
+@pytest.fixture
+def submission_id(bot):
+    return bot.DB_WRITER.write(lambda conn: conn.execute(
+        "INSERT INTO submissions (user_id, data) VALUES (?, '{}')", (SELLER_ID,)).lastrowid)
+
+
+def status(bot, submission_id):
+    with bot.db_connection() as conn:
+        return conn.execute("SELECT status FROM submissions WHERE submission_id=?", (submission_id,)).fetchone()[0]
+
+
+def auction_ids(bot, status):
+    with bot.db_connection() as conn:
+        return [row[0] for row in conn.execute(
+            "SELECT auction_id FROM auctions WHERE auction_status=? ORDER BY auction_id", (status,))]
+
+
+def test_only_one_of_many_concurrent_claims_wins(bot, submission_id):
+    admins = 8
+    barrier = threading.Barrier(admins)
+    results = []
+
+    def claim():
+        barrier.wait()
+        results.append(bot.transition_submission(submission_id, 'pending', 'processing'))
+
+    threads = [threading.Thread(target=claim) for _ in range(admins)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [False] * (admins - 1) + [True]
+    assert status(bot, submission_id) == 'processing'
+
+
+def test_rejecting_a_claimed_submission_fails(bot, submission_id):
+    assert bot.transition_submission(submission_id, 'pending', 'processing')
+
+    assert not bot.transition_submission(submission_id, 'pending', 'rejected')
+    assert status(bot, submission_id) == 'processing'
+
+
+def test_transition_outside_the_table_is_an_error(bot, submission_id):
+    with pytest.raises(ValueError):
+        bot.transition_submission(submission_id, 'rejected', 'approved')
+
+
+def start_approval(bot, submission_id, channel_message_id=501):
+    """What handle_verification has done by the time its post is out, short of complete_approval"""
+    assert bot.transition_submission(submission_id, 'pending', 'processing')
+    auction_id = bot.save_auction("Item", None, 10000, SELLER_ID, "seller", submission_id=submission_id)
+    bot.record_submission_post(submission_id, channel_message_id)
+    return auction_id
+
+
+def auction_status(bot, auction_id):
+    with bot.db_connection() as conn:
+        return conn.execute("SELECT auction_status FROM auctions WHERE auction_id=?", (auction_id,)).fetchone()[0]
+
+
+class RecordingBot:
+    def __init__(self):
+        self.deleted = []
+
+    async def delete_message(self, chat_id, message_id):
+        self.deleted.append(message_id)
+
+
+def test_claim_abandoned_by_a_crash_is_released_and_its_auction_taken_down(bot, submission_id):
+    orphan = start_approval(bot, submission_id)
+    bot.apply_bid(orphan, BIDDERS[0], "Alice", 11000)
+    assert bot.release_stale_submission_claims(600) == []
+
+    # the process died an hour ago, before complete_approval
+    bot.DB_WRITER.execute("UPDATE submissions SET status_changed_at=status_changed_at - 3600 WHERE submission_id=?",
+                          (submission_id,))
+    orphans = bot.release_stale_submission_claims(600)
+
+    assert orphans == [(orphan, 501)]
+    assert status(bot, submission_id) == 'pending'
+    assert auction_status(bot, orphan) == 'removed'
+    assert bot.get_auction(orphan) is None
+    with bot.db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM user_leading WHERE auction_id=?", (orphan,)).fetchone()[0] == 0
+    recording = RecordingBot()
+    asyncio.run(bot.delete_orphaned_posts(recording, orphans))
+    assert recording.deleted == [501]
+
+    retried = start_approval(bot, submission_id, channel_message_id=502)
+    assert bot.complete_approval(submission_id, retried, 502, None)
+    assert status(bot, submission_id) == 'approved'
+    assert auction_ids(bot, status='active') == [retried]
+
+
+def test_failed_approval_is_taken_down_and_can_be_retried(bot, submission_id):
+    orphan = start_approval(bot, submission_id)
+
+    assert bot.fail_approval(submission_id) == (orphan, 501)
+
+    assert status(bot, submission_id) == 'failed'
+    assert auction_status(bot, orphan) == 'removed'
+    assert bot.transition_submission(submission_id, 'failed', 'pending')
+    assert bot.transition_submission(submission_id, 'pending', 'processing')
@@ -0,0 +1,127 @@
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from telegram import Chat, Message, Update, User
+
+from conftest import BIDDERS, active_bids
+
+ALICE = BIDDERS[0]
+
+CHAT = Chat(ALICE, 'private')
+USER = User(ALICE, 'Alice', False)
+
+
+def message_update(update_id, message_id=None):
+    message = Message(message_id or update_id, datetime.now(), CHAT, from_user=USER, text='/mybids')
+    return Update(update_id, message=message)
+
+
+def new_ledger(bot):
+    ledger = bot.UpdateLedger(flush_seconds=0)
+    ledger.load()
+    return ledger
+
+
+def persisted(ledger):
+    # flushes queue in order on the one writer, so this one committing means every earlier one has
+    ledger.flush().result()
+
+
+def test_replay_after_restart_is_skipped(bot):
+    ledger = new_ledger(bot)
+    first = message_update(101)
+    assert ledger.begin(first)
+    ledger.finish(first)
+    persisted(ledger)
+
+    restarted = new_ledger(bot)
+
+    assert not restarted.begin(message_update(101))
+    assert restarted.begin(message_update(102))
+    assert restarted.skipped == 1
+
+
+def test_update_unfinished_at_a_crash_runs_again(bot):
+    ledger = new_ledger(bot)
+    slow, fast = message_update(105), message_update(106)
+    ledger.begin(slow)
+    ledger.begin(fast)
+    ledger.finish(fast)
+    assert ledger.watermark == 104
+    persisted(ledger)
+
+    restarted = new_ledger(bot)
+
+    assert restarted.watermark == 104
+    assert restarted.begin(message_update(105))
+    assert not restarted.begin(message_update(106))
+
+
+def test_message_redelivered_under_a_new_update_id_is_skipped(bot):
+    ledger = new_ledger(bot)
+    original = message_update(110, message_id=70)
+    ledger.begin(original)
+    ledger.finish(original)
+
+    assert not ledger.begin(message_update(111, message_id=70))
+
+
+def test_abandoned_update_does_not_hold_the_watermark(bot):
+    ledger = new_ledger(bot)
+    cancelled, done = message_update(120), message_update(121)
+    ledger.begin(cancelled)
+    ledger.begin(done)
+
+    ledger.abandon(cancelled)
+    ledger.finish(done)
+
+    assert ledger.in_flight == set()
+    assert ledger.watermark == 121
+
+
+def test_expired_watermark_moves_bid_keys_to_a_new_epoch(bot):
+    ledger = new_ledger(bot)
+    old = message_update(500)
+    ledger.begin(old)
+    ledger.finish(old)
+    context = SimpleNamespace(application=SimpleNamespace(update_processor=SimpleNamespace(ledger=ledger)))
+    old_key = bot.bid_idempotency_key(context, old, 7)
+
+    # a week later Telegram may hand out update_ids from a fresh, lower start
+    ledger.watermark_at = time.time() - 2 * ledger.WATERMARK_MAX_AGE_SECONDS
+    restarted_ids = message_update(500, message_id=900)
+    assert ledger.begin(restarted_ids)
+    ledger.finish(restarted_ids)
+    persisted(ledger)
+
+    assert ledger.epoch == 1
+    assert bot.bid_idempotency_key(context, restarted_ids, 7) != old_key
+    assert new_ledger(bot).epoch == 1
+
+
+def test_replayed_bid_is_written_once(bot, make_auction):
+    auction_id = make_auction(10000)
+    key = f"0:501:{auction_id}"
+
+    first = bot.apply_bid(auction_id, ALICE, "Alice", 11000, idempotency_key=key)
+    replay = bot.apply_bid(auction_id, ALICE, "Alice", 11000, idempotency_key=key)
+
+    assert first['status'] == 'accepted'
+    assert replay['status'] == 'duplicate' and replay['amount'] == 11000
+    assert active_bids(bot, auction_id) == [(ALICE, 11000)]
+
+
+def test_replayed_bid_batch_is_written_once(bot, make_auction):
+    first_id, second_id = make_auction(10000), make_auction(20000)
+    bids = [(first_id, 11000), (second_id, 22000)]
+
+    first = bot.record_bids(ALICE, "Alice", bids, key_prefix="0:502")
+    replay = bot.record_bids(ALICE, "Alice", bids, key_prefix="0:502")
+
+    assert [outcome['status'] for _, _, outcome in first] == ['accepted', 'accepted']
+    assert [outcome['auction'] for _, _, outcome in first] == [bot.get_auction(first_id), bot.get_auction(second_id)]
+    assert first[1][2]['auction']['current_bid'] == 22000
+    assert [outcome['status'] for _, _, outcome in replay] == ['duplicate', 'duplicate']
+    assert active_bids(bot, first_id) == [(ALICE, 11000)]
+    assert active_bids(bot, second_id) == [(ALICE, 22000)]
@@ -0,0 +1,37 @@
+from conftest import ADMIN_ID, BIDDERS
+
+NEWCOMER = 4001
+
+
+def test_request_is_filed_once(bot):
+    assert bot.add_verification_request(NEWCOMER, "newcomer") == 'requested'
+    assert bot.add_verification_request(NEWCOMER, "newcomer") == 'pending'
+    assert bot.add_verification_request(BIDDERS[0], "bidder") == 'verified'
+    assert bot.get_verification_request_username(NEWCOMER) == "newcomer"
+
+
+def test_request_is_resolved_once(bot):
+    bot.add_verification_request(NEWCOMER, "newcomer")
+
+    assert bot.resolve_verification_request(NEWCOMER, ADMIN_ID, approve=True) == ('verified', "newcomer")
+    assert bot.check_verification_status(NEWCOMER)
+    assert bot.get_verification_request_username(NEWCOMER) is None
+    assert bot.resolve_verification_request(NEWCOMER, ADMIN_ID, approve=False) == ('already_verified', None)
+
+
+def test_rejected_request_can_be_filed_again(bot):
+    bot.add_verification_request(NEWCOMER, "newcomer")
+
+    assert bot.resolve_verification_request(NEWCOMER, ADMIN_ID, approve=False) == ('rejected', "newcomer")
+    assert bot.resolve_verification_request(NEWCOMER, ADMIN_ID, approve=False) == ('missing', None)
+    assert not bot.check_verification_status(NEWCOMER)
+    assert bot.add_verification_request(NEWCOMER, "newcomer") == 'requested'
+
+
+def test_unverify(bot):
+    total = bot.count_verified_users()
+
+    assert bot.remove_verified_user(BIDDERS[0]) == f"bidder{BIDDERS[0]}"
+    assert bot.remove_verified_user(BIDDERS[0]) is None
+    assert bot.count_verified_users() == total - 1
+    assert BIDDERS[0] not in [row['user_id'] for row in bot.get_verified_users()]